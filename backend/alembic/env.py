@@ -9,7 +9,16 @@ from app.config import get_settings
 from app.core.database import Base
 
 # Import all models so Alembic sees them
-from app.models import DailyLeaderboard, TrainingSession, User, UserStats  # noqa: F401
+from app.models import (  # noqa: F401
+    DailyLeaderboard,
+    DailyLeaderboardFinalization,
+    DailyLeaderboardSnapshot,
+    PeriodLeaderboard,
+    TrainingSession,
+    User,
+    UserFollow,
+    UserStats,
+)
 
 config = context.config
 
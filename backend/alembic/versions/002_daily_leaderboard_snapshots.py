@@ -0,0 +1,53 @@
+"""Daily leaderboard snapshots for finalized days
+
+Revision ID: 002
+Revises: 001
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "002"
+down_revision: Union[str, None] = "001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "daily_leaderboard_snapshots",
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("grid_size", sa.Integer(), nullable=False),
+        sa.Column("order_mode", sa.String(10), nullable=False),
+        sa.Column("position", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.Integer(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("display_name", sa.String(100), nullable=True),
+        sa.Column("best_time_ms", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("date", "grid_size", "order_mode", "position", name="pk_daily_leaderboard_snapshots"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="fk_daily_leaderboard_snapshots_user_id_users", ondelete="CASCADE"),
+    )
+    op.create_index(
+        "idx_snapshot_user",
+        "daily_leaderboard_snapshots",
+        ["date", "grid_size", "order_mode", "user_id"],
+        unique=True,
+    )
+
+    op.create_table(
+        "daily_leaderboard_finalizations",
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("grid_size", sa.Integer(), nullable=False),
+        sa.Column("order_mode", sa.String(10), nullable=False),
+        sa.Column("total_entries", sa.Integer(), nullable=False),
+        sa.Column("finalized_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("date", "grid_size", "order_mode", name="pk_daily_leaderboard_finalizations"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("daily_leaderboard_finalizations")
+    op.drop_table("daily_leaderboard_snapshots")
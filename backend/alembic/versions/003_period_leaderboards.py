@@ -0,0 +1,61 @@
+"""Weekly, monthly and seasonal leaderboards
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "003"
+down_revision: Union[str, None] = "002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# period_type -> date_trunc field (weeks start on Monday, seasons are quarters)
+PERIODS = {"week": "week", "month": "month", "season": "quarter"}
+
+
+def upgrade() -> None:
+    op.create_table(
+        "period_leaderboards",
+        sa.Column("id", sa.Uuid(), nullable=False, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("period_type", sa.String(10), nullable=False),
+        sa.Column("period_start", sa.Date(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("session_id", sa.Uuid(), nullable=False),
+        sa.Column("grid_size", sa.Integer(), nullable=False),
+        sa.Column("order_mode", sa.String(10), nullable=False),
+        sa.Column("best_time_ms", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id", name="pk_period_leaderboards"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="fk_period_leaderboards_user_id_users", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["session_id"], ["training_sessions.id"], name="fk_period_leaderboards_session_id_training_sessions", ondelete="CASCADE"),
+        sa.UniqueConstraint("period_type", "period_start", "user_id", "grid_size", "order_mode", name="uq_period_user_config"),
+    )
+    op.create_index("ix_period_leaderboards_user_id", "period_leaderboards", ["user_id"])
+    op.create_index(
+        "idx_period_ranking",
+        "period_leaderboards",
+        ["period_type", "period_start", "grid_size", "order_mode", "best_time_ms"],
+    )
+
+    # Backfill from existing daily bests
+    for period_type, field in PERIODS.items():
+        op.execute(
+            f"""
+            INSERT INTO period_leaderboards
+                (period_type, period_start, user_id, session_id, grid_size, order_mode, best_time_ms)
+            SELECT DISTINCT ON (period_start, user_id, grid_size, order_mode)
+                '{period_type}', date_trunc('{field}', date)::date AS period_start,
+                user_id, session_id, grid_size, order_mode, best_time_ms
+            FROM daily_leaderboards
+            ORDER BY period_start, user_id, grid_size, order_mode, best_time_ms
+            """
+        )
+
+
+def downgrade() -> None:
+    op.drop_table("period_leaderboards")
@@ -0,0 +1,33 @@
+"""Follow graph for friends leaderboards
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "004"
+down_revision: Union[str, None] = "003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "user_follows",
+        sa.Column("follower_id", sa.Uuid(), nullable=False),
+        sa.Column("followee_id", sa.Uuid(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("follower_id", "followee_id", name="pk_user_follows"),
+        sa.ForeignKeyConstraint(["follower_id"], ["users.id"], name="fk_user_follows_follower_id_users", ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["followee_id"], ["users.id"], name="fk_user_follows_followee_id_users", ondelete="CASCADE"),
+    )
+    op.create_index("idx_follows_followee", "user_follows", ["followee_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("user_follows")
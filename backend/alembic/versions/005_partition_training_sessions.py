@@ -0,0 +1,144 @@
+"""Partition training_sessions by month on started_at
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-19 00:00:00.000000
+
+Rebuilds training_sessions as a range-partitioned table and copies the rows
+across, so it holds an exclusive lock for the length of the copy: run it in a
+maintenance window on large databases. Partitioned tables need the partition
+key in every unique constraint, so the primary key becomes (id, started_at), the
+client-id key gains started_at, and the session_id foreign keys from the
+leaderboard tables are dropped (LeaderboardRepository.delete_for_session
+already removes dependent entries). Later months are created by
+app.jobs.manage_partitions.
+"""
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy.dialects import postgresql
+
+revision: str = "005"
+down_revision: Union[str, None] = "004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+COLUMNS = (
+    "id, user_id, client_session_id, grid_size, max_time, order_mode, status, "
+    "completion_time_ms, mistakes, accuracy, tap_events, started_at, completed_at, created_at"
+)
+
+SESSION_FKS = {
+    "daily_leaderboards": "fk_daily_leaderboards_session_id_training_sessions",
+    "period_leaderboards": "fk_period_leaderboards_session_id_training_sessions",
+}
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def _create_table(name: str, partitioned: bool) -> None:
+    # The partition key has to be part of every unique constraint
+    key = ("started_at",) if partitioned else ()
+    op.create_table(
+        name,
+        sa.Column("id", sa.Uuid(), nullable=False, server_default=sa.text("gen_random_uuid()")),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("client_session_id", sa.String(255), nullable=False),
+        sa.Column("grid_size", sa.Integer(), nullable=False),
+        sa.Column("max_time", sa.Integer(), nullable=False),
+        sa.Column("order_mode", sa.String(10), nullable=False),
+        sa.Column("status", sa.String(20), nullable=False),
+        sa.Column("completion_time_ms", sa.Integer(), nullable=True),
+        sa.Column("mistakes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("accuracy", sa.Float(), nullable=True),
+        sa.Column("tap_events", postgresql.JSONB(), nullable=True),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("completed_at", sa.DateTime(timezone=True), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.PrimaryKeyConstraint("id", *key, name="pk_training_sessions"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="fk_training_sessions_user_id_users", ondelete="CASCADE"),
+        sa.UniqueConstraint("user_id", "client_session_id", *key, name="uq_session_user_client"),
+        **({"postgresql_partition_by": "RANGE (started_at)"} if partitioned else {}),
+    )
+    op.create_index("idx_sessions_user_started", name, ["user_id", "started_at"])
+    op.create_index(
+        "idx_sessions_leaderboard",
+        name,
+        ["grid_size", "order_mode", "status", "completion_time_ms"],
+        postgresql_where=sa.text("status = 'completed'"),
+    )
+
+
+def _rename_old(suffix: str) -> None:
+    op.rename_table("training_sessions", f"training_sessions_{suffix}")
+    # Index and constraint names are schema-wide: free them for the new table
+    for index in (
+        "pk_training_sessions",
+        "uq_session_user_client",
+        "idx_sessions_user_started",
+        "idx_sessions_leaderboard",
+    ):
+        op.execute(f"ALTER INDEX {index} RENAME TO {index}_{suffix}")
+    op.execute(
+        f"ALTER TABLE training_sessions_{suffix} RENAME CONSTRAINT "
+        f"fk_training_sessions_user_id_users TO fk_training_sessions_user_id_users_{suffix}"
+    )
+
+
+def upgrade() -> None:
+    for table, fk in SESSION_FKS.items():
+        op.drop_constraint(fk, table, type_="foreignkey")
+
+    _rename_old("unpartitioned")
+    _create_table("training_sessions", partitioned=True)
+    op.execute("CREATE TABLE training_sessions_default PARTITION OF training_sessions DEFAULT")
+
+    # One partition per month from the oldest session to MONTHS_AHEAD from now
+    oldest = op.get_bind().execute(
+        sa.text("SELECT min(started_at) FROM training_sessions_unpartitioned")
+    ).scalar()
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    month = oldest.astimezone(timezone.utc).date().replace(day=1) if oldest else this_month
+    while month <= _add_months(this_month, MONTHS_AHEAD):
+        end = _add_months(month, 1)
+        op.execute(
+            f"CREATE TABLE training_sessions_{month:%Y_%m} PARTITION OF training_sessions "
+            f"FOR VALUES FROM ('{month} 00:00:00+00') TO ('{end} 00:00:00+00')"
+        )
+        month = end
+
+    op.execute(
+        f"INSERT INTO training_sessions ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM training_sessions_unpartitioned"
+    )
+    op.drop_table("training_sessions_unpartitioned")
+    op.execute("ANALYZE training_sessions")
+
+
+def downgrade() -> None:
+    # Fails if a client_session_id was stored twice with different start times
+    _rename_old("partitioned")
+    _create_table("training_sessions", partitioned=False)
+    op.execute(
+        f"INSERT INTO training_sessions ({COLUMNS}) "
+        f"SELECT {COLUMNS} FROM training_sessions_partitioned"
+    )
+    # Drops the partitions too; detached ones are left alone
+    op.drop_table("training_sessions_partitioned")
+
+    # Entries whose session was detached and dropped would violate the keys
+    for table, fk in SESSION_FKS.items():
+        op.execute(
+            f"DELETE FROM {table} t WHERE NOT EXISTS "
+            f"(SELECT 1 FROM training_sessions s WHERE s.id = t.session_id)"
+        )
+        op.create_foreign_key(
+            fk, table, "training_sessions", ["session_id"], ["id"], ondelete="CASCADE"
+        )
@@ -0,0 +1,37 @@
+"""Pointers to tap events archived in cold storage
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "006"
+down_revision: Union[str, None] = "005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Nullable without defaults: catalog-only on every partition
+    op.add_column("training_sessions", sa.Column("tap_events_segment", sa.String(255), nullable=True))
+    op.add_column("training_sessions", sa.Column("tap_events_offset", sa.BigInteger(), nullable=True))
+    op.add_column("training_sessions", sa.Column("tap_events_length", sa.Integer(), nullable=True))
+    op.create_index(
+        "idx_sessions_unarchived",
+        "training_sessions",
+        ["started_at"],
+        postgresql_where=sa.text("tap_events IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    # Archived tap events stay in their segments; restore them before downgrading
+    op.drop_index("idx_sessions_unarchived", table_name="training_sessions")
+    op.drop_column("training_sessions", "tap_events_length")
+    op.drop_column("training_sessions", "tap_events_offset")
+    op.drop_column("training_sessions", "tap_events_segment")
@@ -0,0 +1,49 @@
+"""All-time leaderboard rollup
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-19 00:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "007"
+down_revision: Union[str, None] = "006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "all_time_leaderboards",
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("grid_size", sa.Integer(), nullable=False),
+        sa.Column("order_mode", sa.String(10), nullable=False),
+        sa.Column("session_id", sa.Uuid(), nullable=False),
+        sa.Column("best_time_ms", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("user_id", "grid_size", "order_mode", name="pk_all_time_leaderboards"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], name="fk_all_time_leaderboards_user_id_users", ondelete="CASCADE"),
+    )
+    op.create_index(
+        "idx_all_time_ranking",
+        "all_time_leaderboards",
+        ["grid_size", "order_mode", "best_time_ms"],
+    )
+
+    # Backfill from existing daily bests
+    op.execute(
+        """
+        INSERT INTO all_time_leaderboards (user_id, grid_size, order_mode, session_id, best_time_ms)
+        SELECT DISTINCT ON (user_id, grid_size, order_mode)
+            user_id, grid_size, order_mode, session_id, best_time_ms
+        FROM daily_leaderboards
+        ORDER BY user_id, grid_size, order_mode, best_time_ms
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("all_time_leaderboards")
@@ -5,6 +5,7 @@ from typing import Annotated
 from fastapi import Depends, Header
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import database as db_module
 from app.core.database import get_db
 from app.core.exceptions import AuthenticationError
 from app.core.security import verify_token
@@ -60,3 +61,36 @@ async def get_optional_user(
         return await user_repo.get_by_cognito_sub(cognito_sub)
     except Exception:
         return None
+
+
+async def _read_session(
+    user_id: uuid.UUID | None, primary: AsyncSession
+) -> AsyncGenerator[AsyncSession, None]:
+    # Without a replica, or for recent writers who must see their own changes,
+    # reuse the request's primary session: a second checkout from the same
+    # pool per request can starve the pool under load
+    if db_module.read_engine is db_module.engine or (
+        user_id is not None and db_module.has_recent_write(user_id)
+    ):
+        yield primary
+        return
+    async with db_module.read_session_factory() as session:
+        yield session
+
+
+async def get_user_read_db(
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session for an authenticated request (replica unless pinned)."""
+    async for session in _read_session(current_user.id, db):
+        yield session
+
+
+async def get_optional_user_read_db(
+    current_user: User | None = Depends(get_optional_user),
+    db: AsyncSession = Depends(get_db),
+) -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session for a request that may be anonymous."""
+    async for session in _read_session(current_user.id if current_user else None, db):
+        yield session
@@ -1,20 +1,34 @@
+import asyncio
+from collections.abc import AsyncIterator
 from datetime import date
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_optional_user
-from app.core.database import get_db
+from app.api.deps import (
+    get_current_user,
+    get_optional_user,
+    get_optional_user_read_db,
+    get_user_read_db,
+)
+from app.core.broadcast import leaderboard_broadcaster
 from app.models.user import User
 from app.schemas.leaderboard import LeaderboardResponse
 from app.services.leaderboard import LeaderboardService
 
 router = APIRouter(prefix="/leaderboards", tags=["leaderboards"])
 
+# Finalized boards never change, so clients and CDNs may keep them for a year
+FINALIZED_MAX_AGE = 365 * 24 * 3600
+
+# Comment line sent on idle streams so proxies keep the connection open
+SSE_KEEPALIVE_SECONDS = 15
+
 
 @router.get("/daily", response_model=LeaderboardResponse)
 async def get_daily_leaderboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_optional_user_read_db),
     current_user: User | None = Depends(get_optional_user),
     grid_size: int = Query(5, ge=4, le=10),
     order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
@@ -33,10 +47,77 @@ async def get_daily_leaderboard(
     )
 
 
+@router.get("/daily/around-me", response_model=LeaderboardResponse)
+async def get_daily_around_me(
+    db: AsyncSession = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user),
+    grid_size: int = Query(5, ge=4, le=10),
+    order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
+    radius: int = Query(5, ge=1, le=25),
+) -> LeaderboardResponse:
+    """Get today's rankings just above and below the current user."""
+    service = LeaderboardService(db)
+    return await service.get_daily_around(
+        user_id=current_user.id,
+        grid_size=grid_size,
+        order_mode=order_mode,
+        target_date=date.today(),
+        radius=radius,
+    )
+
+
+@router.get("/daily/friends", response_model=LeaderboardResponse)
+async def get_daily_friends_leaderboard(
+    db: AsyncSession = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user),
+    grid_size: int = Query(5, ge=4, le=10),
+    order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> LeaderboardResponse:
+    """Get today's rankings among the current user and the players they follow."""
+    service = LeaderboardService(db)
+    return await service.get_daily_friends(
+        user_id=current_user.id,
+        grid_size=grid_size,
+        order_mode=order_mode,
+        target_date=date.today(),
+        limit=limit,
+        offset=offset,
+    )
+
+
+@router.get("/daily/stream")
+async def stream_daily_leaderboard(
+    grid_size: int = Query(5, ge=4, le=10),
+    order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
+) -> StreamingResponse:
+    """Server-sent events with today's top-N whenever the board changes."""
+    board = (grid_size, order_mode)
+
+    async def events() -> AsyncIterator[bytes]:
+        queue = leaderboard_broadcaster.subscribe(board)
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), SSE_KEEPALIVE_SECONDS)
+                except TimeoutError:
+                    yield b": keepalive\n\n"
+        finally:
+            leaderboard_broadcaster.unsubscribe(board, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/daily/{target_date}", response_model=LeaderboardResponse)
 async def get_daily_leaderboard_by_date(
     target_date: date,
-    db: AsyncSession = Depends(get_db),
+    response: Response,
+    db: AsyncSession = Depends(get_optional_user_read_db),
     current_user: User | None = Depends(get_optional_user),
     grid_size: int = Query(5, ge=4, le=10),
     order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
@@ -45,7 +126,7 @@ async def get_daily_leaderboard_by_date(
 ) -> LeaderboardResponse:
     """Get leaderboard rankings for a specific date."""
     service = LeaderboardService(db)
-    return await service.get_daily(
+    result = await service.get_daily(
         grid_size=grid_size,
         order_mode=order_mode,
         target_date=target_date,
@@ -54,10 +135,19 @@ async def get_daily_leaderboard_by_date(
         current_user_id=current_user.id if current_user else None,
     )
 
+    if result.meta.finalized:
+        # current_user makes the body personal, so keep it out of shared caches.
+        # Vary stops a shared cache from answering a signed-in request with the
+        # anonymous copy.
+        scope = "private" if current_user else "public"
+        response.headers["Cache-Control"] = f"{scope}, max-age={FINALIZED_MAX_AGE}, immutable"
+        response.headers["Vary"] = "Authorization"
+    return result
+
 
 @router.get("/all-time", response_model=LeaderboardResponse)
 async def get_all_time_leaderboard(
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_optional_user_read_db),
     current_user: User | None = Depends(get_optional_user),
     grid_size: int = Query(5, ge=4, le=10),
     order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
@@ -73,3 +163,91 @@ async def get_all_time_leaderboard(
         offset=offset,
         current_user_id=current_user.id if current_user else None,
     )
+
+
+@router.get("/all-time/around-me", response_model=LeaderboardResponse)
+async def get_all_time_around_me(
+    db: AsyncSession = Depends(get_user_read_db),
+    current_user: User = Depends(get_current_user),
+    grid_size: int = Query(5, ge=4, le=10),
+    order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
+    radius: int = Query(5, ge=1, le=25),
+) -> LeaderboardResponse:
+    """Get all-time rankings just above and below the current user."""
+    service = LeaderboardService(db)
+    return await service.get_all_time_around(
+        user_id=current_user.id,
+        grid_size=grid_size,
+        order_mode=order_mode,
+        radius=radius,
+    )
+
+
+async def _get_period_leaderboard(
+    period_type: str,
+    db: AsyncSession,
+    current_user: User | None,
+    grid_size: int,
+    order_mode: str,
+    target_date: date | None,
+    limit: int,
+    offset: int,
+) -> LeaderboardResponse:
+    service = LeaderboardService(db)
+    return await service.get_period(
+        period_type=period_type,
+        grid_size=grid_size,
+        order_mode=order_mode,
+        target_date=target_date or date.today(),
+        limit=limit,
+        offset=offset,
+        current_user_id=current_user.id if current_user else None,
+    )
+
+
+@router.get("/weekly", response_model=LeaderboardResponse)
+async def get_weekly_leaderboard(
+    db: AsyncSession = Depends(get_optional_user_read_db),
+    current_user: User | None = Depends(get_optional_user),
+    grid_size: int = Query(5, ge=4, le=10),
+    order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
+    target_date: date | None = Query(None, description="Any day in the week; defaults to today"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> LeaderboardResponse:
+    """Get best-of-week rankings (weeks start on Monday)."""
+    return await _get_period_leaderboard(
+        "week", db, current_user, grid_size, order_mode, target_date, limit, offset
+    )
+
+
+@router.get("/monthly", response_model=LeaderboardResponse)
+async def get_monthly_leaderboard(
+    db: AsyncSession = Depends(get_optional_user_read_db),
+    current_user: User | None = Depends(get_optional_user),
+    grid_size: int = Query(5, ge=4, le=10),
+    order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
+    target_date: date | None = Query(None, description="Any day in the month; defaults to today"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> LeaderboardResponse:
+    """Get best-of-month rankings."""
+    return await _get_period_leaderboard(
+        "month", db, current_user, grid_size, order_mode, target_date, limit, offset
+    )
+
+
+@router.get("/seasonal", response_model=LeaderboardResponse)
+async def get_seasonal_leaderboard(
+    db: AsyncSession = Depends(get_optional_user_read_db),
+    current_user: User | None = Depends(get_optional_user),
+    grid_size: int = Query(5, ge=4, le=10),
+    order_mode: str = Query("ASC", pattern=r"^(ASC|DESC)$"),
+    target_date: date | None = Query(None, description="Any day in the season; defaults to today"),
+    limit: int = Query(50, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+) -> LeaderboardResponse:
+    """Get best-of-season rankings (seasons are calendar quarters)."""
+    return await _get_period_leaderboard(
+        "season", db, current_user, grid_size, order_mode, target_date, limit, offset
+    )
@@ -1,10 +1,11 @@
 import uuid
+from datetime import datetime
 from math import ceil
 
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
+from app.api.deps import get_current_user, get_user_read_db
 from app.core.database import get_db
 from app.core.exceptions import NotFoundError
 from app.models.user import User
@@ -36,12 +37,14 @@ async def create_session(
 @router.get("", response_model=PaginatedResponse[SessionResponse])
 async def list_sessions(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_user_read_db),
     page: int = Query(1, ge=1),
     per_page: int = Query(20, ge=1, le=100),
     grid_size: int | None = Query(None, ge=4, le=10),
     order_mode: str | None = Query(None, pattern=r"^(ASC|DESC)$"),
     status: str | None = Query(None, pattern=r"^(completed|timeout|abandoned)$"),
+    started_after: datetime | None = Query(None),
+    started_before: datetime | None = Query(None),
 ) -> PaginatedResponse[SessionResponse]:
     """List current user's training sessions with pagination and filters."""
     service = SessionService(db)
@@ -52,6 +55,8 @@ async def list_sessions(
         grid_size=grid_size,
         order_mode=order_mode,
         status=status,
+        started_after=started_after,
+        started_before=started_before,
     )
 
     return PaginatedResponse(
@@ -69,14 +74,16 @@ async def list_sessions(
 async def get_session(
     session_id: uuid.UUID,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_user_read_db),
 ) -> SessionDetailResponse:
     """Get full session details including tap events."""
     service = SessionService(db)
     session = await service.get_session(session_id, current_user.id)
     if session is None:
         raise NotFoundError("Session not found")
-    return SessionDetailResponse.model_validate(session)
+    response = SessionDetailResponse.model_validate(session)
+    response.tap_events = await service.get_tap_events(session)
+    return response
 
 
 @router.delete("/{session_id}", status_code=204)
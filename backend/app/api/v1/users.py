@@ -3,8 +3,8 @@ import uuid
 from fastapi import APIRouter, Depends
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.api.deps import get_current_user
-from app.core.database import get_db
+from app.api.deps import get_current_user, get_user_read_db
+from app.core.database import get_db, get_read_db
 from app.core.exceptions import NotFoundError
 from app.models.user import User
 from app.repositories.user import UserRepository
@@ -16,6 +16,7 @@ from app.schemas.user import (
     UserPublicResponse,
     UserStatsSchema,
 )
+from app.services.follow import FollowService
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -23,7 +24,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 @router.get("/me", response_model=UserProfileResponse)
 async def get_my_profile(
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_user_read_db),
 ) -> UserProfileResponse:
     """Get current user's profile with preferences and stats."""
     user_repo = UserRepository(db)
@@ -85,10 +86,30 @@ async def update_my_preferences(
     return UserPreferences(**updated)
 
 
+@router.post("/{user_id}/follow", status_code=204)
+async def follow_user(
+    user_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Follow a user so they appear on the friends leaderboard."""
+    await FollowService(db).follow(current_user.id, user_id)
+
+
+@router.delete("/{user_id}/follow", status_code=204)
+async def unfollow_user(
+    user_id: uuid.UUID,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> None:
+    """Stop following a user."""
+    await FollowService(db).unfollow(current_user.id, user_id)
+
+
 @router.get("/{user_id}", response_model=UserPublicResponse)
 async def get_public_profile(
     user_id: uuid.UUID,
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> UserPublicResponse:
     """Get a user's public profile (for leaderboard)."""
     user_repo = UserRepository(db)
@@ -18,6 +18,26 @@ class Settings(BaseSettings):
     db_username: str = "schulte"
     db_password: str = "localdev"
 
+    # Connection pool (per engine, per worker)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout_seconds: float = 10.0  # Fail fast instead of queueing forever
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_statement_timeout_ms: int = 15000  # Server-side; 0 disables
+    db_command_timeout_seconds: float = 20.0  # Client-side asyncpg timeout
+    db_statement_cache_size: int = 100  # Prepared statements cached per connection
+
+    # PgBouncer in transaction mode: server connections change between
+    # transactions, so named prepared statements can't be cached per connection
+    db_pgbouncer: bool = False
+    db_direct_host: str = ""  # Postgres itself, for LISTEN (empty = db_host)
+    db_direct_port: int = 5432
+
+    # Read replica for GET endpoints (empty = read from the primary)
+    db_read_host: str = ""
+    read_your_writes_seconds: float = 5.0  # Pin a user to the primary after they write
+
     # SSM (for AWS deployment — overrides db_password at startup)
     db_password_ssm_path: str = ""
 
@@ -33,6 +53,46 @@ class Settings(BaseSettings):
     # CORS
     cors_origins: list[str] = ["http://localhost:3000"]
 
+    # Instrumentation
+    sql_repeat_warn_threshold: int = 5  # Debug: warn when a statement repeats this often
+    loop_monitor_interval_seconds: float = 0.5
+    loop_block_threshold_seconds: float = 0.1  # Debug: log the stack of longer stalls
+
+    # Per-request profiler (not installed unless enabled)
+    profiling_enabled: bool = False
+    profiling_token: str = ""  # Requests with a matching X-Profile-Token are profiled
+    profiling_sample_rate: float = 0.0  # Fraction of all requests to profile
+    profiling_interval_ms: float = 2.0
+    profiling_output_dir: str = "/tmp/schulte-profiles"
+
+    # Continuous low-rate sampler in every worker (enabled by the deployment env)
+    profiling_continuous_enabled: bool = False
+    profiling_continuous_interval_ms: float = 10.0
+    profiling_continuous_window_seconds: float = 60.0
+    profiling_continuous_keep: int = 240  # Window files kept across all workers
+
+    # Sanitized request capture for replay (not installed unless enabled)
+    traffic_capture_enabled: bool = False
+    traffic_capture_dir: str = "/tmp/schulte-traffic"
+    traffic_capture_sample_rate: float = 1.0  # Fraction of users whose requests are kept
+    traffic_capture_salt: str = ""  # Keys the pseudonyms; set it to join captures across workers
+
+    # Cold storage for tap events of old sessions (app/jobs/archive_tap_events.py)
+    tap_archive_backend: str = "local"  # local or s3
+    tap_archive_dir: str = "/tmp/schulte-archive"
+    tap_archive_bucket: str = ""
+    tap_archive_prefix: str = "tap-events/"
+    tap_archive_endpoint_url: str = ""  # S3-compatible services (MinIO, R2); empty = AWS
+    tap_archive_after_days: int = 90
+    tap_archive_cache_size: int = 256  # Rehydrated sessions kept per worker
+
+    # Leaderboards
+    leaderboard_exact_rank_limit: int = 500  # Ranks beyond this are estimated
+    leaderboard_sketch_resolution_ms: int = 10
+    leaderboard_sketch_ttl_seconds: int = 300
+    leaderboard_stream_tick_seconds: float = 1.0  # Max one push per board per tick
+    leaderboard_stream_top_n: int = 10
+
     @property
     def database_url(self) -> str:
         ssl_suffix = "?ssl=require" if self.db_ssl else ""
@@ -41,6 +101,16 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}{ssl_suffix}"
         )
 
+    @property
+    def database_read_url(self) -> str:
+        if not self.db_read_host:
+            return self.database_url
+        ssl_suffix = "?ssl=require" if self.db_ssl else ""
+        return (
+            f"postgresql+asyncpg://{self.db_username}:{self.db_password}"
+            f"@{self.db_read_host}:{self.db_port}/{self.db_name}{ssl_suffix}"
+        )
+
     @property
     def database_url_sync(self) -> str:
         """Sync URL for Alembic migrations."""
@@ -50,6 +120,17 @@ class Settings(BaseSettings):
             f"@{self.db_host}:{self.db_port}/{self.db_name}{ssl_suffix}"
         )
 
+    @property
+    def database_listen_url(self) -> str:
+        """Session-level URL for LISTEN; must bypass a transaction-mode pooler."""
+        ssl_suffix = "?sslmode=require" if self.db_ssl else ""
+        host = self.db_direct_host or self.db_host
+        port = self.db_direct_port if self.db_direct_host else self.db_port
+        return (
+            f"postgresql://{self.db_username}:{self.db_password}"
+            f"@{host}:{port}/{self.db_name}{ssl_suffix}"
+        )
+
     @property
     def cognito_issuer(self) -> str:
         return (
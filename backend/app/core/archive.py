@@ -0,0 +1,183 @@
+import asyncio
+import gzip
+import json
+import os
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import structlog
+
+from app.config import Settings, get_settings
+from app.core.cache import TTLCache
+from app.core.ids import uuid7
+
+logger = structlog.get_logger()
+
+
+class SegmentStore(ABC):
+    """Write-once blobs ("segments"), read back by byte range."""
+
+    @abstractmethod
+    async def write(self, name: str, data: bytes) -> None:
+        """Store a new segment. Segments are never modified or overwritten."""
+
+    @abstractmethod
+    async def read(self, name: str, offset: int, length: int) -> bytes:
+        """Bytes [offset, offset + length) of a segment."""
+
+
+class LocalSegmentStore(SegmentStore):
+    """Segments as files under a directory (development, single-host deployments)."""
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root)
+
+    async def write(self, name: str, data: bytes) -> None:
+        await asyncio.to_thread(self._write, self.root / name, data)
+
+    async def read(self, name: str, offset: int, length: int) -> bytes:
+        return await asyncio.to_thread(self._read, self.root / name, offset, length)
+
+    @staticmethod
+    def _write(path: Path, data: bytes) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        partial = path.with_name(f".{path.name}.{os.getpid()}.partial")
+        partial.write_bytes(data)
+        try:
+            # A hard link appears complete and fails if the name is taken
+            os.link(partial, path)
+        finally:
+            partial.unlink()
+
+    @staticmethod
+    def _read(path: Path, offset: int, length: int) -> bytes:
+        with path.open("rb") as f:
+            f.seek(offset)
+            return f.read(length)
+
+
+class S3SegmentStore(SegmentStore):
+    """Segments as objects in S3 or an S3-compatible service (endpoint_url)."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "",
+        endpoint_url: str | None = None,
+        region: str | None = None,
+        client: Any = None,
+    ):
+        self.bucket = bucket
+        self.prefix = prefix
+        self.endpoint_url = endpoint_url
+        self.region = region
+        self._client = client
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            import boto3
+
+            self._client = boto3.client(
+                "s3", endpoint_url=self.endpoint_url, region_name=self.region
+            )
+        return self._client
+
+    async def write(self, name: str, data: bytes) -> None:
+        await asyncio.to_thread(
+            self.client.put_object,
+            Bucket=self.bucket,
+            Key=self.prefix + name,
+            Body=data,
+            ContentType="application/gzip",
+        )
+
+    async def read(self, name: str, offset: int, length: int) -> bytes:
+        def get() -> bytes:
+            response = self.client.get_object(
+                Bucket=self.bucket,
+                Key=self.prefix + name,
+                Range=f"bytes={offset}-{offset + length - 1}",
+            )
+            return response["Body"].read()  # type: ignore[no-any-return]
+
+        return await asyncio.to_thread(get)
+
+
+@dataclass(frozen=True)
+class ArchivedTapEvents:
+    """Where one session's tap events live: a byte range of a segment."""
+
+    session_id: uuid.UUID
+    segment: str
+    offset: int
+    length: int
+
+
+class TapEventArchive:
+    """
+    Tap events of old sessions in compressed, append-only segments.
+
+    A segment holds many sessions, each one its own gzip member containing one
+    JSON line ({"session_id": ..., "tap_events": [...]}). One session can be read
+    back with a single range request. The whole segment still decompresses as
+    JSON lines for analytics.
+    """
+
+    def __init__(self, store: SegmentStore, cache_size: int):
+        self.store = store
+        # Segments never change, so entries only leave by LRU eviction in practice
+        self._cache: TTLCache[tuple[str, int], list[Any]] = TTLCache(
+            ttl_seconds=3600, maxsize=cache_size, name="archived_tap_events"
+        )
+
+    async def write_segment(
+        self, sessions: list[tuple[uuid.UUID, datetime, list[Any]]]
+    ) -> list[ArchivedTapEvents]:
+        """Write (session_id, started_at, tap_events) as one new segment."""
+        # Grouped by the month of the oldest session, for lifecycle rules on the bucket
+        name = f"{min(s[1] for s in sessions):%Y/%m}/{uuid7()}.jsonl.gz"
+        parts = []
+        locations = []
+        offset = 0
+        for session_id, _, tap_events in sessions:
+            line = json.dumps({"session_id": str(session_id), "tap_events": tap_events})
+            member = gzip.compress((line + "\n").encode(), mtime=0)
+            parts.append(member)
+            locations.append(ArchivedTapEvents(session_id, name, offset, len(member)))
+            offset += len(member)
+
+        await self.store.write(name, b"".join(parts))
+        logger.info("tap_events_segment_written", segment=name, sessions=len(sessions))
+        return locations
+
+    async def load(self, segment: str, offset: int, length: int) -> list[Any]:
+        key = (segment, offset)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+
+        member = await self.store.read(segment, offset, length)
+        tap_events: list[Any] = json.loads(gzip.decompress(member))["tap_events"]
+        self._cache.set(key, tap_events)
+        return tap_events
+
+
+def create_store(settings: Settings) -> SegmentStore:
+    if settings.tap_archive_backend == "s3":
+        return S3SegmentStore(
+            settings.tap_archive_bucket,
+            settings.tap_archive_prefix,
+            endpoint_url=settings.tap_archive_endpoint_url or None,
+            region=settings.cognito_region,
+        )
+    return LocalSegmentStore(settings.tap_archive_dir)
+
+
+tap_archive = TapEventArchive(
+    create_store(get_settings()), cache_size=get_settings().tap_archive_cache_size
+)
@@ -0,0 +1,116 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable, Hashable
+
+import structlog
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+
+Render = Callable[[Hashable], Awaitable[bytes]]
+
+
+class Broadcaster:
+    """
+    Coalescing fan-out for server-sent events.
+
+    Writers call mark_dirty(key) as often as they like; once per tick every
+    dirty key with subscribers is rendered once and the same bytes are handed
+    to all of its subscribers. Each subscriber queue holds only the latest
+    payload, so slow clients skip intermediate states instead of buffering.
+    """
+
+    def __init__(self, tick_seconds: float, refresh_seconds: float = 60.0):
+        self.tick_seconds = tick_seconds
+        # Re-render everything periodically so changes made elsewhere (other
+        # workers, day rollover) still reach subscribers; unchanged payloads are not resent
+        self.refresh_seconds = refresh_seconds
+        self._render: Render | None = None
+        self._subscribers: dict[Hashable, set[asyncio.Queue[bytes]]] = {}
+        self._dirty: set[Hashable] = set()
+        self._last_payload: dict[Hashable, bytes] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self, render: Render) -> None:
+        self._render = render
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    def mark_dirty(self, key: Hashable) -> None:
+        if key in self._subscribers:
+            self._dirty.add(key)
+
+    def mark_all_dirty(self) -> None:
+        self._dirty.update(self._subscribers)
+
+    def subscribe(self, key: Hashable) -> asyncio.Queue[bytes]:
+        queue: asyncio.Queue[bytes] = asyncio.Queue(maxsize=1)
+        subscribers = self._subscribers.setdefault(key, set())
+        subscribers.add(queue)
+
+        last = self._last_payload.get(key)
+        if last is not None:
+            queue.put_nowait(last)
+        else:
+            self._dirty.add(key)
+        return queue
+
+    def unsubscribe(self, key: Hashable, queue: asyncio.Queue[bytes]) -> None:
+        subscribers = self._subscribers.get(key)
+        if subscribers is None:
+            return
+        subscribers.discard(queue)
+        if not subscribers:
+            del self._subscribers[key]
+            self._last_payload.pop(key, None)
+            self._dirty.discard(key)
+
+    def subscriber_count(self) -> int:
+        return sum(len(queues) for queues in self._subscribers.values())
+
+    async def flush(self) -> None:
+        """Render each dirty board once and fan the result out."""
+        if self._render is None:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        for key in dirty:
+            if key not in self._subscribers:
+                continue
+            try:
+                payload = await self._render(key)
+            except Exception as e:
+                logger.error("broadcast_render_error", key=str(key), error=str(e))
+                continue
+
+            if payload == self._last_payload.get(key):
+                continue
+            self._last_payload[key] = payload
+
+            for queue in self._subscribers.get(key, ()):
+                if queue.full():
+                    queue.get_nowait()
+                queue.put_nowait(payload)
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_refresh = loop.time() + self.refresh_seconds
+        while True:
+            await asyncio.sleep(self.tick_seconds)
+            if loop.time() >= next_refresh:
+                self.mark_all_dirty()
+                next_refresh = loop.time() + self.refresh_seconds
+            await self.flush()
+
+
+settings = get_settings()
+
+# Today's boards keyed by (grid_size, order_mode); render is wired up in app.main
+leaderboard_broadcaster = Broadcaster(tick_seconds=settings.leaderboard_stream_tick_seconds)
@@ -0,0 +1,81 @@
+import time
+from collections import OrderedDict
+from collections.abc import Hashable
+from typing import Any, Generic, TypeVar
+
+from app.core import metrics
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+# Caches created with a name are reported on /metrics
+_named_caches: dict[str, "TTLCache[Any, Any]"] = {}
+
+
+class TTLCache(Generic[K, V]):
+    """Small in-process cache with per-entry expiry and LRU eviction.
+
+    Not thread-safe — meant to be used from the event loop only.
+    """
+
+    def __init__(self, ttl_seconds: float, maxsize: int = 1024, name: str | None = None):
+        self.ttl_seconds = ttl_seconds
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        if name is not None:
+            _named_caches[name] = self
+
+    def get(self, key: K) -> V | None:
+        item = self._data.get(key)
+        if item is None:
+            self.misses += 1
+            return None
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            self.misses += 1
+            return None
+
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V) -> None:
+        self._data[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key: K) -> V | None:
+        item = self._data.pop(key, None)
+        return item[1] if item else None
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+metrics.counter(
+    "cache_hits_total",
+    "In-process cache hits",
+    ["cache"],
+    collect=lambda: {(name,): c.hits for name, c in _named_caches.items()},
+)
+metrics.counter(
+    "cache_misses_total",
+    "In-process cache misses (absent or expired)",
+    ["cache"],
+    collect=lambda: {(name,): c.misses for name, c in _named_caches.items()},
+)
+metrics.gauge(
+    "cache_entries",
+    "Entries currently held by an in-process cache",
+    ["cache"],
+    collect=lambda: {(name,): len(c) for name, c in _named_caches.items()},
+)
@@ -1,12 +1,25 @@
+import time
 import uuid
 from collections.abc import AsyncGenerator
 from datetime import datetime
+from typing import Any
 
-from sqlalchemy import MetaData, func
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from fastapi import Request
+from sqlalchemy import DateTime, MetaData, func
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry
 
 from app.config import get_settings
+from app.core import metrics
+from app.core.cache import TTLCache
+from app.core.ids import uuid7
+from app.core.invalidation import EventKind, InvalidationEvent, invalidation_bus
 
 convention = {
     "ix": "ix_%(column_0_label)s",
@@ -19,6 +32,8 @@ convention = {
 
 class Base(DeclarativeBase):
     metadata = MetaData(naming_convention=convention)
+    # Migrations create every timestamp as timestamptz; bind aware datetimes to match
+    type_annotation_map = {datetime: DateTime(timezone=True)}
 
 
 class TimestampMixin:
@@ -27,30 +42,203 @@ class TimestampMixin:
 
 
 class UUIDMixin:
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
 
 
 settings = get_settings()
 
-engine = create_async_engine(
-    settings.database_url,
-    echo=settings.debug,
-    pool_size=5,
-    max_overflow=10,
+pool_wait_seconds = metrics.histogram(
+    "db_pool_wait_seconds",
+    "Time spent waiting to check a connection out of the pool, excluding connect time",
+    ["pool"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
+)
+pool_connect_seconds = metrics.histogram(
+    "db_pool_connect_seconds",
+    "Time spent opening a new connection for the pool",
+    ["pool"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0, 30.0),
 )
 
+# ConnectionPoolEntry.info key carrying a new connection's connect time to _do_get
+_CONNECT_SECONDS = "instrumented_pool_connect_seconds"
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """
+    Queue pool that records how long each checkout waited for a connection. When
+    the checkout has to open a connection, that time goes to db_pool_connect_seconds
+    instead, so cold starts and pool growth don't look like pool exhaustion.
+    """
+
+    metrics_name = "primary"
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        connect_seconds = 0.0
+        try:
+            record = super()._do_get()
+            connect_seconds = record.info.pop(_CONNECT_SECONDS, 0.0)
+            return record
+        finally:
+            waited = time.perf_counter() - started - connect_seconds
+            pool_wait_seconds.observe(waited, pool=self.metrics_name)
+
+    def _create_connection(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        record = super()._create_connection()
+        elapsed = time.perf_counter() - started
+        pool_connect_seconds.observe(elapsed, pool=self.metrics_name)
+        record.info[_CONNECT_SECONDS] = elapsed
+        return record
+
+    def recreate(self) -> "InstrumentedPool":
+        pool = super().recreate()
+        pool.metrics_name = self.metrics_name  # type: ignore[attr-defined]
+        return pool  # type: ignore[return-value]
+
+
+def connect_args(pgbouncer: bool) -> dict[str, Any]:
+    if pgbouncer:
+        # Transaction pooling hands each transaction a different server
+        # connection: disable both statement caches and give every prepared
+        # statement a unique name so it can never collide on a reused backend.
+        # Startup parameters are rejected by PgBouncer, so statement_timeout
+        # must be set on the role (ALTER ROLE ... SET statement_timeout).
+        return {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid.uuid4()}__",
+            "command_timeout": settings.db_command_timeout_seconds,
+        }
+    return {
+        # asyncpg's own cache and SQLAlchemy's prepared-statement cache
+        "statement_cache_size": settings.db_statement_cache_size,
+        "prepared_statement_cache_size": settings.db_statement_cache_size,
+        "command_timeout": settings.db_command_timeout_seconds,
+        "server_settings": {"statement_timeout": str(settings.db_statement_timeout_ms)},
+    }
+
+
+def _create_engine(url: str, name: str) -> AsyncEngine:
+    new_engine = create_async_engine(
+        url,
+        echo=settings.debug,
+        poolclass=InstrumentedPool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        connect_args=connect_args(settings.db_pgbouncer),
+    )
+    new_engine.sync_engine.pool.metrics_name = name  # type: ignore[attr-defined]
+    return new_engine
+
+
+engine = _create_engine(settings.database_url, "primary")
+
 async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
 
-async def init_db(database_url: str) -> None:
-    """Recreate the engine with a new URL (call after loading SSM password)."""
-    global engine, async_session_factory
+def read_only_sessionmaker(
+    bind: AsyncEngine, pgbouncer: bool = False
+) -> async_sessionmaker[AsyncSession]:
+    """
+    Autocommit sessions for pure reads: no BEGIN/COMMIT round trips, no autoflush.
+
+    Behind PgBouncer in transaction mode they run in a READ ONLY transaction
+    instead. asyncpg prepares and executes a statement in two round trips, and
+    without a transaction PgBouncer may send them to different server connections.
+    """
+    options: dict[str, Any] = (
+        {"postgresql_readonly": True} if pgbouncer else {"isolation_level": "AUTOCOMMIT"}
+    )
+    return async_sessionmaker(
+        bind.execution_options(**options),
+        expire_on_commit=False,
+        autoflush=False,
+    )
+
+
+# Replica engine for read-only endpoints; falls back to the primary
+read_engine = (
+    _create_engine(settings.database_read_url, "replica") if settings.db_read_host else engine
+)
+
+read_session_factory = read_only_sessionmaker(read_engine, settings.db_pgbouncer)
+primary_read_session_factory = read_only_sessionmaker(engine, settings.db_pgbouncer)
+
+
+async def init_db(database_url: str, read_database_url: str | None = None) -> None:
+    """Recreate the engines with new URLs (call after loading SSM password)."""
+    global engine, async_session_factory, read_engine, read_session_factory
+    global primary_read_session_factory
+    if read_engine is not engine:
+        await read_engine.dispose()
     await engine.dispose()
-    engine = create_async_engine(database_url, echo=settings.debug, pool_size=5, max_overflow=10)
+
+    engine = _create_engine(database_url, "primary")
     async_session_factory = async_sessionmaker(engine, expire_on_commit=False)
 
+    read_engine = (
+        _create_engine(read_database_url, "replica")
+        if read_database_url and read_database_url != database_url
+        else engine
+    )
+    read_session_factory = read_only_sessionmaker(read_engine, settings.db_pgbouncer)
+    primary_read_session_factory = read_only_sessionmaker(engine, settings.db_pgbouncer)
+
+
+def pool_stats() -> dict[str, dict[str, int]]:
+    """Live connection counts per pool (primary, and replica when configured)."""
+    engines = {"primary": engine}
+    if read_engine is not engine:
+        engines["replica"] = read_engine
+    stats = {}
+    for name, eng in engines.items():
+        pool = eng.sync_engine.pool
+        stats[name] = {
+            "size": pool.size(),  # type: ignore[attr-defined]
+            "checked_out": pool.checkedout(),  # type: ignore[attr-defined]
+            "idle": pool.checkedin(),  # type: ignore[attr-defined]
+            # Negative until the base pool is full
+            "overflow": max(pool.overflow(), 0),  # type: ignore[attr-defined]
+        }
+    return stats
+
+
+def _pool_gauge(field: str) -> dict[metrics.LabelValues, float]:
+    return {(name,): stats[field] for name, stats in pool_stats().items()}
+
+
+metrics.gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out",
+    ["pool"],
+    collect=lambda: _pool_gauge("checked_out"),
+)
+metrics.gauge(
+    "db_pool_idle",
+    "Idle connections held by the pool",
+    ["pool"],
+    collect=lambda: _pool_gauge("idle"),
+)
+metrics.gauge(
+    "db_pool_overflow",
+    "Connections open beyond pool_size",
+    ["pool"],
+    collect=lambda: _pool_gauge("overflow"),
+)
+
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    # Safe methods never write: skip the BEGIN/COMMIT round trips (see read_only_sessionmaker)
+    if request.method in ("GET", "HEAD"):
+        async with primary_read_session_factory() as session:
+            yield session
+        return
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
     async with async_session_factory() as session:
         try:
             yield session
@@ -58,3 +246,33 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         except Exception:
             await session.rollback()
             raise
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Read-only session on the read replica. Use only for endpoints that never write."""
+    async with read_session_factory() as session:
+        yield session
+
+
+# Users who wrote recently read from the primary until the replica has caught up
+_recent_writers: TTLCache[uuid.UUID, bool] = TTLCache(
+    ttl_seconds=settings.read_your_writes_seconds, maxsize=100_000, name="recent_writers"
+)
+
+
+def mark_recent_write(user_id: uuid.UUID) -> None:
+    _recent_writers.set(user_id, True)
+
+
+def has_recent_write(user_id: uuid.UUID) -> bool:
+    return _recent_writers.get(user_id) is not None
+
+
+def _on_user_write(event: InvalidationEvent) -> None:
+    if event.key is not None:
+        mark_recent_write(uuid.UUID(event.key))
+
+
+invalidation_bus.subscribe(EventKind.USER_WRITE, _on_user_write)
+invalidation_bus.subscribe(EventKind.USER_PROFILE, _on_user_write)
+invalidation_bus.subscribe(EventKind.FOLLOWS, _on_user_write)
@@ -1,6 +1,11 @@
 from fastapi import HTTPException, status
 
 
+class BadRequestError(HTTPException):
+    def __init__(self, detail: str = "Invalid request"):
+        super().__init__(status_code=status.HTTP_400_BAD_REQUEST, detail=detail)
+
+
 class AuthenticationError(HTTPException):
     def __init__(self, detail: str = "Could not validate credentials"):
         super().__init__(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
@@ -0,0 +1,159 @@
+import time
+from collections import Counter
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any
+
+import structlog
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.core import metrics
+
+logger = structlog.get_logger()
+
+
+@dataclass
+class RequestSQLStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    shapes: Counter[str] = field(default_factory=Counter)
+
+
+_current_stats: ContextVar[RequestSQLStats | None] = ContextVar("request_sql_stats", default=None)
+
+
+def current_sql_stats() -> RequestSQLStats | None:
+    return _current_stats.get()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(
+    conn: Any, cursor: Any, statement: str, parameters: Any, context: Any, executemany: bool
+) -> None:
+    stats = _current_stats.get()
+    if stats is None or not conn.info.get("query_started"):
+        return
+    stats.statements += 1
+    stats.db_seconds += time.perf_counter() - conn.info["query_started"].pop()
+    # SQL text is already parameterized, so identical text means identical shape
+    stats.shapes[statement] += 1
+
+
+class SQLInstrumentationMiddleware:
+    """
+    Count statements and DB time per request. Adds a Server-Timing header,
+    logs the totals, and in debug warns when one statement shape repeats
+    often enough to look like an N+1 loop.
+
+    Pure ASGI (not BaseHTTPMiddleware) so the context variable set here is
+    the one the endpoint's queries see.
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int | None = None):
+        self.app = app
+        settings = get_settings()
+        self.warn_repeats = settings.debug
+        self.repeat_threshold = repeat_threshold or settings.sql_repeat_warn_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestSQLStats()
+        token = _current_stats.set(stats)
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                timing = f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries"'
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", timing.encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current_stats.reset(token)
+            self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: RequestSQLStats) -> None:
+        if not stats.statements:
+            return
+        logger.info(
+            "request_sql",
+            method=scope["method"],
+            path=scope["path"],
+            statements=stats.statements,
+            db_ms=round(stats.db_seconds * 1000, 1),
+        )
+        if not self.warn_repeats:
+            return
+        for shape, count in stats.shapes.items():
+            if count >= self.repeat_threshold:
+                logger.warning(
+                    "sql_repeated_statement",
+                    method=scope["method"],
+                    path=scope["path"],
+                    count=count,
+                    statement=" ".join(shape.split())[:300],
+                )
+
+
+request_duration = metrics.histogram(
+    "http_request_duration_seconds",
+    "Request latency by route template",
+    ["method", "route", "status"],
+)
+requests_in_flight = metrics.gauge(
+    "http_requests_in_flight", "Requests currently being handled", ["method"]
+)
+
+
+class RequestMetricsMiddleware:
+    """Per-route latency histogram and in-flight gauge. Pure ASGI, like the SQL middleware."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        requests_in_flight.inc(method=method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_flight.dec(method=method)
+            # The router stores the matched route in the scope; use its
+            # template so /sessions/{session_id} is one series, not one per id
+            route = scope.get("route")
+            request_duration.observe(
+                time.perf_counter() - started,
+                method=method,
+                route=getattr(route, "path", "unmatched"),
+                status=str(status),
+            )
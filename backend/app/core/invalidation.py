@@ -0,0 +1,129 @@
+import asyncio
+import json
+from collections.abc import Callable
+from dataclasses import dataclass
+from enum import StrEnum
+from typing import Any
+
+import asyncpg
+import structlog
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+logger = structlog.get_logger()
+
+CHANNEL = "cache_invalidation"
+_RECONNECT_DELAY_SECONDS = 5
+
+
+class EventKind(StrEnum):
+    USER_PROFILE = "user_profile"  # key: user id
+    # key: [date, grid_size, order_mode, added_ms, removed_ms] (times may be null)
+    DAILY_LEADERBOARD = "daily_leaderboard"
+    FOLLOWS = "follows"  # key: follower id
+    USER_WRITE = "user_write"  # key: user id (read-your-writes pinning)
+
+
+@dataclass(frozen=True)
+class InvalidationEvent:
+    kind: EventKind
+    # None means "everything of this kind" (sent after a reconnect, when events may be lost)
+    key: Any = None
+
+    def encode(self) -> str:
+        return json.dumps({"kind": self.kind.value, "key": self.key})
+
+    @classmethod
+    def decode(cls, payload: str) -> "InvalidationEvent":
+        data = json.loads(payload)
+        return cls(kind=EventKind(data["kind"]), key=data["key"])
+
+
+Handler = Callable[[InvalidationEvent], None]
+
+
+async def publish(db: AsyncSession, event: InvalidationEvent) -> None:
+    """
+    Queue an invalidation on the caller's transaction. PostgreSQL delivers it
+    to every listening worker (including this one) only if the transaction commits.
+    """
+    await db.execute(select(func.pg_notify(CHANNEL, event.encode())))
+
+
+class InvalidationBus:
+    """Fans PostgreSQL NOTIFY messages out to in-process cache handlers."""
+
+    def __init__(self) -> None:
+        self._handlers: dict[EventKind, list[Handler]] = {}
+        self._conn: asyncpg.Connection | None = None
+        self._dsn: str | None = None
+        self._reconnect_task: asyncio.Task[None] | None = None
+
+    def subscribe(self, kind: EventKind, handler: Handler) -> None:
+        self._handlers.setdefault(kind, []).append(handler)
+
+    def dispatch(self, event: InvalidationEvent) -> None:
+        for handler in self._handlers.get(event.kind, ()):
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error("invalidation_handler_error", kind=event.kind, error=str(e))
+
+    async def start(self, dsn: str) -> None:
+        self._dsn = dsn
+        try:
+            await self._connect()
+        except (OSError, asyncpg.PostgresError) as e:
+            # Keep retrying, as after a disconnect, rather than serve stale caches forever
+            logger.warning("invalidation_bus_connect_failed", error=str(e))
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def stop(self) -> None:
+        self._dsn = None
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._conn is not None:
+            await self._conn.close()
+            self._conn = None
+
+    async def _connect(self) -> None:
+        assert self._dsn is not None
+        self._conn = await asyncpg.connect(self._dsn)
+        self._conn.add_termination_listener(self._on_terminated)
+        await self._conn.add_listener(CHANNEL, self._on_notify)
+        logger.info("invalidation_bus_listening", channel=CHANNEL)
+
+    def _on_notify(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        try:
+            event = InvalidationEvent.decode(payload)
+        except (ValueError, KeyError) as e:
+            logger.warning("invalidation_bad_payload", payload=payload, error=str(e))
+            return
+        self.dispatch(event)
+
+    def _on_terminated(self, conn: Any) -> None:
+        self._conn = None
+        if self._dsn is not None and self._reconnect_task is None:
+            logger.warning("invalidation_bus_disconnected")
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        try:
+            while self._dsn is not None:
+                await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+                try:
+                    await self._connect()
+                except (OSError, asyncpg.PostgresError) as e:
+                    logger.warning("invalidation_bus_reconnect_failed", error=str(e))
+                    continue
+
+                # Anything published while we were away is lost: drop everything
+                for kind in self._handlers:
+                    self.dispatch(InvalidationEvent(kind=kind))
+                return
+        finally:
+            self._reconnect_task = None
+
+
+invalidation_bus = InvalidationBus()
@@ -0,0 +1,147 @@
+import asyncio
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from types import FrameType
+
+import structlog
+
+from app.config import get_settings
+from app.core import metrics
+
+logger = structlog.get_logger()
+
+loop_lag = metrics.histogram(
+    "event_loop_lag_seconds",
+    "How late the monitor's timer fired — time the loop was busy elsewhere",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+loop_lag_last = metrics.gauge("event_loop_lag_last_seconds", "Most recent event-loop lag sample")
+loop_blocks = metrics.counter(
+    "event_loop_blocked_total", "Callbacks caught blocking the loop past the threshold"
+)
+
+_LIBRARY_PATHS = tuple(
+    {sysconfig.get_paths()[k] for k in ("stdlib", "platstdlib", "purelib", "platlib")}
+)
+
+
+def _is_own_code(frame: FrameType) -> bool:
+    return not frame.f_code.co_filename.startswith(_LIBRARY_PATHS)
+
+
+def culprit(frame: FrameType) -> FrameType:
+    """Innermost frame in our own code, else the innermost frame.
+
+    A blocking boto3 call sits deep in site-packages; the useful answer is the
+    service function that made it.
+    """
+    current: FrameType | None = frame
+    while current is not None:
+        if _is_own_code(current):
+            return current
+        current = current.f_back
+    return frame
+
+
+class LoopMonitor:
+    """
+    Samples event-loop lag every `interval` seconds and exports it as a metric.
+
+    With `watchdog` enabled (debug), a background thread also watches the
+    loop's heartbeat; when the loop stalls longer than `block_threshold` it
+    captures the loop thread's stack and logs the module and function that
+    were running.
+    """
+
+    def __init__(self, interval: float, block_threshold: float, watchdog: bool = False):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.watchdog = watchdog
+        self._task: asyncio.Task[None] | None = None
+        self._thread: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._heartbeat = time.monotonic()
+        self._loop_thread_id: int | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopping.clear()
+        self._task = asyncio.create_task(self._run())
+        if self.watchdog:
+            self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._thread.start()
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+            self._thread = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        # The watchdog needs a heartbeat finer than the block threshold
+        tick = min(self.interval, self.block_threshold / 2) if self.watchdog else self.interval
+        next_sample = loop.time() + self.interval
+        while True:
+            scheduled = loop.time()
+            await asyncio.sleep(tick)
+            now = loop.time()
+            self._heartbeat = time.monotonic()
+            if now >= next_sample:
+                lag = max(now - scheduled - tick, 0.0)
+                loop_lag.observe(lag)
+                loop_lag_last.set(lag)
+                next_sample = now + self.interval
+
+    def _watch(self) -> None:
+        reported_beat = 0.0
+        while not self._stopping.wait(self.block_threshold / 4):
+            beat = self._heartbeat
+            blocked = time.monotonic() - beat
+            if blocked < self.block_threshold or beat == reported_beat:
+                continue
+            # One report per stall: the stack is captured while still blocked
+            reported_beat = beat
+            frame = sys._current_frames().get(self._loop_thread_id)  # type: ignore[arg-type]
+            if frame is None:
+                continue
+            self._report(frame, blocked)
+
+    def _report(self, frame: FrameType, blocked: float) -> None:
+        # Metrics are only touched on the loop thread
+        if self._loop is not None:
+            self._loop.call_soon_threadsafe(loop_blocks.inc)
+        offender = culprit(frame)
+        logger.warning(
+            "event_loop_blocked",
+            blocked_ms=round(blocked * 1000),
+            module=offender.f_globals.get("__name__", "?"),
+            function=offender.f_code.co_name,
+            line=offender.f_lineno,
+            stack="".join(traceback.format_stack(frame, limit=15)),
+        )
+
+
+settings = get_settings()
+
+# Stack capture only in debug; the lag metric is always on
+loop_monitor = LoopMonitor(
+    interval=settings.loop_monitor_interval_seconds,
+    block_threshold=settings.loop_block_threshold_seconds,
+    watchdog=settings.debug,
+)
@@ -0,0 +1,226 @@
+"""
+In-process metrics in the Prometheus text format.
+
+Recording is a dict update with no locks: every metric is only touched from
+its worker's event loop, and each uvicorn worker exposes its own values.
+"""
+
+import bisect
+import math
+from collections.abc import Callable, Iterable
+from typing import TypeVar
+
+# Label values in the order of the metric's labelnames
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values, strict=True)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self.samples())
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """
+    Monotonic counter, either incremented or read from an existing running
+    total by `collect` at scrape time.
+    """
+
+    kind = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        collect: Callable[[], dict[LabelValues, float]] | None = None,
+    ):
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        values = self._collect() if self._collect else self._values
+        return values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        values = self._collect() if self._collect else self._values
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in values.items()
+        ]
+
+
+class Gauge(_Metric):
+    """
+    Point-in-time value. Either set explicitly or computed at scrape time by
+    `collect`, which returns {label values: value}.
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        collect: Callable[[], dict[LabelValues, float]] | None = None,
+    ):
+        super().__init__(name, help, labelnames)
+        self._values: dict[LabelValues, float] = {}
+        self._collect = collect
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        values = self._collect() if self._collect else self._values
+        return values.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        values = self._collect() if self._collect else self._values
+        return [
+            f"{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}"
+            for k, v in values.items()
+        ]
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram in the Prometheus exposition format."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts..., +Inf count], sum
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def sum(self, **labels: str) -> float:
+        return self._sums.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        lines = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, math.inf), counts, strict=True):
+                cumulative += n
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}"
+                )
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+M = TypeVar("M", bound=_Metric)
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: M) -> M:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        return "\n".join(m.render() for m in self._metrics.values()) + "\n"
+
+
+REGISTRY = Registry()
+
+
+def counter(
+    name: str,
+    help: str,
+    labelnames: Iterable[str] = (),
+    collect: Callable[[], dict[LabelValues, float]] | None = None,
+) -> Counter:
+    return REGISTRY.register(Counter(name, help, labelnames, collect))
+
+
+def gauge(
+    name: str,
+    help: str,
+    labelnames: Iterable[str] = (),
+    collect: Callable[[], dict[LabelValues, float]] | None = None,
+) -> Gauge:
+    return REGISTRY.register(Gauge(name, help, labelnames, collect))
+
+
+def histogram(
+    name: str,
+    help: str,
+    labelnames: Iterable[str] = (),
+    buckets: Iterable[float] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return REGISTRY.register(Histogram(name, help, labelnames, buckets))
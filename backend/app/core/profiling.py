@@ -0,0 +1,305 @@
+import asyncio
+import gzip
+import hmac
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import FrameType
+
+import structlog
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+from app.core.instrumentation import RequestSQLStats, current_sql_stats
+
+logger = structlog.get_logger()
+
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+
+# Sample categories, checked innermost-first against each frame
+_SQL_MODULES = ("sqlalchemy", "asyncpg")
+_SERIALIZATION_FUNCTIONS = {"serialize_response", "jsonable_encoder", "render"}
+
+
+def fold_stack(frame: FrameType | None) -> str:
+    """Frames outermost-first as 'module:function;...' — the folded format flamegraph.pl reads."""
+    names = []
+    while frame is not None:
+        names.append(f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+def categorize(frame: FrameType | None) -> str:
+    """'sql', 'serialization' or 'route' for one sample."""
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith(_SQL_MODULES):
+            return "sql"
+        if frame.f_code.co_name in _SERIALIZATION_FUNCTIONS and module.startswith(
+            ("fastapi", "starlette")
+        ):
+            return "serialization"
+        frame = frame.f_back
+    return "route"
+
+
+@dataclass
+class RequestProfile:
+    id: str
+    method: str
+    path: str
+    stacks: Counter[str] = field(default_factory=Counter)
+    categories: Counter[str] = field(default_factory=Counter)
+
+    def add(self, frame: FrameType) -> None:
+        self.stacks[fold_stack(frame)] += 1
+        self.categories[categorize(frame)] += 1
+
+
+class _TaskSampler:
+    """
+    One thread that samples the event-loop thread while any profiled request
+    is in flight. Each sample is credited to the request whose task is running;
+    samples taken while the loop is idle or running other tasks are dropped.
+    """
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._profiles: dict[asyncio.Task[object], RequestProfile] = {}
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._loop_thread_id = 0
+
+    def track(self, task: asyncio.Task[object], profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles[task] = profile
+            if self._thread is None:
+                self._loop = task.get_loop()
+                self._loop_thread_id = threading.get_ident()
+                self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+                self._thread.start()
+
+    def untrack(self, task: asyncio.Task[object]) -> None:
+        with self._lock:
+            self._profiles.pop(task, None)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._profiles:
+                    # Nothing to profile: let the thread exit until the next request
+                    self._thread = None
+                    return
+                task = asyncio.current_task(self._loop)
+                profile = self._profiles.get(task) if task is not None else None
+                if profile is None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    profile.add(frame)
+
+
+class ProfilingMiddleware:
+    """
+    Opt-in sampling profiler for single requests. A request is profiled when it
+    carries X-Profile-Token matching PROFILING_TOKEN, or when it falls in the
+    PROFILING_SAMPLE_RATE fraction. Writes `<id>.folded` (flame graph input)
+    and `<id>.json` (wall, SQL and serialization split) to PROFILING_OUTPUT_DIR
+    and returns the id in X-Profile-Id.
+
+    Only installed when PROFILING_ENABLED is set, so it costs nothing otherwise.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        settings = get_settings()
+        self.token = settings.profiling_token.encode()
+        self.sample_rate = settings.profiling_sample_rate
+        self.output_dir = Path(settings.profiling_output_dir)
+        self.sampler = _TaskSampler(settings.profiling_interval_ms / 1000)
+
+    def _should_profile(self, scope: Scope) -> bool:
+        if self.token:
+            for name, value in scope["headers"]:
+                if name == PROFILE_TOKEN_HEADER:
+                    return hmac.compare_digest(value, self.token)
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not self._should_profile(scope):
+            await self.app(scope, receive, send)
+            return
+
+        profile = RequestProfile(id=uuid.uuid4().hex, method=scope["method"], path=scope["path"])
+        task = asyncio.current_task()
+        assert task is not None
+
+        async def send_with_id(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"x-profile-id", profile.id.encode()),
+                ]
+            await send(message)
+
+        started = time.perf_counter()
+        self.sampler.track(task, profile)
+        try:
+            await self.app(scope, receive, send_with_id)
+        finally:
+            self.sampler.untrack(task)
+            wall = time.perf_counter() - started
+            route = str(getattr(scope.get("route"), "path", scope["path"]))
+            await asyncio.to_thread(self._write, profile, route, wall, current_sql_stats())
+
+    def _write(
+        self, profile: RequestProfile, route: str, wall: float, sql: RequestSQLStats | None
+    ) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{time.strftime('%Y%m%dT%H%M%S')}-{_slug(route)}-{profile.id}"
+
+        folded = self.output_dir / f"{name}.folded"
+        folded.write_text("".join(f"{stack} {n}\n" for stack, n in profile.stacks.items()))
+
+        samples = sum(profile.categories.values())
+        summary = {
+            "id": profile.id,
+            "method": profile.method,
+            "path": profile.path,
+            "route": route,
+            "wall_ms": round(wall * 1000, 2),
+            # Measured by the SQL instrumentation: includes time awaiting Postgres
+            "sql_ms": round(sql.db_seconds * 1000, 2) if sql else None,
+            "sql_statements": sql.statements if sql else None,
+            # On-CPU samples on the loop thread, split by what was running
+            "samples": samples,
+            "sample_interval_ms": self.sampler.interval * 1000,
+            "categories": dict(profile.categories),
+            "category_ms_estimate": {
+                k: round(n * self.sampler.interval * 1000, 1)
+                for k, n in profile.categories.items()
+            },
+        }
+        (self.output_dir / f"{name}.json").write_text(json.dumps(summary, indent=2))
+        logger.info("request_profiled", profile_id=profile.id, route=route, file=str(folded))
+
+
+def _slug(route: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", route).strip("_") or "root"
+
+
+@dataclass
+class ProfileWindow:
+    started_at: float  # Unix time
+    ended_at: float
+    stacks: Counter[str]
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {n}\n" for stack, n in self.stacks.most_common())
+
+
+class ContinuousProfiler:
+    """
+    Always-on statistical sampler for one worker. Samples the event-loop thread
+    every `interval` seconds, aggregates folded stacks per `window_seconds`,
+    and writes each finished window gzipped to `output_dir`. Only the newest
+    `keep` files are kept. Samples of the idle loop (waiting in select, or in
+    uvloop's C poll) are skipped, so a window's totals reflect CPU time.
+    """
+
+    def __init__(self, interval: float, window_seconds: float, output_dir: Path, keep: int):
+        self.interval = interval
+        self.window_seconds = window_seconds
+        self.output_dir = output_dir
+        self.keep = keep
+        self.latest: ProfileWindow | None = None
+        self._stopping = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._loop_thread_id = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._loop_thread_id = threading.get_ident()
+        try:
+            self._loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self._loop = None
+        self._stopping.clear()
+        self._thread = threading.Thread(target=self._run, name="continuous-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+            self._thread = None
+
+    def _run(self) -> None:
+        stacks: Counter[str] = Counter()
+        window_start = time.time()
+        while not self._stopping.wait(self.interval):
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is not None and not _is_idle(frame, self._loop):
+                stacks[fold_stack(frame)] += 1
+
+            now = time.time()
+            if now - window_start >= self.window_seconds:
+                self._finish_window(ProfileWindow(window_start, now, stacks))
+                stacks = Counter()
+                window_start = now
+
+    def _finish_window(self, window: ProfileWindow) -> None:
+        self.latest = window
+        try:
+            self.output_dir.mkdir(parents=True, exist_ok=True)
+            stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(window.started_at))
+            stamp += f"{int(window.started_at * 1000) % 1000:03d}"
+            path = self.output_dir / f"profile-{stamp}-{os.getpid()}.folded.gz"
+            with gzip.open(path, "wt") as f:
+                f.write(window.folded())
+            self._rotate()
+        except OSError as e:
+            logger.error("profile_write_error", error=str(e))
+
+    def _rotate(self) -> None:
+        files = sorted(
+            self.output_dir.glob("profile-*.folded.gz"), key=lambda p: p.stat().st_mtime
+        )
+        for old in files[: max(len(files) - self.keep, 0)]:
+            old.unlink(missing_ok=True)
+
+
+def _is_idle(frame: FrameType, loop: asyncio.AbstractEventLoop | None) -> bool:
+    """The loop thread is waiting for I/O instead of running Python code."""
+    module = frame.f_globals.get("__name__")
+    if module == "selectors":
+        return frame.f_code.co_name in ("select", "poll")
+    # uvloop polls in C, so an idle loop leaves the frame that started it innermost
+    return (
+        frame.f_code.co_name in ("run", "run_until_complete", "run_forever")
+        and loop is not None
+        and asyncio.current_task(loop) is None
+    )
+
+
+settings = get_settings()
+
+continuous_profiler = ContinuousProfiler(
+    interval=settings.profiling_continuous_interval_ms / 1000,
+    window_seconds=settings.profiling_continuous_window_seconds,
+    output_dir=Path(settings.profiling_output_dir) / "continuous",
+    keep=settings.profiling_continuous_keep,
+)
@@ -0,0 +1,92 @@
+from bisect import bisect_left
+from datetime import date
+
+from app.config import get_settings
+from app.core.cache import TTLCache
+
+
+class TimeHistogram:
+    """Fixed-resolution histogram of best times for one leaderboard.
+
+    Works like a coarse HDR histogram: times are grouped into buckets of
+    ``resolution_ms`` and ranks are interpolated inside a bucket, so memory and
+    lookup cost depend on the spread of times, not on the number of players.
+    """
+
+    def __init__(self, resolution_ms: int):
+        self.resolution_ms = resolution_ms
+        self.total = 0
+        self._counts: dict[int, int] = {}
+        self._keys: list[int] = []
+        self._prefix: list[int] = []
+        self._dirty = False
+
+    def add(self, time_ms: int, count: int = 1) -> None:
+        bucket = time_ms // self.resolution_ms
+        self._counts[bucket] = self._counts.get(bucket, 0) + count
+        self.total += count
+        self._dirty = True
+
+    def discard(self, time_ms: int) -> None:
+        bucket = time_ms // self.resolution_ms
+        current = self._counts.get(bucket, 0)
+        if current <= 0:
+            return
+        if current == 1:
+            del self._counts[bucket]
+        else:
+            self._counts[bucket] = current - 1
+        self.total -= 1
+        self._dirty = True
+
+    def count_faster(self, time_ms: int) -> float:
+        """Estimate how many recorded times are strictly below ``time_ms``."""
+        if self._dirty:
+            self._rebuild()
+
+        bucket = time_ms // self.resolution_ms
+        idx = bisect_left(self._keys, bucket)
+        below: float = self._prefix[idx - 1] if idx > 0 else 0
+
+        in_bucket = self._counts.get(bucket, 0)
+        if in_bucket:
+            fraction = (time_ms - bucket * self.resolution_ms) / self.resolution_ms
+            below += in_bucket * fraction
+
+        return float(below)
+
+    def _rebuild(self) -> None:
+        self._keys = sorted(self._counts)
+        running = 0
+        self._prefix = []
+        for key in self._keys:
+            running += self._counts[key]
+            self._prefix.append(running)
+        self._dirty = False
+
+
+BoardKey = tuple[date, int, str]
+
+settings = get_settings()
+
+# Per-board sketches keyed by (date, grid_size, order_mode)
+daily_sketches: TTLCache[BoardKey, TimeHistogram] = TTLCache(
+    ttl_seconds=settings.leaderboard_sketch_ttl_seconds,
+    maxsize=256,
+    name="daily_sketches",
+)
+
+# Period boards are keyed by (period_type, period_start, grid_size, order_mode).
+# Their upserts are single ON CONFLICT statements, so these only refresh on TTL.
+period_sketches: TTLCache[tuple[str, date, int, str], TimeHistogram] = TTLCache(
+    ttl_seconds=settings.leaderboard_sketch_ttl_seconds,
+    maxsize=256,
+    name="period_sketches",
+)
+
+# All-time boards are keyed by (grid_size, order_mode) and also refresh on TTL only
+all_time_sketches: TTLCache[tuple[int, str], TimeHistogram] = TTLCache(
+    ttl_seconds=settings.leaderboard_sketch_ttl_seconds,
+    maxsize=64,
+    name="all_time_sketches",
+)
@@ -5,6 +5,7 @@ import httpx
 from jose import JWTError, jwk, jwt
 
 from app.config import get_settings
+from app.core import metrics
 from app.core.exceptions import AuthenticationError
 
 # Cache JWKS keys in memory
@@ -12,14 +13,18 @@ _jwks_cache: dict[str, Any] = {}
 _jwks_cache_time: float = 0
 _JWKS_CACHE_TTL = 86400  # 24 hours
 
+jwks_lookups = metrics.counter("jwks_lookups_total", "JWKS lookups by cache result", ["result"])
+
 
 async def _get_jwks() -> dict[str, Any]:
     """Fetch and cache Cognito JWKS (JSON Web Key Set)."""
     global _jwks_cache, _jwks_cache_time
 
     if _jwks_cache and (time.time() - _jwks_cache_time) < _JWKS_CACHE_TTL:
+        jwks_lookups.inc(result="hit")
         return _jwks_cache
 
+    jwks_lookups.inc(result="miss")
     settings = get_settings()
     async with httpx.AsyncClient() as client:
         response = await client.get(settings.cognito_jwks_url)
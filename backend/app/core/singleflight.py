@@ -0,0 +1,49 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Generic, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class SingleFlight(Generic[K, V]):
+    """
+    Coalesce concurrent identical reads: while a call for a key is in flight,
+    other callers with the same key await its result instead of running their own.
+
+    The result object is shared between callers, so it must be treated as read-only.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.shared = 0
+        self._in_flight: dict[K, asyncio.Future[V]] = {}
+
+    async def do(self, key: K, fn: Callable[[], Awaitable[V]]) -> V:
+        while (future := self._in_flight.get(key)) is not None:
+            self.shared += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                task = asyncio.current_task()
+                if future.cancelled() and task is not None and not task.cancelling():
+                    continue  # The leader was cancelled, not us: take over
+                raise
+
+        self.calls += 1
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
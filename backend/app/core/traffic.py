@@ -0,0 +1,215 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import time
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode
+
+import structlog
+from jose import jwt
+from jose.exceptions import JOSEError
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.config import get_settings
+
+logger = structlog.get_logger()
+
+CAPTURE_VERSION = 1
+REDACTED = "***"
+
+# Never written to a capture, at any depth of the body or in the query string
+SENSITIVE_FIELDS = frozenset(
+    {
+        "email",
+        "password",
+        "new_password",
+        "confirmation_code",
+        "code",
+        "display_name",
+        "avatar_url",
+        "refresh_token",
+        "access_token",
+        "id_token",
+    }
+)
+MAX_BODY_BYTES = 1024 * 1024  # Larger bodies are recorded without content
+FLUSH_EVERY = 100
+FLUSH_SECONDS = 1.0
+
+_UUID_SEGMENT = re.compile(r"^[0-9a-f]{8}-(?:[0-9a-f]{4}-){3}[0-9a-f]{12}$", re.IGNORECASE)
+
+
+def redact(value: Any) -> Any:
+    """Copy of a JSON value with sensitive fields replaced."""
+    if isinstance(value, dict):
+        return {k: REDACTED if k in SENSITIVE_FIELDS else redact(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [redact(v) for v in value]
+    return value
+
+
+class TrafficCapture:
+    """
+    Sanitized request log for replay. One JSON line per API request:
+
+        {"v": 1, "ts": 1760000000.123, "method": "GET",
+         "route": "/api/v1/sessions/{session_id}", "path": "/api/v1/sessions/~3fa2c19b0d4e",
+         "query": "page=2", "actor": "a-9c1e0b7f22d41a6e", "body": null,
+         "status": 200, "duration_ms": 12.3}
+
+    Users appear only as keyed pseudonyms ("actor", and ids in paths), so a
+    capture shows who did what in which order without saying who they are.
+    Credentials, emails and names are redacted. Sampling is per actor, so a
+    sampled user's whole sequence of requests is kept.
+
+    Each worker appends to its own `traffic-<pid>.jsonl`; the replayer merges
+    files by timestamp.
+    """
+
+    def __init__(self, output_dir: Path, sample_rate: float, salt: str):
+        self.output_dir = output_dir
+        self.sample_rate = sample_rate
+        # Without a configured salt, pseudonyms are only stable within one process
+        self._key = (salt or secrets.token_hex(16)).encode()
+        self._buffer: list[str] = []
+        self._last_flush = time.monotonic()
+
+    @property
+    def path(self) -> Path:
+        return self.output_dir / f"traffic-{os.getpid()}.jsonl"
+
+    def pseudonym(self, prefix: str, value: str) -> str:
+        digest = hmac.new(self._key, value.encode(), hashlib.sha256).hexdigest()
+        return f"{prefix}{digest[:16]}"
+
+    def sampled(self, actor: str | None) -> bool:
+        if self.sample_rate >= 1:
+            return True
+        if actor is None:
+            return secrets.randbelow(10_000) < self.sample_rate * 10_000
+        # Stable per actor: the pseudonym is already a uniform hash
+        return int(actor[-8:], 16) / 0xFFFFFFFF < self.sample_rate
+
+    def actor(self, scope: Scope, body: Any) -> str | None:
+        """Pseudonym for the caller: token subject, or the email on a login."""
+        for name, value in scope["headers"]:
+            if name == b"authorization" and value.lower().startswith(b"bearer "):
+                try:
+                    # Unverified is fine: this only labels the request
+                    sub = jwt.get_unverified_claims(value[7:].decode()).get("sub")
+                except (JOSEError, UnicodeDecodeError):
+                    return None
+                return self.pseudonym("a-", str(sub)) if sub else None
+        if isinstance(body, dict) and isinstance(body.get("email"), str):
+            return self.pseudonym("a-", "email:" + body["email"].lower())
+        return None
+
+    def sanitize_path(self, path: str) -> str:
+        return "/".join(
+            "~" + self.pseudonym("", s.lower())[:12] if _UUID_SEGMENT.match(s) else s
+            for s in path.split("/")
+        )
+
+    @staticmethod
+    def sanitize_query(query: bytes) -> str:
+        pairs = parse_qsl(query.decode("latin-1"), keep_blank_values=True)
+        return urlencode([(k, REDACTED if k in SENSITIVE_FIELDS else v) for k, v in pairs])
+
+    async def record(self, entry: dict[str, Any]) -> None:
+        self._buffer.append(json.dumps(entry, separators=(",", ":")))
+        if (
+            len(self._buffer) >= FLUSH_EVERY
+            or time.monotonic() - self._last_flush >= FLUSH_SECONDS
+        ):
+            await self.flush()
+
+    async def flush(self) -> None:
+        if not self._buffer:
+            return
+        lines, self._buffer = self._buffer, []
+        self._last_flush = time.monotonic()
+        try:
+            await asyncio.to_thread(self._append, lines)
+        except OSError as e:
+            logger.error("traffic_capture_write_error", error=str(e))
+
+    def _append(self, lines: list[str]) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+class TrafficCaptureMiddleware:
+    """Feeds API requests to the capture. Only installed when TRAFFIC_CAPTURE_ENABLED is set."""
+
+    def __init__(self, app: ASGIApp, capture: TrafficCapture | None = None):
+        self.app = app
+        self.capture = capture or traffic_capture
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not scope["path"].startswith("/api/"):
+            await self.app(scope, receive, send)
+            return
+
+        arrived = time.time()
+        started = time.perf_counter()
+        chunks: list[bytes] = []
+        size = 0
+        status = 500
+
+        async def receive_and_keep() -> Message:
+            nonlocal size
+            message = await receive()
+            if message["type"] == "http.request":
+                size += len(message.get("body", b""))
+                if size <= MAX_BODY_BYTES:
+                    chunks.append(message.get("body", b""))
+            return message
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive_and_keep, send_with_status)
+        finally:
+            duration = time.perf_counter() - started
+            body: Any = None
+            if chunks and size <= MAX_BODY_BYTES:
+                try:
+                    body = json.loads(b"".join(chunks))
+                except ValueError:
+                    body = None
+            actor = self.capture.actor(scope, body)
+            if self.capture.sampled(actor):
+                await self.capture.record(
+                    {
+                        "v": CAPTURE_VERSION,
+                        "ts": round(arrived, 3),
+                        "method": scope["method"],
+                        "route": getattr(scope.get("route"), "path", None),
+                        "path": self.capture.sanitize_path(scope["path"]),
+                        "query": self.capture.sanitize_query(scope.get("query_string", b"")),
+                        "actor": actor,
+                        "body": redact(body),
+                        "body_omitted": size > MAX_BODY_BYTES,
+                        "status": status,
+                        "duration_ms": round(duration * 1000, 2),
+                    }
+                )
+
+
+settings = get_settings()
+
+traffic_capture = TrafficCapture(
+    output_dir=Path(settings.traffic_capture_dir),
+    sample_rate=settings.traffic_capture_sample_rate,
+    salt=settings.traffic_capture_salt,
+)
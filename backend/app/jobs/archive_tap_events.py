@@ -0,0 +1,79 @@
+"""Move tap events of old sessions to cold storage.
+
+Run daily (cron / EventBridge scheduled task):
+
+    python -m app.jobs.archive_tap_events              # older than TAP_ARCHIVE_AFTER_DAYS
+    python -m app.jobs.archive_tap_events --days 30
+
+Each batch is written as one new segment (app/core/archive.py) before the rows
+are updated, so a failure leaves at worst an unreferenced segment, never a
+session without its tap events. GET /sessions/{id} rehydrates them on demand.
+"""
+import argparse
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import structlog
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.core.database as db_module
+from app.config import get_settings
+from app.core.archive import TapEventArchive, tap_archive
+from app.repositories.session import SessionRepository
+
+logger = structlog.get_logger()
+
+
+async def archive_batch(
+    db: AsyncSession, archive: TapEventArchive, started_before: datetime, batch_size: int
+) -> int:
+    """Archive the oldest batch of sessions started before the cutoff. Returns its size."""
+    repo = SessionRepository(db)
+    sessions = await repo.get_unarchived_tap_events(started_before, batch_size)
+    if not sessions:
+        return 0
+
+    locations = await archive.write_segment(sessions)
+    await repo.mark_tap_events_archived(
+        [
+            (loc.session_id, started_at, loc.segment, loc.offset, loc.length)
+            for loc, (_, started_at, _) in zip(locations, sessions, strict=True)
+        ]
+    )
+    return len(sessions)
+
+
+async def archive(days: int, batch_size: int) -> int:
+    started_before = datetime.now(UTC) - timedelta(days=days)
+    total = 0
+    while True:
+        # One transaction per segment
+        async with db_module.async_session_factory() as session:
+            archived = await archive_batch(session, tap_archive, started_before, batch_size)
+            await session.commit()
+        total += archived
+        if archived < batch_size:
+            break
+
+    await db_module.engine.dispose()
+    logger.info("tap_events_archived", sessions=total, started_before=started_before.isoformat())
+    return total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=get_settings().tap_archive_after_days,
+        help="Archive sessions started more than this many days ago.",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=2000, help="Sessions per segment (default 2000)."
+    )
+    args = parser.parse_args()
+    asyncio.run(archive(args.days, args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Remove leaderboard entries whose training session no longer exists.
+
+Partitioned training_sessions cannot be the target of foreign keys, so the
+leaderboard tables hold session ids without one. Session deletes go through
+LeaderboardRepository.delete_for_session; this job catches rows removed any
+other way (manual fixes, dropped rows). Run daily (cron / EventBridge
+scheduled task):
+
+    python -m app.jobs.cleanup_leaderboard_orphans
+
+Sessions in detached partitions are not orphans: entries are only checked
+from the oldest attached month on.
+"""
+import argparse
+import asyncio
+import uuid
+
+import structlog
+
+import app.core.database as db_module
+from app.repositories.leaderboard import LeaderboardRepository
+from app.repositories.session import SessionRepository
+
+logger = structlog.get_logger()
+
+
+async def cleanup(batch_size: int) -> list[uuid.UUID]:
+    """Returns the orphaned session ids whose entries were removed."""
+    async with db_module.async_session_factory() as session:
+        since = await SessionRepository(session).attached_since()
+        repo = LeaderboardRepository(session)
+        orphaned = await repo.find_orphaned_session_ids(since)
+        # Each removal refills period and all-time bests: commit in batches
+        for start in range(0, len(orphaned), batch_size):
+            for session_id in orphaned[start : start + batch_size]:
+                await repo.delete_for_session(session_id)
+            await session.commit()
+
+    await db_module.engine.dispose()
+    logger.info("leaderboard_orphans_removed", sessions=len(orphaned), since=since)
+    return orphaned
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--batch-size", type=int, default=500, help="Sessions per transaction (default 500)."
+    )
+    args = parser.parse_args()
+    asyncio.run(cleanup(args.batch_size))
+
+
+if __name__ == "__main__":
+    main()
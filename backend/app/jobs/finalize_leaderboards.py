@@ -0,0 +1,46 @@
+"""Snapshot finished daily leaderboards.
+
+Run once a day after midnight (cron / EventBridge scheduled task):
+
+    python -m app.jobs.finalize_leaderboards             # yesterday
+    python -m app.jobs.finalize_leaderboards 2025-01-15  # specific date
+"""
+import argparse
+import asyncio
+from datetime import date, timedelta
+
+import structlog
+
+import app.core.database as db_module
+from app.services.leaderboard import LeaderboardService
+
+logger = structlog.get_logger()
+
+
+async def finalize(target_date: date) -> int:
+    if target_date >= date.today():
+        raise ValueError("Only past days can be finalized")
+
+    async with db_module.async_session_factory() as session:
+        boards = await LeaderboardService(session).finalize_daily(target_date)
+        await session.commit()
+
+    await db_module.engine.dispose()
+    return boards
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "date",
+        nargs="?",
+        type=date.fromisoformat,
+        default=date.today() - timedelta(days=1),
+        help="Day to finalize (YYYY-MM-DD). Defaults to yesterday.",
+    )
+    args = parser.parse_args()
+    asyncio.run(finalize(args.date))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Create upcoming training_sessions partitions and detach old ones.
+
+Run daily (cron / EventBridge scheduled task), so next month's partition always
+exists before the first session lands in it:
+
+    python -m app.jobs.manage_partitions                          # this month + 3 ahead
+    python -m app.jobs.manage_partitions --detach-before 2025-01  # also detach older months
+
+Detached partitions stay as plain tables (training_sessions_YYYY_MM) until they
+are dumped to archive storage and dropped.
+"""
+import argparse
+import asyncio
+from datetime import date
+
+import structlog
+
+import app.core.database as db_module
+from app.repositories.session import SessionRepository
+
+logger = structlog.get_logger()
+
+
+async def manage(
+    today: date, months_ahead: int, detach_before: date | None = None
+) -> tuple[list[str], list[str]]:
+    """Returns the (created, detached) partition names."""
+    async with db_module.async_session_factory() as session:
+        repo = SessionRepository(session)
+        created = await repo.ensure_partitions(today, months_ahead)
+        detached = []
+        if detach_before is not None:
+            if detach_before > today:
+                raise ValueError("Only past months can be detached")
+            detached = await repo.detach_partitions_before(detach_before)
+        await session.commit()
+
+    await db_module.engine.dispose()
+    logger.info("session_partitions_managed", created=created, detached=detached)
+    return created, detached
+
+
+def _month(value: str) -> date:
+    return date.fromisoformat(f"{value}-01")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--months-ahead", type=int, default=3, help="Future months to keep ready (default 3)."
+    )
+    parser.add_argument(
+        "--detach-before",
+        type=_month,
+        help="Detach partitions of months before this one (YYYY-MM).",
+    )
+    args = parser.parse_args()
+    asyncio.run(manage(date.today(), args.months_ahead, args.detach_before))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,4 @@
+import hmac
 from contextlib import asynccontextmanager
 from collections.abc import AsyncGenerator
 from typing import Any
@@ -5,11 +6,20 @@ from typing import Any
 import structlog
 from fastapi import FastAPI, Request, status
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from sqlalchemy import text
 
 from app.api.v1.router import api_router
 from app.config import get_settings
+from app.core.broadcast import leaderboard_broadcaster
+from app.core import metrics
+from app.core.exceptions import AuthenticationError
+from app.core.instrumentation import RequestMetricsMiddleware, SQLInstrumentationMiddleware
+from app.core.invalidation import invalidation_bus
+from app.core.loop_monitor import loop_monitor
+from app.core.profiling import PROFILE_TOKEN_HEADER, ProfilingMiddleware, continuous_profiler
+from app.core.traffic import TrafficCaptureMiddleware, traffic_capture
+from app.services.leaderboard import render_daily_top
 import app.core.database as db_module
 
 logger = structlog.get_logger()
@@ -25,6 +35,11 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
         debug=settings.debug,
     )
 
+    # Started first so blocking startup work (the SSM fetch) is caught too
+    loop_monitor.start()
+    if settings.profiling_continuous_enabled:
+        continuous_profiler.start()
+
     # Load DB password from SSM if path is configured (AWS deployment)
     if settings.db_password_ssm_path:
         try:
@@ -38,14 +53,29 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
             settings.db_password = response["Parameter"]["Value"]
             logger.info("ssm_password_loaded", path=settings.db_password_ssm_path)
             # Recreate DB engine with the real password
-            await db_module.init_db(settings.database_url)
+            await db_module.init_db(settings.database_url, settings.database_read_url)
         except Exception as e:
             logger.error("ssm_password_error", error=str(e))
 
+    # Cross-worker cache invalidation; asyncpg takes the plain postgresql:// URL
+    try:
+        await invalidation_bus.start(settings.database_listen_url)
+    except Exception as e:
+        logger.error("invalidation_bus_error", error=str(e))
+
+    leaderboard_broadcaster.start(render_daily_top)
+
     yield
 
     # Shutdown
+    await leaderboard_broadcaster.stop()
+    await invalidation_bus.stop()
+    if db_module.read_engine is not db_module.engine:
+        await db_module.read_engine.dispose()
     await db_module.engine.dispose()
+    await loop_monitor.stop()
+    continuous_profiler.stop()
+    await traffic_capture.flush()
     logger.info("app_shutdown")
 
 
@@ -67,17 +97,29 @@ app.add_middleware(
     allow_headers=["Authorization", "Content-Type"],
 )
 
+# Opt-in request profiler; inside the SQL middleware so it can read SQL time
+if settings.profiling_enabled:
+    app.add_middleware(ProfilingMiddleware)
+
+# Opt-in sanitized request capture, replayed by benchmarks/replay.py
+if settings.traffic_capture_enabled:
+    app.add_middleware(TrafficCaptureMiddleware)
+
+# Per-request SQL counts and timing, then route latency (outermost)
+app.add_middleware(SQLInstrumentationMiddleware)
+app.add_middleware(RequestMetricsMiddleware)
+
 # Routes
 app.include_router(api_router)
 
 
 @app.get("/health")
-async def health_check() -> dict[str, str]:
+async def health_check() -> dict[str, Any]:
     """Health check endpoint."""
     try:
         async with db_module.engine.begin() as conn:
             await conn.execute(text("SELECT 1"))
-        return {"status": "healthy", "database": "connected"}
+        return {"status": "healthy", "database": "connected", "pool": db_module.pool_stats()}
     except Exception as e:
         return JSONResponse(  # type: ignore[return-value]
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -85,6 +127,35 @@ async def health_check() -> dict[str, str]:
         )
 
 
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint() -> PlainTextResponse:
+    """Prometheus scrape endpoint (this worker's metrics only)."""
+    return PlainTextResponse(
+        metrics.REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.get("/debug/profile/latest", include_in_schema=False)
+async def latest_profile(request: Request) -> PlainTextResponse:
+    """Folded stacks of this worker's last finished profiling window."""
+    token = request.headers.get(PROFILE_TOKEN_HEADER.decode(), "")
+    if not settings.debug and not (
+        settings.profiling_token and hmac.compare_digest(token, settings.profiling_token)
+    ):
+        raise AuthenticationError("Profile token required")
+
+    window = continuous_profiler.latest
+    if window is None:
+        return PlainTextResponse("", status_code=status.HTTP_204_NO_CONTENT)
+    return PlainTextResponse(
+        window.folded(),
+        headers={
+            "X-Profile-Window-Start": str(window.started_at),
+            "X-Profile-Window-End": str(window.ended_at),
+        },
+    )
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
     """Catch unhandled exceptions and return structured error."""
@@ -1,5 +1,22 @@
-from app.models.user import User
+from app.models.user import User, UserFollow
 from app.models.session import TrainingSession
-from app.models.leaderboard import DailyLeaderboard, UserStats
+from app.models.leaderboard import (
+    AllTimeLeaderboard,
+    DailyLeaderboard,
+    DailyLeaderboardFinalization,
+    DailyLeaderboardSnapshot,
+    PeriodLeaderboard,
+    UserStats,
+)
 
-__all__ = ["User", "TrainingSession", "DailyLeaderboard", "UserStats"]
+__all__ = [
+    "User",
+    "UserFollow",
+    "TrainingSession",
+    "DailyLeaderboard",
+    "AllTimeLeaderboard",
+    "DailyLeaderboardFinalization",
+    "DailyLeaderboardSnapshot",
+    "PeriodLeaderboard",
+    "UserStats",
+]
@@ -6,21 +6,29 @@ from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.core.ids import uuid7
 
 
 class DailyLeaderboard(Base):
     __tablename__ = "daily_leaderboards"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
-    session_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("training_sessions.id", ondelete="CASCADE"))
+    # No foreign key: the partitioned sessions key includes started_at. Entries
+    # of deleted sessions go in LeaderboardRepository.delete_for_session, and
+    # app.jobs.cleanup_leaderboard_orphans removes any that slip past it
+    session_id: Mapped[uuid.UUID] = mapped_column()
     grid_size: Mapped[int] = mapped_column(Integer)
     order_mode: Mapped[str] = mapped_column(String(10))
     best_time_ms: Mapped[int] = mapped_column(Integer)
     date: Mapped[date] = mapped_column(Date, index=True)
 
     user = relationship("User", back_populates="leaderboard_entries")
-    session = relationship("TrainingSession")
+    session = relationship(
+        "TrainingSession",
+        primaryjoin="foreign(DailyLeaderboard.session_id) == TrainingSession.id",
+        viewonly=True,
+    )
 
     __table_args__ = (
         UniqueConstraint("user_id", "grid_size", "order_mode", "date", name="uq_daily_user_config"),
@@ -28,6 +36,98 @@ class DailyLeaderboard(Base):
     )
 
 
+class PeriodLeaderboard(Base):
+    """Best time per user for a week, month or season, kept up to date on every session."""
+
+    __tablename__ = "period_leaderboards"
+
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    period_type: Mapped[str] = mapped_column(String(10))  # week, month, season
+    period_start: Mapped[date] = mapped_column(Date)
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
+    # No foreign key, as on DailyLeaderboard.session_id
+    session_id: Mapped[uuid.UUID] = mapped_column()
+    grid_size: Mapped[int] = mapped_column(Integer)
+    order_mode: Mapped[str] = mapped_column(String(10))
+    best_time_ms: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "period_type",
+            "period_start",
+            "user_id",
+            "grid_size",
+            "order_mode",
+            name="uq_period_user_config",
+        ),
+        Index(
+            "idx_period_ranking",
+            "period_type",
+            "period_start",
+            "grid_size",
+            "order_mode",
+            "best_time_ms",
+        ),
+    )
+
+
+class AllTimeLeaderboard(Base):
+    """Best time per user and configuration over all days, maintained like PeriodLeaderboard."""
+
+    __tablename__ = "all_time_leaderboards"
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    grid_size: Mapped[int] = mapped_column(Integer, primary_key=True)
+    order_mode: Mapped[str] = mapped_column(String(10), primary_key=True)
+    # No foreign key, as on DailyLeaderboard.session_id
+    session_id: Mapped[uuid.UUID] = mapped_column()
+    best_time_ms: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (
+        Index("idx_all_time_ranking", "grid_size", "order_mode", "best_time_ms"),
+    )
+
+
+class DailyLeaderboardSnapshot(Base):
+    """Immutable ranked copy of a finished day's board, written by the finalization job."""
+
+    __tablename__ = "daily_leaderboard_snapshots"
+
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    grid_size: Mapped[int] = mapped_column(Integer, primary_key=True)
+    order_mode: Mapped[str] = mapped_column(String(10), primary_key=True)
+    position: Mapped[int] = mapped_column(Integer, primary_key=True)  # 1-based, unique per board
+    rank: Mapped[int] = mapped_column(Integer)  # Competition rank, shared by ties
+    user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"))
+    display_name: Mapped[str | None] = mapped_column(String(100))
+    best_time_ms: Mapped[int] = mapped_column(Integer)
+
+    __table_args__ = (
+        Index(
+            "idx_snapshot_user",
+            "date",
+            "grid_size",
+            "order_mode",
+            "user_id",
+            unique=True,
+        ),
+    )
+
+
+class DailyLeaderboardFinalization(Base):
+    """Marks a (date, grid_size, order_mode) board as snapshotted."""
+
+    __tablename__ = "daily_leaderboard_finalizations"
+
+    date: Mapped[date] = mapped_column(Date, primary_key=True)
+    grid_size: Mapped[int] = mapped_column(Integer, primary_key=True)
+    order_mode: Mapped[str] = mapped_column(String(10), primary_key=True)
+    total_entries: Mapped[int] = mapped_column(Integer)
+    finalized_at: Mapped[datetime] = mapped_column(server_default=func.now())
+
+
 class UserStats(Base):
     __tablename__ = "user_stats"
 
@@ -1,17 +1,41 @@
 import uuid
-from datetime import datetime
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import Float, ForeignKey, Index, Integer, String, UniqueConstraint, func
+from sqlalchemy import (
+    BigInteger,
+    Connection,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    UniqueConstraint,
+    event,
+    func,
+)
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.core.database import Base
+from app.core.ids import uuid7, uuid7_timestamp_ms
+
+# Catches sessions outside every monthly partition (very old offline syncs)
+DEFAULT_PARTITION = "training_sessions_default"
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
 
 
 class TrainingSession(Base):
+    """
+    One played table. Range-partitioned by month on started_at, so the partition
+    key is part of the primary key and of the client-id unique constraint.
+    """
+
     __tablename__ = "training_sessions"
 
-    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid.uuid4)
+    id: Mapped[uuid.UUID] = mapped_column(primary_key=True, default=uuid7)
     user_id: Mapped[uuid.UUID] = mapped_column(ForeignKey("users.id", ondelete="CASCADE"), index=True)
     client_session_id: Mapped[str] = mapped_column(String(255))
     grid_size: Mapped[int] = mapped_column(Integer)
@@ -22,14 +46,22 @@ class TrainingSession(Base):
     mistakes: Mapped[int] = mapped_column(Integer, default=0)
     accuracy: Mapped[float | None] = mapped_column(Float)
     tap_events: Mapped[list | None] = mapped_column(JSONB)
-    started_at: Mapped[datetime] = mapped_column()
+    # Set once tap_events moved to cold storage (app/core/archive.py)
+    tap_events_segment: Mapped[str | None] = mapped_column(String(255))
+    tap_events_offset: Mapped[int | None] = mapped_column(BigInteger)
+    tap_events_length: Mapped[int | None] = mapped_column(Integer)
+    started_at: Mapped[datetime] = mapped_column(primary_key=True)
     completed_at: Mapped[datetime | None] = mapped_column()
     created_at: Mapped[datetime] = mapped_column(server_default=func.now())
 
     user = relationship("User", back_populates="sessions")
 
     __table_args__ = (
-        UniqueConstraint("user_id", "client_session_id", name="uq_session_user_client"),
+        # Must include the partition key, so it only catches exact repeats. Retries
+        # with a shifted started_at are matched by SessionRepository.get_by_client_id.
+        UniqueConstraint(
+            "user_id", "client_session_id", "started_at", name="uq_session_user_client"
+        ),
         Index(
             "idx_sessions_leaderboard",
             "grid_size",
@@ -39,4 +71,78 @@ class TrainingSession(Base):
             postgresql_where=(status == "completed"),
         ),
         Index("idx_sessions_user_started", "user_id", "started_at"),
+        # Only rows still holding tap events: the archiver's queue, oldest first
+        Index(
+            "idx_sessions_unarchived",
+            "started_at",
+            postgresql_where=tap_events.is_not(None),
+        ),
+        {"postgresql_partition_by": "RANGE (started_at)"},
+    )
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    return f"training_sessions_{month:%Y_%m}"
+
+
+def session_id_for(started_at: datetime) -> uuid.UUID:
+    """
+    A uuid7 carrying started_at (to the millisecond) instead of the insert time,
+    so an id alone is enough to find the partition holding the session.
+    """
+    if started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=UTC)
+    return uuid7((started_at - _EPOCH) // timedelta(milliseconds=1))
+
+
+def started_at_bounds(session_id: uuid.UUID) -> tuple[datetime, datetime] | None:
+    """[start, end) of started_at for an id from session_id_for; None for other ids."""
+    if session_id.version != 7:
+        return None
+    start = _EPOCH + timedelta(milliseconds=uuid7_timestamp_ms(session_id))
+    return start, start + timedelta(milliseconds=1)
+
+
+def create_partition_sql(month: date) -> list[str]:
+    """
+    Statements that add the partition for `month` if it is missing. Rows that
+    already landed in the default partition for that month move into it, since
+    Postgres refuses a new partition that overlaps rows in the default one. A
+    table that already has the name, such as a detached partition waiting for
+    archival, is left alone.
+    """
+    name = partition_name(month)
+    start = f"'{month.isoformat()} 00:00:00+00'"
+    end = f"'{add_months(month, 1).isoformat()} 00:00:00+00'"
+    in_range = f"started_at >= {start} AND started_at < {end}"
+    return [
+        f"DO $$ BEGIN "
+        f"IF to_regclass('{name}') IS NULL THEN "
+        f"CREATE TABLE {name} "
+        f"(LIKE training_sessions INCLUDING DEFAULTS INCLUDING CONSTRAINTS); "
+        f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} WHERE {in_range} RETURNING *) "
+        f"INSERT INTO {name} SELECT * FROM moved; "
+        f"ALTER TABLE training_sessions ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ({start}) TO ({end}); "
+        f"END IF; END $$",
+    ]
+
+
+@event.listens_for(TrainingSession.__table__, "after_create")
+def _create_partitions(target: Table, connection: Connection, **kw: Any) -> None:
+    # create_all (tests, local databases): the default partition and this month.
+    # Migrated databases get theirs from migration 005 and app.jobs.manage_partitions.
+    connection.exec_driver_sql(
+        f"CREATE TABLE {DEFAULT_PARTITION} PARTITION OF training_sessions DEFAULT"
     )
+    for statement in create_partition_sql(month_start(date.today())):
+        connection.exec_driver_sql(statement)
@@ -0,0 +1,39 @@
+import uuid
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.invalidation import EventKind, InvalidationEvent, publish
+from app.models.user import UserFollow
+
+
+class FollowRepository:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def follow(self, follower_id: uuid.UUID, followee_id: uuid.UUID) -> None:
+        await self.db.execute(
+            pg_insert(UserFollow)
+            .values(follower_id=follower_id, followee_id=followee_id)
+            .on_conflict_do_nothing()
+        )
+        await self._publish_change(follower_id)
+
+    async def unfollow(self, follower_id: uuid.UUID, followee_id: uuid.UUID) -> None:
+        await self.db.execute(
+            delete(UserFollow).where(
+                UserFollow.follower_id == follower_id,
+                UserFollow.followee_id == followee_id,
+            )
+        )
+        await self._publish_change(follower_id)
+
+    async def _publish_change(self, follower_id: uuid.UUID) -> None:
+        await publish(self.db, InvalidationEvent(kind=EventKind.FOLLOWS, key=str(follower_id)))
+
+    async def get_followee_ids(self, follower_id: uuid.UUID) -> list[uuid.UUID]:
+        result = await self.db.execute(
+            select(UserFollow.followee_id).where(UserFollow.follower_id == follower_id)
+        )
+        return list(result.scalars().all())
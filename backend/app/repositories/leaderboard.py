@@ -1,12 +1,89 @@
 import uuid
-from datetime import date
+from collections.abc import Sequence
+from datetime import UTC, date, datetime, timedelta
+from typing import Any
 
-from sqlalchemy import func, select
+from sqlalchemy import (
+    ColumnElement,
+    Uuid,
+    any_,
+    bindparam,
+    delete,
+    func,
+    insert,
+    select,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.leaderboard import DailyLeaderboard
+from app.core import metrics
+from app.core.invalidation import EventKind, InvalidationEvent, publish
+from app.models.leaderboard import (
+    AllTimeLeaderboard,
+    DailyLeaderboard,
+    DailyLeaderboardFinalization,
+    DailyLeaderboardSnapshot,
+    PeriodLeaderboard,
+)
+from app.models.session import TrainingSession
 from app.models.user import User
 
+RankedBoard = type[DailyLeaderboard] | type[PeriodLeaderboard] | type[AllTimeLeaderboard]
+
+PERIOD_TYPES = ("week", "month", "season")
+
+# Leaderboard session ids whose session is gone. The started_at a uuid7 id
+# carries (session_id_for) prunes each probe to one partition; older ids are
+# rechecked without it by find_orphaned_session_ids.
+_ORPHANED_SESSION_IDS = """
+SELECT e.session_id
+FROM (
+    SELECT session_id FROM daily_leaderboards
+    UNION SELECT session_id FROM period_leaderboards
+    UNION SELECT session_id FROM all_time_leaderboards
+) e
+CROSS JOIN LATERAL (
+    SELECT timestamptz 'epoch' + interval '1 millisecond'
+        * ('x' || lpad(left(replace(e.session_id::text, '-', ''), 12), 16, '0'))::bit(64)::bigint
+        AS started_at
+) carried
+WHERE substr(e.session_id::text, 15, 1) = '7'
+    AND carried.started_at >= :since
+    AND NOT EXISTS (
+        SELECT 1 FROM training_sessions s
+        WHERE s.id = e.session_id
+            AND s.started_at >= carried.started_at
+            AND s.started_at < carried.started_at + interval '1 millisecond'
+    )
+"""
+
+leaderboard_upserts = metrics.counter(
+    "leaderboard_upserts_total",
+    "Leaderboard upserts by board and outcome",
+    ["board", "result"],
+)
+
+
+def period_bounds(period_type: str, day: date) -> tuple[date, date]:
+    """Returns [start, end) of the period containing day. Seasons are calendar quarters."""
+    if period_type == "week":
+        start = day - timedelta(days=day.weekday())
+        return start, start + timedelta(days=7)
+
+    if period_type == "month":
+        start = day.replace(day=1)
+    elif period_type == "season":
+        start = day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+    else:
+        raise ValueError(f"Unknown period type: {period_type}")
+
+    months = 1 if period_type == "month" else 3
+    month_index = start.month - 1 + months
+    end = start.replace(year=start.year + month_index // 12, month=month_index % 12 + 1)
+    return start, end
+
 
 class LeaderboardRepository:
     def __init__(self, db: AsyncSession):
@@ -51,12 +128,23 @@ class LeaderboardRepository:
             )
             self.db.add(entry)
             await self.db.flush()
+            await self._publish_daily_change(
+                target_date, grid_size, order_mode, added_ms=best_time_ms
+            )
+            leaderboard_upserts.inc(board="daily", result="inserted")
             return entry
 
         if best_time_ms < existing.best_time_ms:
+            removed_ms = existing.best_time_ms
             existing.best_time_ms = best_time_ms
             existing.session_id = session_id
             await self.db.flush()
+            await self._publish_daily_change(
+                target_date, grid_size, order_mode, added_ms=best_time_ms, removed_ms=removed_ms
+            )
+            leaderboard_upserts.inc(board="daily", result="improved")
+        else:
+            leaderboard_upserts.inc(board="daily", result="unchanged")
 
         return existing
 
@@ -69,97 +157,547 @@ class LeaderboardRepository:
         offset: int = 0,
     ) -> tuple[list[tuple[DailyLeaderboard, str | None]], int]:
         """Returns list of (entry, display_name) tuples and total count."""
-        query = (
-            select(DailyLeaderboard, User.display_name)
+        return await self._get_rankings(
+            DailyLeaderboard,
+            _daily_board(grid_size, order_mode, target_date),
+            limit,
+            offset,
+        )
+
+    async def count_daily(
+        self, grid_size: int, order_mode: str, target_date: date, limit: int | None = None
+    ) -> int:
+        """Count the board's entries, stopping early at limit."""
+        return await self._count(
+            DailyLeaderboard, _daily_board(grid_size, order_mode, target_date), limit
+        )
+
+    async def get_daily_rankings_for_users(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[tuple[DailyLeaderboard, str | None]], int]:
+        """Daily rankings restricted to a set of users (e.g. a friends board)."""
+        return await self._get_rankings(
+            DailyLeaderboard,
+            (
+                *_daily_board(grid_size, order_mode, target_date),
+                _user_in(DailyLeaderboard, user_ids),
+            ),
+            limit,
+            offset,
+        )
+
+    async def count_faster_daily_for_users(
+        self,
+        user_ids: Sequence[uuid.UUID],
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        best_time_ms: int,
+    ) -> int:
+        return await self._count_faster(
+            DailyLeaderboard,
+            (
+                *_daily_board(grid_size, order_mode, target_date),
+                _user_in(DailyLeaderboard, user_ids),
+            ),
+            best_time_ms,
+            None,
+        )
+
+    async def get_all_time_rankings(
+        self,
+        grid_size: int,
+        order_mode: str,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[tuple[AllTimeLeaderboard, str | None]], int]:
+        """Returns list of (entry, display_name) tuples and total count."""
+        return await self._get_rankings(
+            AllTimeLeaderboard, _all_time_board(grid_size, order_mode), limit, offset
+        )
+
+    async def count_all_time(
+        self, grid_size: int, order_mode: str, limit: int | None = None
+    ) -> int:
+        return await self._count(
+            AllTimeLeaderboard, _all_time_board(grid_size, order_mode), limit
+        )
+
+    async def count_faster_daily(
+        self,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        best_time_ms: int,
+        limit: int | None = None,
+    ) -> int:
+        """Count entries faster than best_time_ms, stopping early at limit."""
+        return await self._count_faster(
+            DailyLeaderboard,
+            _daily_board(grid_size, order_mode, target_date),
+            best_time_ms,
+            limit,
+        )
+
+    async def get_daily_time_histogram(
+        self,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        resolution_ms: int,
+    ) -> list[tuple[int, int]]:
+        """Returns (bucket, count) pairs with times grouped by resolution_ms."""
+        return await self._get_time_histogram(
+            DailyLeaderboard,
+            _daily_board(grid_size, order_mode, target_date),
+            resolution_ms,
+        )
+
+    async def get_daily_window(
+        self,
+        user_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        best_time_ms: int,
+        radius: int,
+    ) -> tuple[list[tuple[uuid.UUID, str | None, int]], list[tuple[uuid.UUID, str | None, int]]]:
+        """
+        Returns (above, below) neighbours of a daily entry as
+        (user_id, display_name, best_time_ms) tuples, nearest first.
+        Each side is a bounded seek on idx_daily_ranking starting at best_time_ms.
+        """
+        board = (
+            DailyLeaderboard.date == target_date,
+            DailyLeaderboard.grid_size == grid_size,
+            DailyLeaderboard.order_mode == order_mode,
+        )
+        columns = (DailyLeaderboard.user_id, User.display_name, DailyLeaderboard.best_time_ms)
+
+        above_result = await self.db.execute(
+            select(*columns)
+            .join(User, DailyLeaderboard.user_id == User.id)
+            .where(*board, DailyLeaderboard.best_time_ms < best_time_ms)
+            .order_by(DailyLeaderboard.best_time_ms.desc(), DailyLeaderboard.user_id.desc())
+            .limit(radius)
+        )
+        below_result = await self.db.execute(
+            select(*columns)
             .join(User, DailyLeaderboard.user_id == User.id)
             .where(
-                DailyLeaderboard.date == target_date,
-                DailyLeaderboard.grid_size == grid_size,
-                DailyLeaderboard.order_mode == order_mode,
+                *board,
+                DailyLeaderboard.best_time_ms >= best_time_ms,
+                DailyLeaderboard.user_id != user_id,
             )
-            .order_by(DailyLeaderboard.best_time_ms.asc())
+            .order_by(DailyLeaderboard.best_time_ms.asc(), DailyLeaderboard.user_id)
+            .limit(radius)
+        )
+
+        above = [(row[0], row[1], row[2]) for row in above_result.all()]
+        below = [(row[0], row[1], row[2]) for row in below_result.all()]
+        return above, below
+
+    async def get_all_time_entry(
+        self,
+        user_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+    ) -> AllTimeLeaderboard | None:
+        return await self.db.get(AllTimeLeaderboard, (user_id, grid_size, order_mode))
+
+    async def count_faster_all_time(
+        self, grid_size: int, order_mode: str, best_time_ms: int, limit: int | None = None
+    ) -> int:
+        return await self._count_faster(
+            AllTimeLeaderboard, _all_time_board(grid_size, order_mode), best_time_ms, limit
+        )
+
+    async def get_all_time_time_histogram(
+        self, grid_size: int, order_mode: str, resolution_ms: int
+    ) -> list[tuple[int, int]]:
+        return await self._get_time_histogram(
+            AllTimeLeaderboard, _all_time_board(grid_size, order_mode), resolution_ms
         )
 
-        # Count
-        count_query = (
-            select(func.count())
-            .select_from(DailyLeaderboard)
+    async def get_all_time_window(
+        self,
+        user_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        best_time_ms: int,
+        radius: int,
+    ) -> tuple[list[tuple[uuid.UUID, str | None, int]], list[tuple[uuid.UUID, str | None, int]]]:
+        """
+        Returns (above, below) neighbours of an all-time entry, as get_daily_window
+        does, seeking on idx_all_time_ranking.
+        """
+        board = _all_time_board(grid_size, order_mode)
+        columns = (AllTimeLeaderboard.user_id, User.display_name, AllTimeLeaderboard.best_time_ms)
+
+        above_result = await self.db.execute(
+            select(*columns)
+            .join(User, AllTimeLeaderboard.user_id == User.id)
+            .where(*board, AllTimeLeaderboard.best_time_ms < best_time_ms)
+            .order_by(AllTimeLeaderboard.best_time_ms.desc(), AllTimeLeaderboard.user_id.desc())
+            .limit(radius)
+        )
+        below_result = await self.db.execute(
+            select(*columns)
+            .join(User, AllTimeLeaderboard.user_id == User.id)
             .where(
-                DailyLeaderboard.date == target_date,
-                DailyLeaderboard.grid_size == grid_size,
-                DailyLeaderboard.order_mode == order_mode,
+                *board,
+                AllTimeLeaderboard.best_time_ms >= best_time_ms,
+                AllTimeLeaderboard.user_id != user_id,
             )
+            .order_by(AllTimeLeaderboard.best_time_ms.asc(), AllTimeLeaderboard.user_id)
+            .limit(radius)
         )
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar_one()
 
-        # Fetch page
-        result = await self.db.execute(query.offset(offset).limit(limit))
-        rows = [(row[0], row[1]) for row in result.all()]
+        above = [(row[0], row[1], row[2]) for row in above_result.all()]
+        below = [(row[0], row[1], row[2]) for row in below_result.all()]
+        return above, below
 
-        return rows, total
+    async def get_finalization(
+        self,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+    ) -> DailyLeaderboardFinalization | None:
+        return await self.db.get(
+            DailyLeaderboardFinalization, (target_date, grid_size, order_mode)
+        )
 
-    async def get_all_time_rankings(
+    async def get_snapshot_rankings(
         self,
         grid_size: int,
         order_mode: str,
+        target_date: date,
         limit: int = 50,
         offset: int = 0,
-    ) -> tuple[list[tuple[uuid.UUID, str | None, int]], int]:
-        """Returns list of (user_id, display_name, best_time_ms) and total count."""
-        # Subquery: best time per user across all dates
-        subq = (
+    ) -> list[DailyLeaderboardSnapshot]:
+        """Page of a finalized board, read as a primary-key range on position."""
+        result = await self.db.execute(
+            select(DailyLeaderboardSnapshot)
+            .where(
+                DailyLeaderboardSnapshot.date == target_date,
+                DailyLeaderboardSnapshot.grid_size == grid_size,
+                DailyLeaderboardSnapshot.order_mode == order_mode,
+                DailyLeaderboardSnapshot.position > offset,
+                DailyLeaderboardSnapshot.position <= offset + limit,
+            )
+            .order_by(DailyLeaderboardSnapshot.position)
+        )
+        return list(result.scalars().all())
+
+    async def get_snapshot_entry(
+        self,
+        user_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+    ) -> DailyLeaderboardSnapshot | None:
+        result = await self.db.execute(
+            select(DailyLeaderboardSnapshot).where(
+                DailyLeaderboardSnapshot.date == target_date,
+                DailyLeaderboardSnapshot.grid_size == grid_size,
+                DailyLeaderboardSnapshot.order_mode == order_mode,
+                DailyLeaderboardSnapshot.user_id == user_id,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def finalize_daily(self, target_date: date) -> int:
+        """
+        Snapshot every board of target_date with stored positions and ranks.
+        Re-running replaces the previous snapshot. Returns the number of boards.
+        """
+        await self.db.execute(
+            delete(DailyLeaderboardSnapshot).where(DailyLeaderboardSnapshot.date == target_date)
+        )
+        await self.db.execute(
+            delete(DailyLeaderboardFinalization).where(
+                DailyLeaderboardFinalization.date == target_date
+            )
+        )
+
+        board = (DailyLeaderboard.grid_size, DailyLeaderboard.order_mode)
+        ranked = (
             select(
+                DailyLeaderboard.date,
+                DailyLeaderboard.grid_size,
+                DailyLeaderboard.order_mode,
+                func.row_number()
+                .over(
+                    partition_by=board,
+                    order_by=(DailyLeaderboard.best_time_ms, DailyLeaderboard.user_id),
+                )
+                .label("position"),
+                func.rank()
+                .over(partition_by=board, order_by=DailyLeaderboard.best_time_ms)
+                .label("rank"),
                 DailyLeaderboard.user_id,
-                func.min(DailyLeaderboard.best_time_ms).label("best_time_ms"),
+                User.display_name,
+                DailyLeaderboard.best_time_ms,
             )
-            .where(
-                DailyLeaderboard.grid_size == grid_size,
-                DailyLeaderboard.order_mode == order_mode,
+            .join(User, DailyLeaderboard.user_id == User.id)
+            .where(DailyLeaderboard.date == target_date)
+        )
+        await self.db.execute(
+            insert(DailyLeaderboardSnapshot).from_select(
+                [
+                    "date",
+                    "grid_size",
+                    "order_mode",
+                    "position",
+                    "rank",
+                    "user_id",
+                    "display_name",
+                    "best_time_ms",
+                ],
+                ranked,
+            )
+        )
+
+        totals = (
+            select(
+                DailyLeaderboardSnapshot.date,
+                DailyLeaderboardSnapshot.grid_size,
+                DailyLeaderboardSnapshot.order_mode,
+                func.count(),
+            )
+            .where(DailyLeaderboardSnapshot.date == target_date)
+            .group_by(
+                DailyLeaderboardSnapshot.date,
+                DailyLeaderboardSnapshot.grid_size,
+                DailyLeaderboardSnapshot.order_mode,
             )
-            .group_by(DailyLeaderboard.user_id)
-            .subquery()
         )
+        result = await self.db.execute(
+            insert(DailyLeaderboardFinalization)
+            .from_select(["date", "grid_size", "order_mode", "total_entries"], totals)
+            .returning(DailyLeaderboardFinalization.grid_size)
+        )
+        return len(result.all())
 
-        query = (
-            select(subq.c.user_id, User.display_name, subq.c.best_time_ms)
-            .join(User, subq.c.user_id == User.id)
-            .order_by(subq.c.best_time_ms.asc())
+    async def upsert_period_entries(
+        self,
+        user_id: uuid.UUID,
+        session_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        best_time_ms: int,
+        target_date: date,
+    ) -> None:
+        """Record a completed time on every period board containing target_date."""
+        stmt = pg_insert(PeriodLeaderboard).values(
+            [
+                {
+                    "id": uuid.uuid4(),
+                    "period_type": period_type,
+                    "period_start": period_bounds(period_type, target_date)[0],
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "grid_size": grid_size,
+                    "order_mode": order_mode,
+                    "best_time_ms": best_time_ms,
+                }
+                for period_type in PERIOD_TYPES
+            ]
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_period_user_config",
+                set_={
+                    "best_time_ms": stmt.excluded.best_time_ms,
+                    "session_id": stmt.excluded.session_id,
+                },
+                where=PeriodLeaderboard.best_time_ms > stmt.excluded.best_time_ms,
+            )
         )
+        leaderboard_upserts.inc(board="period", result="submitted")
 
-        # Count
-        count_query = select(func.count()).select_from(subq)
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar_one()
+    async def upsert_all_time_entry(
+        self,
+        user_id: uuid.UUID,
+        session_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        best_time_ms: int,
+    ) -> None:
+        """Record a completed time on the all-time board."""
+        stmt = pg_insert(AllTimeLeaderboard).values(
+            user_id=user_id,
+            session_id=session_id,
+            grid_size=grid_size,
+            order_mode=order_mode,
+            best_time_ms=best_time_ms,
+        )
+        await self.db.execute(
+            stmt.on_conflict_do_update(
+                constraint="pk_all_time_leaderboards",
+                set_={
+                    "best_time_ms": stmt.excluded.best_time_ms,
+                    "session_id": stmt.excluded.session_id,
+                },
+                where=AllTimeLeaderboard.best_time_ms > stmt.excluded.best_time_ms,
+            )
+        )
+        leaderboard_upserts.inc(board="all_time", result="submitted")
 
-        result = await self.db.execute(query.offset(offset).limit(limit))
-        rows = [(row[0], row[1], row[2]) for row in result.all()]
+    async def get_period_entry(
+        self,
+        user_id: uuid.UUID,
+        period_type: str,
+        period_start: date,
+        grid_size: int,
+        order_mode: str,
+    ) -> PeriodLeaderboard | None:
+        result = await self.db.execute(
+            select(PeriodLeaderboard).where(
+                PeriodLeaderboard.user_id == user_id,
+                *_period_board(period_type, period_start, grid_size, order_mode),
+            )
+        )
+        return result.scalar_one_or_none()
 
-        return rows, total
+    async def get_period_rankings(
+        self,
+        period_type: str,
+        period_start: date,
+        grid_size: int,
+        order_mode: str,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> tuple[list[tuple[PeriodLeaderboard, str | None]], int]:
+        """Returns list of (entry, display_name) tuples and total count."""
+        return await self._get_rankings(
+            PeriodLeaderboard,
+            _period_board(period_type, period_start, grid_size, order_mode),
+            limit,
+            offset,
+        )
+
+    async def count_faster_period(
+        self,
+        period_type: str,
+        period_start: date,
+        grid_size: int,
+        order_mode: str,
+        best_time_ms: int,
+        limit: int | None = None,
+    ) -> int:
+        return await self._count_faster(
+            PeriodLeaderboard,
+            _period_board(period_type, period_start, grid_size, order_mode),
+            best_time_ms,
+            limit,
+        )
 
-    async def get_user_rank_daily(
+    async def get_period_time_histogram(
         self,
+        period_type: str,
+        period_start: date,
+        grid_size: int,
+        order_mode: str,
+        resolution_ms: int,
+    ) -> list[tuple[int, int]]:
+        return await self._get_time_histogram(
+            PeriodLeaderboard,
+            _period_board(period_type, period_start, grid_size, order_mode),
+            resolution_ms,
+        )
+
+    async def _refill_period_entry(
+        self,
+        period_type: str,
+        period_start: date,
         user_id: uuid.UUID,
         grid_size: int,
         order_mode: str,
-        target_date: date,
-    ) -> tuple[int, int] | None:
-        """Returns (rank, best_time_ms) or None if user has no entry."""
-        entry = await self.get_daily_entry(user_id, grid_size, order_mode, target_date)
-        if entry is None:
-            return None
-
-        # Count how many entries are faster
-        faster_count = await self.db.execute(
-            select(func.count()).where(
-                DailyLeaderboard.date == target_date,
+    ) -> None:
+        """Rebuild one period entry from the user's remaining daily entries."""
+        _, period_end = period_bounds(period_type, period_start)
+        result = await self.db.execute(
+            select(DailyLeaderboard)
+            .where(
+                DailyLeaderboard.user_id == user_id,
+                DailyLeaderboard.grid_size == grid_size,
+                DailyLeaderboard.order_mode == order_mode,
+                DailyLeaderboard.date >= period_start,
+                DailyLeaderboard.date < period_end,
+            )
+            .order_by(DailyLeaderboard.best_time_ms.asc())
+            .limit(1)
+        )
+        best = result.scalar_one_or_none()
+        if best is None:
+            return
+
+        self.db.add(
+            PeriodLeaderboard(
+                period_type=period_type,
+                period_start=period_start,
+                user_id=user_id,
+                session_id=best.session_id,
+                grid_size=grid_size,
+                order_mode=order_mode,
+                best_time_ms=best.best_time_ms,
+            )
+        )
+
+    async def _refill_all_time_entry(
+        self, user_id: uuid.UUID, grid_size: int, order_mode: str
+    ) -> None:
+        """Rebuild one all-time entry from the user's remaining daily entries."""
+        result = await self.db.execute(
+            select(DailyLeaderboard)
+            .where(
+                DailyLeaderboard.user_id == user_id,
                 DailyLeaderboard.grid_size == grid_size,
                 DailyLeaderboard.order_mode == order_mode,
-                DailyLeaderboard.best_time_ms < entry.best_time_ms,
+            )
+            .order_by(DailyLeaderboard.best_time_ms.asc())
+            .limit(1)
+        )
+        best = result.scalar_one_or_none()
+        if best is None:
+            return
+
+        self.db.add(
+            AllTimeLeaderboard(
+                user_id=user_id,
+                session_id=best.session_id,
+                grid_size=grid_size,
+                order_mode=order_mode,
+                best_time_ms=best.best_time_ms,
             )
         )
-        rank = faster_count.scalar_one() + 1
-        return rank, entry.best_time_ms
+
+    async def find_orphaned_session_ids(self, since: datetime | None) -> list[uuid.UUID]:
+        """
+        Session ids still held by leaderboard entries although the session is gone,
+        e.g. deleted without delete_for_session. Only ids carrying a started_at
+        from `since` on are checked, so sessions in detached partitions stay put.
+        """
+        result = await self.db.execute(
+            text(_ORPHANED_SESSION_IDS), {"since": since or datetime.min.replace(tzinfo=UTC)}
+        )
+        candidates = list(result.scalars().all())
+        if not candidates:
+            return []
+
+        # Ids minted before they carried started_at hold the insert time instead
+        found = await self.db.execute(
+            select(TrainingSession.id).where(TrainingSession.id.in_(candidates))
+        )
+        existing = set(found.scalars().all())
+        return [session_id for session_id in candidates if session_id not in existing]
 
     async def delete_for_session(self, session_id: uuid.UUID) -> None:
         result = await self.db.execute(
@@ -169,3 +707,152 @@ class LeaderboardRepository:
         if entry:
             await self.db.delete(entry)
             await self.db.flush()
+            await self._publish_daily_change(
+                entry.date, entry.grid_size, entry.order_mode, removed_ms=entry.best_time_ms
+            )
+
+        # Period entries held by this session fall back to the next best daily entry
+        removed = await self.db.execute(
+            delete(PeriodLeaderboard)
+            .where(PeriodLeaderboard.session_id == session_id)
+            .returning(
+                PeriodLeaderboard.period_type,
+                PeriodLeaderboard.period_start,
+                PeriodLeaderboard.user_id,
+                PeriodLeaderboard.grid_size,
+                PeriodLeaderboard.order_mode,
+            )
+        )
+        refills = removed.all()
+        for period_type, period_start, user_id, grid_size, order_mode in refills:
+            await self._refill_period_entry(
+                period_type, period_start, user_id, grid_size, order_mode
+            )
+
+        # Likewise for the all-time entry
+        removed = await self.db.execute(
+            delete(AllTimeLeaderboard)
+            .where(AllTimeLeaderboard.session_id == session_id)
+            .returning(
+                AllTimeLeaderboard.user_id,
+                AllTimeLeaderboard.grid_size,
+                AllTimeLeaderboard.order_mode,
+            )
+        )
+        all_time_refills = removed.all()
+        for user_id, grid_size, order_mode in all_time_refills:
+            await self._refill_all_time_entry(user_id, grid_size, order_mode)
+
+        if refills or all_time_refills:
+            await self.db.flush()
+
+    async def _publish_daily_change(
+        self,
+        target_date: date,
+        grid_size: int,
+        order_mode: str,
+        added_ms: int | None = None,
+        removed_ms: int | None = None,
+    ) -> None:
+        # The times let every worker patch its rank sketch once the change commits
+        await publish(
+            self.db,
+            InvalidationEvent(
+                kind=EventKind.DAILY_LEADERBOARD,
+                key=[target_date.isoformat(), grid_size, order_mode, added_ms, removed_ms],
+            ),
+        )
+
+    async def _get_rankings(
+        self,
+        model: RankedBoard,
+        board: tuple[ColumnElement[bool], ...],
+        limit: int,
+        offset: int,
+    ) -> tuple[list[tuple[Any, str | None]], int]:
+        total = await self._count(model, board)
+
+        result = await self.db.execute(
+            select(model, User.display_name)
+            .join(User, model.user_id == User.id)
+            .where(*board)
+            .order_by(model.best_time_ms.asc())
+            .offset(offset)
+            .limit(limit)
+        )
+        rows = [(row[0], row[1]) for row in result.all()]
+
+        return rows, total
+
+    async def _count(
+        self,
+        model: RankedBoard,
+        board: tuple[ColumnElement[bool], ...],
+        limit: int | None = None,
+    ) -> int:
+        if limit is None:
+            result = await self.db.execute(select(func.count()).select_from(model).where(*board))
+            return result.scalar_one()
+
+        entries = select(model.best_time_ms).where(*board).limit(limit)
+        result = await self.db.execute(select(func.count()).select_from(entries.subquery()))
+        return result.scalar_one()
+
+    async def _count_faster(
+        self,
+        model: RankedBoard,
+        board: tuple[ColumnElement[bool], ...],
+        best_time_ms: int,
+        limit: int | None,
+    ) -> int:
+        faster = select(model.best_time_ms).where(*board, model.best_time_ms < best_time_ms)
+        if limit is not None:
+            faster = faster.limit(limit)
+
+        result = await self.db.execute(select(func.count()).select_from(faster.subquery()))
+        return result.scalar_one()
+
+    async def _get_time_histogram(
+        self,
+        model: RankedBoard,
+        board: tuple[ColumnElement[bool], ...],
+        resolution_ms: int,
+    ) -> list[tuple[int, int]]:
+        bucket = (model.best_time_ms // resolution_ms).label("bucket")
+        result = await self.db.execute(
+            select(bucket, func.count()).where(*board).group_by(bucket)
+        )
+        return [(row[0], row[1]) for row in result.all()]
+
+
+def _daily_board(
+    grid_size: int, order_mode: str, target_date: date
+) -> tuple[ColumnElement[bool], ...]:
+    return (
+        DailyLeaderboard.date == target_date,
+        DailyLeaderboard.grid_size == grid_size,
+        DailyLeaderboard.order_mode == order_mode,
+    )
+
+
+def _period_board(
+    period_type: str, period_start: date, grid_size: int, order_mode: str
+) -> tuple[ColumnElement[bool], ...]:
+    return (
+        PeriodLeaderboard.period_type == period_type,
+        PeriodLeaderboard.period_start == period_start,
+        PeriodLeaderboard.grid_size == grid_size,
+        PeriodLeaderboard.order_mode == order_mode,
+    )
+
+
+def _all_time_board(grid_size: int, order_mode: str) -> tuple[ColumnElement[bool], ...]:
+    return (
+        AllTimeLeaderboard.grid_size == grid_size,
+        AllTimeLeaderboard.order_mode == order_mode,
+    )
+
+
+def _user_in(model: RankedBoard, user_ids: Sequence[uuid.UUID]) -> ColumnElement[bool]:
+    # One array parameter instead of an IN list, so thousands of ids stay one bind
+    return model.user_id == any_(bindparam("user_ids", list(user_ids), type_=ARRAY(Uuid)))
@@ -1,9 +1,25 @@
 import uuid
+from datetime import UTC, date, datetime, timedelta
 
-from sqlalchemy import func, select
+import structlog
+from sqlalchemy import bindparam, func, null, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.session import TrainingSession
+from app.models.session import (
+    DEFAULT_PARTITION,
+    TrainingSession,
+    add_months,
+    create_partition_sql,
+    month_start,
+    partition_name,
+    session_id_for,
+    started_at_bounds,
+)
+
+logger = structlog.get_logger()
+
+# A resent session matches on client id within this distance of its started_at
+CLIENT_ID_DEDUP_WINDOW = timedelta(days=1)
 
 
 class SessionRepository:
@@ -11,24 +27,60 @@ class SessionRepository:
         self.db = db
 
     async def get_by_id(self, session_id: uuid.UUID) -> TrainingSession | None:
+        # Ids carry started_at (session_id_for), which prunes the probe to one
+        # partition. Older ids (uuid4, or uuid7 of the insert time) probe them all.
+        bounds = started_at_bounds(session_id)
+        if bounds is not None:
+            result = await self.db.execute(
+                select(TrainingSession).where(
+                    TrainingSession.id == session_id,
+                    TrainingSession.started_at >= bounds[0],
+                    TrainingSession.started_at < bounds[1],
+                )
+            )
+            session = result.scalar_one_or_none()
+            if session is not None:
+                return session
+
         result = await self.db.execute(
             select(TrainingSession).where(TrainingSession.id == session_id)
         )
         return result.scalar_one_or_none()
 
+    async def lock_client_ids(self, user_id: uuid.UUID) -> None:
+        """
+        Serialize session creation per user until the transaction ends. The unique
+        key has to include started_at (the partition key), so it can't stop two
+        retries with different timestamps; get_by_client_id under this lock does.
+        """
+        await self.db.execute(
+            select(func.pg_advisory_xact_lock(func.hashtextextended(str(user_id), 0)))
+        )
+
     async def get_by_client_id(
-        self, user_id: uuid.UUID, client_session_id: str
+        self, user_id: uuid.UUID, client_session_id: str, started_at: datetime
     ) -> TrainingSession | None:
+        """
+        The user's session with this client id, started within
+        CLIENT_ID_DEDUP_WINDOW of started_at. Retries may resend the timestamp with
+        another precision or timezone; the window still prunes to one or two partitions.
+        """
         result = await self.db.execute(
-            select(TrainingSession).where(
+            select(TrainingSession)
+            .where(
                 TrainingSession.user_id == user_id,
                 TrainingSession.client_session_id == client_session_id,
+                TrainingSession.started_at >= started_at - CLIENT_ID_DEDUP_WINDOW,
+                TrainingSession.started_at <= started_at + CLIENT_ID_DEDUP_WINDOW,
             )
+            .limit(1)
         )
         return result.scalar_one_or_none()
 
     async def create(self, user_id: uuid.UUID, data: dict) -> TrainingSession:
         session = TrainingSession(user_id=user_id, **data)
+        if session.id is None:
+            session.id = session_id_for(session.started_at)
         self.db.add(session)
         await self.db.flush()
         return session
@@ -41,8 +93,19 @@ class SessionRepository:
         grid_size: int | None = None,
         order_mode: str | None = None,
         status: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
     ) -> tuple[list[TrainingSession], int]:
+        """
+        A page of the user's sessions, newest first. The started_at bounds prune
+        partitions; without them, the page is still an ordered scan that stops in
+        the newest partitions, but the count reads all of them.
+        """
         query = select(TrainingSession).where(TrainingSession.user_id == user_id)
+        if started_after is not None:
+            query = query.where(TrainingSession.started_at >= started_after)
+        if started_before is not None:
+            query = query.where(TrainingSession.started_at < started_before)
 
         if grid_size is not None:
             query = query.where(TrainingSession.grid_size == grid_size)
@@ -99,3 +162,126 @@ class SessionRepository:
         completed = completed_result.scalar_one()
 
         return total, completed
+
+    async def get_unarchived_tap_events(
+        self, started_before: datetime, limit: int
+    ) -> list[tuple[uuid.UUID, datetime, list]]:
+        """Oldest sessions still holding tap events, as (id, started_at, tap_events)."""
+        result = await self.db.execute(
+            select(TrainingSession.id, TrainingSession.started_at, TrainingSession.tap_events)
+            .where(
+                TrainingSession.tap_events.is_not(None),
+                TrainingSession.started_at < started_before,
+            )
+            .order_by(TrainingSession.started_at)
+            .limit(limit)
+        )
+        return [(row[0], row[1], row[2]) for row in result.all()]
+
+    async def mark_tap_events_archived(
+        self, archived: list[tuple[uuid.UUID, datetime, str, int, int]]
+    ) -> None:
+        """Swap tap events for (id, started_at, segment, offset, length) pointers."""
+        # Run on the Connection as a plain executemany: Session.execute would turn the
+        # parameter list into an ORM bulk update by primary key. The primary key
+        # prunes each row to one partition.
+        connection = await self.db.connection()
+        await connection.execute(
+            update(TrainingSession)
+            .where(
+                TrainingSession.id == bindparam("b_id"),
+                TrainingSession.started_at == bindparam("b_started_at"),
+            )
+            .values(
+                # SQL NULL: None would be stored as a JSON null and stay "unarchived"
+                tap_events=null(),
+                tap_events_segment=bindparam("b_segment"),
+                tap_events_offset=bindparam("b_offset"),
+                tap_events_length=bindparam("b_length"),
+            ),
+            [
+                {
+                    "b_id": session_id,
+                    "b_started_at": started_at,
+                    "b_segment": segment,
+                    "b_offset": offset,
+                    "b_length": length,
+                }
+                for session_id, started_at, segment, offset, length in archived
+            ],
+        )
+
+    async def ensure_partitions(self, today: date, months_ahead: int) -> list[str]:
+        """Create the monthly partitions from this month to months_ahead. Returns new names."""
+        existing = set(await self.list_partitions())
+        detached = set(await self.list_detached_partitions())
+        created = []
+        month = month_start(today)
+        for offset in range(months_ahead + 1):
+            target = add_months(month, offset)
+            name = partition_name(target)
+            if name in existing:
+                continue
+            if name in detached:
+                # Re-attaching would bring archived rows back: the month stays in
+                # the default partition until the table is archived and dropped
+                logger.warning("session_partition_detached_table_exists", partition=name)
+                continue
+            for statement in create_partition_sql(target):
+                await self.db.execute(text(statement))
+            created.append(name)
+            logger.info("session_partition_created", partition=name)
+        return created
+
+    async def detach_partitions_before(self, month: date) -> list[str]:
+        """
+        Detach monthly partitions older than `month`. Detaching only updates the
+        catalog: each partition stays behind as a plain table, ready to be dumped
+        to archive storage and dropped.
+        """
+        # DETACH locks the parent table: give up rather than queue every
+        # session query behind a long-running one
+        await self.db.execute(text("SET LOCAL lock_timeout = '5s'"))
+        detached = []
+        cutoff = partition_name(month_start(month))
+        # Partition names sort by month (training_sessions_YYYY_MM)
+        for name in await self.list_partitions():
+            if name == DEFAULT_PARTITION or name >= cutoff:
+                continue
+            await self.db.execute(text(f"ALTER TABLE training_sessions DETACH PARTITION {name}"))
+            detached.append(name)
+            logger.info("session_partition_detached", partition=name)
+        return detached
+
+    async def list_detached_partitions(self) -> list[str]:
+        """Plain tables named like a monthly partition, left behind by a detach."""
+        result = await self.db.execute(
+            text(
+                "SELECT relname FROM pg_class "
+                "WHERE relkind = 'r' AND NOT relispartition "
+                "AND relname ~ '^training_sessions_[0-9]{4}_[0-9]{2}$' "
+                "AND pg_table_is_visible(oid) ORDER BY relname"
+            )
+        )
+        return list(result.scalars().all())
+
+    async def attached_since(self) -> datetime | None:
+        """
+        Start of the oldest attached monthly partition: sessions from before it may
+        have been detached. None when only the default partition exists.
+        """
+        months = [name for name in await self.list_partitions() if name != DEFAULT_PARTITION]
+        if not months:
+            return None
+        # Partition names sort by month (training_sessions_YYYY_MM)
+        year, month = months[0].removeprefix("training_sessions_").split("_")
+        return datetime(int(year), int(month), 1, tzinfo=UTC)
+
+    async def list_partitions(self) -> list[str]:
+        result = await self.db.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+                "WHERE i.inhparent = 'training_sessions'::regclass ORDER BY c.relname"
+            )
+        )
+        return list(result.scalars().all())
@@ -3,6 +3,7 @@ import uuid
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.invalidation import EventKind, InvalidationEvent, publish
 from app.models.leaderboard import UserStats
 from app.models.user import DEFAULT_PREFERENCES, User
 
@@ -58,6 +59,7 @@ class UserRepository:
         if avatar_url is not None:
             user.avatar_url = avatar_url
         await self.db.flush()
+        await publish(self.db, InvalidationEvent(kind=EventKind.USER_PROFILE, key=str(user.id)))
         return user
 
     async def update_preferences(self, user: User, updates: dict) -> dict:
@@ -10,6 +10,7 @@ class LeaderboardEntry(BaseModel):
     display_name: str | None
     best_time_ms: int
     date: Date
+    approximate: bool = False  # True when ranked relative to an estimated rank
 
     model_config = {"from_attributes": True}
 
@@ -17,6 +18,8 @@ class LeaderboardEntry(BaseModel):
 class CurrentUserRank(BaseModel):
     rank: int
     best_time_ms: int
+    approximate: bool = False  # True when rank is estimated (outside the exact top-N)
+    top_percent: float | None = None
 
 
 class LeaderboardMeta(BaseModel):
@@ -24,6 +27,8 @@ class LeaderboardMeta(BaseModel):
     order_mode: str
     date: Date | None = None
     total_entries: int
+    finalized: bool = False  # Served from an immutable end-of-day snapshot
+    period: str | None = None  # week, month or season; date is then the period start
 
 
 class LeaderboardResponse(BaseModel):
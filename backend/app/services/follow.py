@@ -0,0 +1,54 @@
+import uuid
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import TTLCache
+from app.core.exceptions import BadRequestError, NotFoundError
+from app.core.invalidation import EventKind, InvalidationEvent, invalidation_bus
+from app.repositories.follow import FollowRepository
+from app.repositories.user import UserRepository
+
+# Friend-id sets per follower, including the follower themselves
+_friend_ids_cache: TTLCache[uuid.UUID, tuple[uuid.UUID, ...]] = TTLCache(
+    ttl_seconds=300, maxsize=10_000, name="friend_ids"
+)
+
+
+def _on_follows_changed(event: InvalidationEvent) -> None:
+    if event.key is None:
+        _friend_ids_cache.clear()
+    else:
+        _friend_ids_cache.pop(uuid.UUID(event.key))
+
+
+invalidation_bus.subscribe(EventKind.FOLLOWS, _on_follows_changed)
+
+
+class FollowService:
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.repo = FollowRepository(db)
+
+    async def follow(self, follower_id: uuid.UUID, followee_id: uuid.UUID) -> None:
+        if follower_id == followee_id:
+            raise BadRequestError("You cannot follow yourself")
+
+        if await UserRepository(self.db).get_by_id(followee_id) is None:
+            raise NotFoundError("User not found")
+
+        await self.repo.follow(follower_id, followee_id)
+        _friend_ids_cache.pop(follower_id)
+
+    async def unfollow(self, follower_id: uuid.UUID, followee_id: uuid.UUID) -> None:
+        await self.repo.unfollow(follower_id, followee_id)
+        _friend_ids_cache.pop(follower_id)
+
+    async def get_friend_ids(self, user_id: uuid.UUID) -> tuple[uuid.UUID, ...]:
+        """The user plus everyone they follow — the population of their friends board."""
+        cached = _friend_ids_cache.get(user_id)
+        if cached is not None:
+            return cached
+
+        friend_ids = (user_id, *await self.repo.get_followee_ids(user_id))
+        _friend_ids_cache.set(user_id, friend_ids)
+        return friend_ids
@@ -1,21 +1,99 @@
 import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable, Hashable, Sequence
 from datetime import date
+from typing import Any, cast
 
+import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.repositories.leaderboard import LeaderboardRepository
+import app.core.database as db_module
+from app.config import get_settings
+from app.core.broadcast import leaderboard_broadcaster
+from app.core.cache import TTLCache
+from app.core.invalidation import EventKind, InvalidationEvent, invalidation_bus
+from app.core.rank_sketch import (
+    TimeHistogram,
+    all_time_sketches,
+    daily_sketches,
+    period_sketches,
+)
+from app.core.singleflight import SingleFlight
+from app.models.leaderboard import AllTimeLeaderboard, DailyLeaderboard, PeriodLeaderboard
+from app.models.user import User
+from app.repositories.leaderboard import LeaderboardRepository, period_bounds
 from app.schemas.leaderboard import (
     CurrentUserRank,
     LeaderboardEntry,
     LeaderboardMeta,
     LeaderboardResponse,
 )
+from app.services.follow import FollowService
+
+logger = structlog.get_logger()
+
+
+class _SketchReload:
+    """Board changes that arrive while a sketch's histogram is loading."""
+
+    def __init__(self) -> None:
+        self.patches: list[tuple[int | None, int | None]] = []  # (added_ms, removed_ms)
+        self.stale = False  # Set when every sketch was dropped mid-load
+
+
+# In-flight sketch loads per sketch key, see LeaderboardService._get_sketch
+_sketch_reloads: defaultdict[Hashable, list[_SketchReload]] = defaultdict(list)
+
+
+def _on_daily_leaderboard_changed(event: InvalidationEvent) -> None:
+    if event.key is None:
+        leaderboard_broadcaster.mark_all_dirty()
+        daily_sketches.clear()
+        for reloads in _sketch_reloads.values():
+            for reload in reloads:
+                reload.stale = True
+        return
+
+    target_date, grid_size, order_mode, added_ms, removed_ms = event.key
+    if target_date == date.today().isoformat():
+        leaderboard_broadcaster.mark_dirty((grid_size, order_mode))
+
+    # Patched only after commit, so a rolled-back upsert never skews the estimate
+    board = (date.fromisoformat(target_date), grid_size, order_mode)
+    sketch = daily_sketches.get(board)
+    if sketch is not None:
+        _patch_sketch(sketch, added_ms, removed_ms)
+    for reload in _sketch_reloads.get(board, ()):
+        reload.patches.append((added_ms, removed_ms))
+
+
+def _patch_sketch(sketch: TimeHistogram, added_ms: int | None, removed_ms: int | None) -> None:
+    if removed_ms is not None:
+        sketch.discard(removed_ms)
+    if added_ms is not None:
+        sketch.add(added_ms)
+
+
+def _on_user_profile_changed(event: InvalidationEvent) -> None:
+    # Display names are part of the streamed boards
+    leaderboard_broadcaster.mark_all_dirty()
+
+
+invalidation_bus.subscribe(EventKind.DAILY_LEADERBOARD, _on_daily_leaderboard_changed)
+invalidation_bus.subscribe(EventKind.USER_PROFILE, _on_user_profile_changed)
+
+# Identical concurrent page reads (e.g. everyone polling page one after a reset)
+# share one ranking query. Keys start with the board kind and the session's
+# engine, so a user pinned to the primary after a write never joins a replica
+# query that started before it.
+_board_pages: SingleFlight[tuple[Any, ...], tuple[list[LeaderboardEntry], int]] = SingleFlight()
 
 
 class LeaderboardService:
     def __init__(self, db: AsyncSession):
         self.db = db
         self.repo = LeaderboardRepository(db)
+        self.settings = get_settings()
 
     async def get_daily(
         self,
@@ -26,32 +104,85 @@ class LeaderboardService:
         offset: int = 0,
         current_user_id: uuid.UUID | None = None,
     ) -> LeaderboardResponse:
-        rows, total = await self.repo.get_daily_rankings(
+        if target_date < date.today():
+            finalization = await self.repo.get_finalization(grid_size, order_mode, target_date)
+            if finalization is not None:
+                return await self._get_finalized_daily(
+                    grid_size,
+                    order_mode,
+                    target_date,
+                    finalization.total_entries,
+                    limit,
+                    offset,
+                    current_user_id,
+                )
+
+        async def load_page() -> tuple[list[LeaderboardEntry], int]:
+            rows, total = await self.repo.get_daily_rankings(
+                grid_size=grid_size,
+                order_mode=order_mode,
+                target_date=target_date,
+                limit=limit,
+                offset=offset,
+            )
+            return _page_entries(rows, offset, target_date), total
+
+        entries, total = await _board_pages.do(
+            ("daily", self.db.bind, grid_size, order_mode, target_date, limit, offset), load_page
+        )
+
+        current_user = None
+        if current_user_id:
+            current_user = await self.get_daily_rank(
+                current_user_id, grid_size, order_mode, target_date
+            )
+
+        return LeaderboardResponse(
+            data=entries,
+            meta=LeaderboardMeta(
+                grid_size=grid_size,
+                order_mode=order_mode,
+                date=target_date,
+                total_entries=total,
+            ),
+            current_user=current_user,
+        )
+
+    async def _get_finalized_daily(
+        self,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        total: int,
+        limit: int,
+        offset: int,
+        current_user_id: uuid.UUID | None,
+    ) -> LeaderboardResponse:
+        rows = await self.repo.get_snapshot_rankings(
             grid_size=grid_size,
             order_mode=order_mode,
             target_date=target_date,
             limit=limit,
             offset=offset,
         )
-
         entries = [
             LeaderboardEntry(
-                rank=offset + i + 1,
-                user_id=entry.user_id,
-                display_name=display_name,
-                best_time_ms=entry.best_time_ms,
-                date=entry.date,
+                rank=row.rank,
+                user_id=row.user_id,
+                display_name=row.display_name,
+                best_time_ms=row.best_time_ms,
+                date=row.date,
             )
-            for i, (entry, display_name) in enumerate(rows)
+            for row in rows
         ]
 
         current_user = None
         if current_user_id:
-            rank_data = await self.repo.get_user_rank_daily(
+            own = await self.repo.get_snapshot_entry(
                 current_user_id, grid_size, order_mode, target_date
             )
-            if rank_data:
-                current_user = CurrentUserRank(rank=rank_data[0], best_time_ms=rank_data[1])
+            if own:
+                current_user = CurrentUserRank(rank=own.rank, best_time_ms=own.best_time_ms)
 
         return LeaderboardResponse(
             data=entries,
@@ -60,6 +191,60 @@ class LeaderboardService:
                 order_mode=order_mode,
                 date=target_date,
                 total_entries=total,
+                finalized=True,
+            ),
+            current_user=current_user,
+        )
+
+    async def finalize_daily(self, target_date: date) -> int:
+        """Snapshot all boards of a finished day. Returns the number of boards written."""
+        boards = await self.repo.finalize_daily(target_date)
+        logger.info("daily_leaderboards_finalized", date=str(target_date), boards=boards)
+        return boards
+
+    async def get_period(
+        self,
+        period_type: str,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        limit: int = 50,
+        offset: int = 0,
+        current_user_id: uuid.UUID | None = None,
+    ) -> LeaderboardResponse:
+        """Weekly, monthly or seasonal board for the period containing target_date."""
+        period_start, _ = period_bounds(period_type, target_date)
+
+        async def load_page() -> tuple[list[LeaderboardEntry], int]:
+            rows, total = await self.repo.get_period_rankings(
+                period_type=period_type,
+                period_start=period_start,
+                grid_size=grid_size,
+                order_mode=order_mode,
+                limit=limit,
+                offset=offset,
+            )
+            return _page_entries(rows, offset, period_start), total
+
+        entries, total = await _board_pages.do(
+            (period_type, self.db.bind, grid_size, order_mode, period_start, limit, offset),
+            load_page,
+        )
+
+        current_user = None
+        if current_user_id:
+            current_user = await self.get_period_rank(
+                current_user_id, period_type, period_start, grid_size, order_mode
+            )
+
+        return LeaderboardResponse(
+            data=entries,
+            meta=LeaderboardMeta(
+                grid_size=grid_size,
+                order_mode=order_mode,
+                date=period_start,
+                total_entries=total,
+                period=period_type,
             ),
             current_user=current_user,
         )
@@ -72,30 +257,372 @@ class LeaderboardService:
         offset: int = 0,
         current_user_id: uuid.UUID | None = None,
     ) -> LeaderboardResponse:
-        rows, total = await self.repo.get_all_time_rankings(
+        async def load_page() -> tuple[list[LeaderboardEntry], int]:
+            rows, total = await self.repo.get_all_time_rankings(
+                grid_size=grid_size,
+                order_mode=order_mode,
+                limit=limit,
+                offset=offset,
+            )
+            return _page_entries(rows, offset, date.today()), total  # Placeholder date
+
+        entries, total = await _board_pages.do(
+            ("all_time", self.db.bind, grid_size, order_mode, limit, offset), load_page
+        )
+
+        return LeaderboardResponse(
+            data=entries,
+            meta=LeaderboardMeta(
+                grid_size=grid_size,
+                order_mode=order_mode,
+                total_entries=total,
+            ),
+            current_user=None,  # Could be added if needed
+        )
+
+    async def get_daily_friends(
+        self,
+        user_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        limit: int = 50,
+        offset: int = 0,
+    ) -> LeaderboardResponse:
+        """Daily board restricted to the user and the players they follow."""
+        friend_ids = await FollowService(self.db).get_friend_ids(user_id)
+        rows, total = await self.repo.get_daily_rankings_for_users(
+            friend_ids,
             grid_size=grid_size,
             order_mode=order_mode,
+            target_date=target_date,
             limit=limit,
             offset=offset,
         )
 
-        entries = [
-            LeaderboardEntry(
-                rank=offset + i + 1,
-                user_id=user_id,
-                display_name=display_name,
-                best_time_ms=best_time_ms,
-                date=date.today(),  # Placeholder for all-time
+        current_user = None
+        entry = await self.repo.get_daily_entry(user_id, grid_size, order_mode, target_date)
+        if entry is not None:
+            faster = await self.repo.count_faster_daily_for_users(
+                friend_ids, grid_size, order_mode, target_date, entry.best_time_ms
             )
-            for i, (user_id, display_name, best_time_ms) in enumerate(rows)
-        ]
+            current_user = CurrentUserRank(rank=faster + 1, best_time_ms=entry.best_time_ms)
 
         return LeaderboardResponse(
-            data=entries,
+            data=_page_entries(rows, offset, target_date),
             meta=LeaderboardMeta(
                 grid_size=grid_size,
                 order_mode=order_mode,
+                date=target_date,
                 total_entries=total,
             ),
-            current_user=None,  # Could be added if needed
+            current_user=current_user,
+        )
+
+    async def get_daily_around(
+        self,
+        user_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+        radius: int = 5,
+    ) -> LeaderboardResponse:
+        """The ranked window of up to `radius` players above and below the user."""
+        current_user = await self.get_daily_rank(user_id, grid_size, order_mode, target_date)
+
+        async def count(limit: int) -> int:
+            return await self.repo.count_daily(grid_size, order_mode, target_date, limit=limit)
+
+        async def load_histogram(resolution_ms: int) -> list[tuple[int, int]]:
+            return await self.repo.get_daily_time_histogram(
+                grid_size, order_mode, target_date, resolution_ms
+            )
+
+        total = await self._board_total(
+            count, load_histogram, daily_sketches, (target_date, grid_size, order_mode)
+        )
+        meta = LeaderboardMeta(
+            grid_size=grid_size,
+            order_mode=order_mode,
+            date=target_date,
+            total_entries=total,
+        )
+        if current_user is None:
+            return LeaderboardResponse(data=[], meta=meta, current_user=None)
+
+        above, below = await self.repo.get_daily_window(
+            user_id, grid_size, order_mode, target_date, current_user.best_time_ms, radius
+        )
+        display_name = await self._get_display_name(user_id)
+        window = [*reversed(above), (user_id, display_name, current_user.best_time_ms), *below]
+
+        return LeaderboardResponse(
+            data=_rank_window(window, len(above), current_user, target_date),
+            meta=meta,
+            current_user=current_user,
+        )
+
+    async def get_all_time_around(
+        self,
+        user_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        radius: int = 5,
+    ) -> LeaderboardResponse:
+        """All-time equivalent of get_daily_around."""
+        current_user = await self.get_all_time_rank(user_id, grid_size, order_mode)
+
+        async def count(limit: int) -> int:
+            return await self.repo.count_all_time(grid_size, order_mode, limit=limit)
+
+        async def load_histogram(resolution_ms: int) -> list[tuple[int, int]]:
+            return await self.repo.get_all_time_time_histogram(
+                grid_size, order_mode, resolution_ms
+            )
+
+        total = await self._board_total(
+            count, load_histogram, all_time_sketches, (grid_size, order_mode)
+        )
+        meta = LeaderboardMeta(grid_size=grid_size, order_mode=order_mode, total_entries=total)
+        if current_user is None:
+            return LeaderboardResponse(data=[], meta=meta, current_user=None)
+
+        above, below = await self.repo.get_all_time_window(
+            user_id, grid_size, order_mode, current_user.best_time_ms, radius
+        )
+        display_name = await self._get_display_name(user_id)
+        window = [*reversed(above), (user_id, display_name, current_user.best_time_ms), *below]
+
+        return LeaderboardResponse(
+            data=_rank_window(window, len(above), current_user, date.today()),
+            meta=meta,
+            current_user=current_user,
+        )
+
+    async def _get_display_name(self, user_id: uuid.UUID) -> str | None:
+        # Usually already in the identity map from authentication
+        user = await self.db.get(User, user_id)
+        return user.display_name if user else None
+
+    async def get_daily_rank(
+        self,
+        user_id: uuid.UUID,
+        grid_size: int,
+        order_mode: str,
+        target_date: date,
+    ) -> CurrentUserRank | None:
+        entry = await self.repo.get_daily_entry(user_id, grid_size, order_mode, target_date)
+        if entry is None:
+            return None
+
+        async def count_faster(limit: int) -> int:
+            return await self.repo.count_faster_daily(
+                grid_size, order_mode, target_date, entry.best_time_ms, limit=limit
+            )
+
+        async def load_histogram(resolution_ms: int) -> list[tuple[int, int]]:
+            return await self.repo.get_daily_time_histogram(
+                grid_size, order_mode, target_date, resolution_ms
+            )
+
+        return await self._rank_time(
+            entry.best_time_ms,
+            count_faster,
+            load_histogram,
+            daily_sketches,
+            (target_date, grid_size, order_mode),
+        )
+
+    async def get_period_rank(
+        self,
+        user_id: uuid.UUID,
+        period_type: str,
+        period_start: date,
+        grid_size: int,
+        order_mode: str,
+    ) -> CurrentUserRank | None:
+        entry = await self.repo.get_period_entry(
+            user_id, period_type, period_start, grid_size, order_mode
+        )
+        if entry is None:
+            return None
+
+        async def count_faster(limit: int) -> int:
+            return await self.repo.count_faster_period(
+                period_type, period_start, grid_size, order_mode, entry.best_time_ms, limit=limit
+            )
+
+        async def load_histogram(resolution_ms: int) -> list[tuple[int, int]]:
+            return await self.repo.get_period_time_histogram(
+                period_type, period_start, grid_size, order_mode, resolution_ms
+            )
+
+        return await self._rank_time(
+            entry.best_time_ms,
+            count_faster,
+            load_histogram,
+            period_sketches,
+            (period_type, period_start, grid_size, order_mode),
+        )
+
+    async def get_all_time_rank(
+        self, user_id: uuid.UUID, grid_size: int, order_mode: str
+    ) -> CurrentUserRank | None:
+        entry = await self.repo.get_all_time_entry(user_id, grid_size, order_mode)
+        if entry is None:
+            return None
+
+        async def count_faster(limit: int) -> int:
+            return await self.repo.count_faster_all_time(
+                grid_size, order_mode, entry.best_time_ms, limit=limit
+            )
+
+        async def load_histogram(resolution_ms: int) -> list[tuple[int, int]]:
+            return await self.repo.get_all_time_time_histogram(
+                grid_size, order_mode, resolution_ms
+            )
+
+        return await self._rank_time(
+            entry.best_time_ms,
+            count_faster,
+            load_histogram,
+            all_time_sketches,
+            (grid_size, order_mode),
+        )
+
+    async def _rank_time(
+        self,
+        best_time_ms: int,
+        count_faster: Callable[[int], Awaitable[int]],
+        load_histogram: Callable[[int], Awaitable[list[tuple[int, int]]]],
+        sketches: TTLCache[Any, TimeHistogram],
+        sketch_key: Hashable,
+    ) -> CurrentUserRank:
+        """
+        Ranks within the top leaderboard_exact_rank_limit are exact; anything
+        deeper is estimated from the board's time histogram so the lookup cost
+        stays flat as the board grows.
+        """
+        limit = self.settings.leaderboard_exact_rank_limit
+        faster = await count_faster(limit)
+        if faster < limit:
+            return CurrentUserRank(rank=faster + 1, best_time_ms=best_time_ms)
+
+        sketch = await self._get_sketch(load_histogram, sketches, sketch_key)
+        # The bounded count already proved at least `limit` entries are faster
+        estimate = max(sketch.count_faster(best_time_ms), float(limit))
+        rank = round(estimate) + 1
+        top_percent = round(100 * rank / max(sketch.total, rank), 1)
+        return CurrentUserRank(
+            rank=rank,
+            best_time_ms=best_time_ms,
+            approximate=True,
+            top_percent=top_percent,
+        )
+
+    async def _board_total(
+        self,
+        count: Callable[[int], Awaitable[int]],
+        load_histogram: Callable[[int], Awaitable[list[tuple[int, int]]]],
+        sketches: TTLCache[Any, TimeHistogram],
+        sketch_key: Hashable,
+    ) -> int:
+        """Board size, exact up to leaderboard_exact_rank_limit and from the sketch beyond."""
+        limit = self.settings.leaderboard_exact_rank_limit
+        total = await count(limit)
+        if total < limit:
+            return total
+
+        sketch = await self._get_sketch(load_histogram, sketches, sketch_key)
+        return max(sketch.total, limit)
+
+    async def _get_sketch(
+        self,
+        load_histogram: Callable[[int], Awaitable[list[tuple[int, int]]]],
+        sketches: TTLCache[Any, TimeHistogram],
+        sketch_key: Hashable,
+    ) -> TimeHistogram:
+        sketch = sketches.get(sketch_key)
+        if sketch is not None:
+            return sketch
+
+        # Changes committed while the histogram loads would otherwise be lost, so
+        # they are buffered and replayed. One whose commit the load already saw is
+        # counted twice, an error the TTL refresh bounds just as for a lost one.
+        resolution_ms = self.settings.leaderboard_sketch_resolution_ms
+        reload = _SketchReload()
+        _sketch_reloads[sketch_key].append(reload)
+        try:
+            histogram = await load_histogram(resolution_ms)
+        finally:
+            _sketch_reloads[sketch_key].remove(reload)
+            if not _sketch_reloads[sketch_key]:
+                del _sketch_reloads[sketch_key]
+
+        sketch = TimeHistogram(resolution_ms)
+        for bucket, count in histogram:
+            sketch.add(bucket * resolution_ms, count)
+        for added_ms, removed_ms in reload.patches:
+            _patch_sketch(sketch, added_ms, removed_ms)
+        if not reload.stale:
+            sketches.set(sketch_key, sketch)
+        return sketch
+
+
+async def render_daily_top(board: Hashable) -> bytes:
+    """Render today's top-N for a (grid_size, order_mode) board as one SSE event."""
+    grid_size, order_mode = cast(tuple[int, str], board)
+    async with db_module.read_session_factory() as session:
+        response = await LeaderboardService(session).get_daily(
+            grid_size=grid_size,
+            order_mode=order_mode,
+            target_date=date.today(),
+            limit=get_settings().leaderboard_stream_top_n,
+        )
+    return f"event: leaderboard\ndata: {response.model_dump_json()}\n\n".encode()
+
+
+def _rank_window(
+    window: list[tuple[uuid.UUID, str | None, int]],
+    anchor_index: int,
+    anchor: CurrentUserRank,
+    entry_date: date,
+) -> list[LeaderboardEntry]:
+    """
+    Assign ranks to an ordered window relative to the anchor's rank.
+    Tied times share the rank of the first entry in the tie, and every rank is
+    approximate when the anchor's is.
+    """
+    entries: list[LeaderboardEntry] = []
+    for i, (user_id, display_name, best_time_ms) in enumerate(window):
+        rank = anchor.rank + (i - anchor_index)
+        if entries and best_time_ms == entries[-1].best_time_ms:
+            rank = entries[-1].rank
+        entries.append(
+            LeaderboardEntry(
+                rank=rank,
+                user_id=user_id,
+                display_name=display_name,
+                best_time_ms=best_time_ms,
+                date=entry_date,
+                approximate=anchor.approximate,
+            )
+        )
+    return entries
+
+
+def _page_entries(
+    rows: Sequence[tuple[DailyLeaderboard | PeriodLeaderboard | AllTimeLeaderboard, str | None]],
+    offset: int,
+    entry_date: date,
+) -> list[LeaderboardEntry]:
+    return [
+        LeaderboardEntry(
+            rank=offset + i + 1,
+            user_id=entry.user_id,
+            display_name=display_name,
+            best_time_ms=entry.best_time_ms,
+            date=entry_date,
         )
+        for i, (entry, display_name) in enumerate(rows)
+    ]
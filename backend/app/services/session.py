@@ -4,6 +4,11 @@ from datetime import UTC, date, datetime
 import structlog
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.config import get_settings
+from app.core import metrics
+from app.core.archive import tap_archive
+from app.core.database import mark_recent_write
+from app.core.invalidation import EventKind, InvalidationEvent, publish
 from app.models.session import TrainingSession
 from app.repositories.leaderboard import LeaderboardRepository
 from app.repositories.session import SessionRepository
@@ -12,6 +17,14 @@ from app.services.stats import StatsService
 
 logger = structlog.get_logger()
 
+sessions_ingested = metrics.counter(
+    "sessions_ingested_total", "Training sessions stored, by status", ["status"]
+)
+session_syncs = metrics.counter("session_syncs_total", "Bulk sync requests handled")
+session_sync_items = metrics.counter(
+    "session_sync_items_total", "Sessions received through bulk sync", ["result"]
+)
+
 
 class SessionService:
     def __init__(self, db: AsyncSession):
@@ -27,8 +40,17 @@ class SessionService:
         Create a training session. Returns (session, created).
         If session with same client_session_id exists, returns existing (idempotent).
         """
+        await self.session_repo.lock_client_ids(user_id)
+        session, created = await self._create_session(user_id, data)
+        if created:
+            await self._record_write(user_id)
+        return session, created
+
+    async def _create_session(
+        self, user_id: uuid.UUID, data: SessionCreate
+    ) -> tuple[TrainingSession, bool]:
         existing = await self.session_repo.get_by_client_id(
-            user_id, data.client_session_id
+            user_id, data.client_session_id, data.started_at
         )
         if existing:
             return existing, False
@@ -72,6 +94,21 @@ class SessionService:
                 best_time_ms=data.completion_time_ms,
                 target_date=today,
             )
+            await self.leaderboard_repo.upsert_period_entries(
+                user_id=user_id,
+                session_id=session.id,
+                grid_size=data.grid_size,
+                order_mode=data.order_mode,
+                best_time_ms=data.completion_time_ms,
+                target_date=today,
+            )
+            await self.leaderboard_repo.upsert_all_time_entry(
+                user_id=user_id,
+                session_id=session.id,
+                grid_size=data.grid_size,
+                order_mode=data.order_mode,
+                best_time_ms=data.completion_time_ms,
+            )
         else:
             # Non-completed sessions still increment total_sessions
             await self.stats_service.update_on_session_save(
@@ -82,6 +119,7 @@ class SessionService:
                 completion_time_ms=None,
             )
 
+        sessions_ingested.inc(status=data.status)
         logger.info(
             "session_created",
             user_id=str(user_id),
@@ -99,6 +137,16 @@ class SessionService:
             return session
         return None
 
+    async def get_tap_events(self, session: TrainingSession) -> list | None:
+        """The session's tap events, rehydrated from cold storage once archived."""
+        if session.tap_events_segment is None:
+            return session.tap_events
+        return await tap_archive.load(
+            session.tap_events_segment,
+            session.tap_events_offset or 0,
+            session.tap_events_length or 0,
+        )
+
     async def list_sessions(
         self,
         user_id: uuid.UUID,
@@ -107,6 +155,8 @@ class SessionService:
         grid_size: int | None = None,
         order_mode: str | None = None,
         status: str | None = None,
+        started_after: datetime | None = None,
+        started_before: datetime | None = None,
     ) -> tuple[list[TrainingSession], int]:
         return await self.session_repo.list_for_user(
             user_id=user_id,
@@ -115,6 +165,8 @@ class SessionService:
             grid_size=grid_size,
             order_mode=order_mode,
             status=status,
+            started_after=started_after,
+            started_before=started_before,
         )
 
     async def delete_session(
@@ -131,6 +183,7 @@ class SessionService:
 
         # Recalculate stats from scratch
         await self.stats_service.full_recalculate(user_id)
+        await self._record_write(user_id)
 
         logger.info("session_deleted", user_id=str(user_id), session_id=str(session_id))
         return True
@@ -142,13 +195,21 @@ class SessionService:
         synced = 0
         skipped = 0
 
+        await self.session_repo.lock_client_ids(user_id)
         for session_data in sessions:
-            _, created = await self.create_session(user_id, session_data)
+            _, created = await self._create_session(user_id, session_data)
             if created:
                 synced += 1
             else:
                 skipped += 1
 
+        if synced:
+            await self._record_write(user_id)
+
+        session_syncs.inc()
+        session_sync_items.inc(synced, result="synced")
+        session_sync_items.inc(skipped, result="skipped")
+
         logger.info(
             "bulk_sync_complete",
             user_id=str(user_id),
@@ -156,3 +217,10 @@ class SessionService:
             skipped=skipped,
         )
         return synced, skipped
+
+    async def _record_write(self, user_id: uuid.UUID) -> None:
+        """Pin the user's reads to the primary on every worker for a few seconds."""
+        if not get_settings().db_read_host:
+            return  # Every read already goes to the primary: skip the pg_notify
+        mark_recent_write(user_id)
+        await publish(self.db, InvalidationEvent(EventKind.USER_WRITE, str(user_id)))
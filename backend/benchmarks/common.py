@@ -0,0 +1,113 @@
+"""Shared fixtures for benchmarks: request payloads and a local stand-in for Cognito."""
+
+import random
+import time
+import uuid
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+import app.core.security as security
+from app.config import get_settings
+
+KID = "bench-key"
+
+
+def session_payload(grid_size: int | None = None) -> dict[str, Any]:
+    """A completed SessionCreate body with one correct tap per cell."""
+    grid_size = grid_size or random.choice([4, 5, 5, 5, 6, 7])
+    cells = grid_size * grid_size
+    completion_ms = random.randint(cells * 300, cells * 1500)
+    started = datetime.now(UTC) - timedelta(minutes=random.randint(1, 600))
+    step = completion_ms // cells
+    return {
+        "client_session_id": str(uuid.uuid4()),
+        "grid_size": grid_size,
+        "max_time": 300,
+        "order_mode": random.choice(["ASC", "ASC", "DESC"]),
+        "status": "completed",
+        "completion_time_ms": completion_ms,
+        "mistakes": 0,
+        "accuracy": 100.0,
+        "tap_events": [
+            {
+                "cellIndex": i,
+                "expectedValue": i + 1,
+                "tappedValue": i + 1,
+                "correct": True,
+                "timestampMs": (i + 1) * step,
+            }
+            for i in range(cells)
+        ],
+        "started_at": started.isoformat(),
+        "completed_at": (started + timedelta(milliseconds=completion_ms)).isoformat(),
+    }
+
+
+class LocalIssuer:
+    """
+    Signs Cognito-shaped RS256 tokens with a locally generated key and installs
+    the matching JWKS into the app's cache, so `verify_token` runs for real
+    without reaching AWS.
+    """
+
+    def __init__(self) -> None:
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.private_pem = key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        public_pem = key.public_key().public_bytes(
+            serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+        )
+        public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+        self.jwks = {"keys": [{**public_jwk, "kid": KID, "use": "sig"}]}
+
+    def install(self) -> None:
+        settings = get_settings()
+        settings.cognito_user_pool_id = settings.cognito_user_pool_id or "local_bench"
+        settings.cognito_client_id = settings.cognito_client_id or "bench-client"
+        security._jwks_cache = self.jwks
+        security._jwks_cache_time = time.time()
+
+    def issue(self, sub: str, ttl_seconds: int = 3600) -> str:
+        settings = get_settings()
+        now = int(time.time())
+        claims = {
+            "sub": sub,
+            "iss": settings.cognito_issuer,
+            "aud": settings.cognito_client_id,
+            "token_use": "id",
+            "iat": now,
+            "exp": now + ttl_seconds,
+            "jti": uuid.uuid4().hex,
+        }
+        return jwt.encode(claims, self.private_pem, algorithm="RS256", headers={"kid": KID})
+
+
+class LocalCognitoClient:
+    """Answers `initiate_auth` like Cognito's USER_PASSWORD_AUTH, for AuthService.login."""
+
+    def __init__(self, issuer: LocalIssuer, subs_by_email: dict[str, str], latency: float = 0.0):
+        self.issuer = issuer
+        self.subs_by_email = subs_by_email
+        # The real boto3 call is synchronous, so latency here blocks the loop as it would
+        self.latency = latency
+
+    def initiate_auth(self, **kwargs: Any) -> dict[str, Any]:
+        if self.latency:
+            time.sleep(self.latency)
+        sub = self.subs_by_email[kwargs["AuthParameters"]["USERNAME"]]
+        token = self.issuer.issue(sub)
+        return {
+            "AuthenticationResult": {
+                "AccessToken": token,
+                "IdToken": token,
+                "RefreshToken": uuid.uuid4().hex,
+                "ExpiresIn": 3600,
+            }
+        }
@@ -0,0 +1,421 @@
+"""
+Synthetic dataset generator for scale testing. Fills a local Postgres (schema
+from `alembic upgrade head`) through COPY with users, training sessions with
+tap events, daily, period and all-time leaderboards and user stats.
+
+    python -m benchmarks.dataset --users 100000 --days 90 --truncate
+    python -m benchmarks.dataset --users 20000 --whale-fraction 0.02 --grid-mix 5:0.7,6:0.3
+
+Skew knobs:
+  --whale-fraction / --whale-multiplier  a few users play many times more sessions
+  --daily-active                         chance a (non-churned) user plays on a given day
+  --daily-churn                          chance a user quits for good after each active day
+  --grid-mix                             grid-size popularity, as size:weight pairs
+
+Generation runs day by day, so memory stays bounded by one day's leaderboard.
+"""
+
+import argparse
+import asyncio
+import math
+import random
+import sys
+import time
+import uuid
+from collections.abc import Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, date, datetime, timedelta
+from datetime import time as dtime
+from typing import Any
+
+import asyncpg
+
+from app.config import get_settings
+from app.core.ids import uuid7, uuid7_timestamp_ms
+from app.models.session import add_months, create_partition_sql, month_start
+from app.repositories.leaderboard import PERIOD_TYPES
+
+STATUSES = (("completed", 0.85), ("timeout", 0.10), ("abandoned", 0.05))
+COPY_BATCH = 20_000
+
+# period_type -> date_trunc field, as in the period_leaderboards migration
+PERIOD_TRUNC = {"week": "week", "month": "month", "season": "quarter"}
+
+SESSION_COLUMNS = (
+    "id", "user_id", "client_session_id", "grid_size", "max_time", "order_mode", "status",
+    "completion_time_ms", "mistakes", "accuracy", "tap_events", "started_at", "completed_at",
+)  # fmt: skip
+DAILY_COLUMNS = ("id", "user_id", "session_id", "grid_size", "order_mode", "best_time_ms", "date")
+USER_COLUMNS = ("id", "cognito_sub", "email", "display_name", "preferences", "created_at")
+STATS_COLUMNS = (
+    "user_id", "total_sessions", "completed_sessions", "current_streak", "longest_streak",
+    "last_played_at", "best_times", "avg_times",
+)  # fmt: skip
+
+
+@dataclass
+class Options:
+    users: int
+    days: int
+    end_date: date
+    sessions_per_day: float
+    whale_fraction: float
+    whale_multiplier: float
+    daily_active: float
+    daily_churn: float
+    grid_mix: dict[int, float]
+    desc_fraction: float
+    tap_events_fraction: float
+    seed: int
+
+
+@dataclass
+class SyntheticUser:
+    id: uuid.UUID
+    index: int
+    signup_day: int
+    skill: float  # Multiplier on completion time; lower is faster
+    sessions_per_day: float
+    churned: bool = False
+    total: int = 0
+    completed: int = 0
+    current_streak: int = 0
+    longest_streak: int = 0
+    last_played: datetime | None = None
+    last_day: int = -2
+    best: dict[str, int] = field(default_factory=dict)
+    sums: dict[str, list[int]] = field(default_factory=dict)  # config -> [sum, count]
+
+
+def parse_grid_mix(value: str) -> dict[int, float]:
+    mix = {}
+    for part in value.split(","):
+        size, weight = part.split(":")
+        if not 4 <= int(size) <= 10:
+            raise argparse.ArgumentTypeError(f"grid size out of range: {size}")
+        mix[int(size)] = float(weight)
+    return mix
+
+
+def _tap_events_json(cells: int, completion_ms: int, mistakes: int, rng: random.Random) -> str:
+    # Hand-built JSON: json.dumps on millions of event lists dominates the run time
+    step = max(completion_ms // (cells + mistakes), 1)
+    wrong = set(rng.sample(range(cells), min(mistakes, cells)))
+    events = []
+    t = 0
+    for i in range(cells):
+        if i in wrong:
+            t += step
+            events.append(
+                f'{{"cellIndex": {rng.randrange(cells)}, "expectedValue": {i + 1}, '
+                f'"tappedValue": {i + 2}, "correct": false, "timestampMs": {t}}}'
+            )
+        t += step
+        events.append(
+            f'{{"cellIndex": {i}, "expectedValue": {i + 1}, '
+            f'"tappedValue": {i + 1}, "correct": true, "timestampMs": {t}}}'
+        )
+    return "[" + ", ".join(events) + "]"
+
+
+def _poisson(rng: random.Random, mean: float) -> int:
+    # Knuth's method is fine for the small means used here
+    if mean > 30:
+        return max(0, round(rng.gauss(mean, math.sqrt(mean))))
+    limit, k, p = math.exp(-mean), 0, 1.0
+    while True:
+        p *= rng.random()
+        if p <= limit:
+            return k
+        k += 1
+
+
+class Generator:
+    def __init__(self, options: Options):
+        self.options = options
+        self.rng = random.Random(options.seed)
+        self.start_date = options.end_date - timedelta(days=options.days - 1)
+        self.grid_sizes = list(options.grid_mix)
+        self.grid_weights = list(options.grid_mix.values())
+        self.users = [self._make_user(i) for i in range(options.users)]
+        self.counts = {"users": 0, "training_sessions": 0, "daily_leaderboards": 0}
+
+    def _uuid(self) -> uuid.UUID:
+        # Seeded, so a --seed reproduces the same ids
+        return uuid.UUID(int=self.rng.getrandbits(128), version=4)
+
+    def _uuid7(self, at: datetime) -> uuid.UUID:
+        # Time-ordered like the ids the app creates for sessions and daily entries
+        return uuid7(int(at.timestamp() * 1000), self.rng)
+
+    def _uuid7_at(self, other: uuid.UUID) -> uuid.UUID:
+        return uuid7(uuid7_timestamp_ms(other), self.rng)
+
+    def _make_user(self, index: int) -> SyntheticUser:
+        o = self.options
+        whale = self.rng.random() < o.whale_fraction
+        return SyntheticUser(
+            id=self._uuid(),
+            index=index,
+            # A third of users predate the window; the rest sign up during it
+            signup_day=0 if self.rng.random() < 0.33 else self.rng.randrange(o.days),
+            skill=self.rng.lognormvariate(0, 0.35),
+            sessions_per_day=o.sessions_per_day * (o.whale_multiplier if whale else 1.0),
+        )
+
+    def user_records(self) -> Iterator[tuple[Any, ...]]:
+        prefix = f"synth-{self.options.seed}"
+        for u in self.users:
+            created = datetime.combine(
+                self.start_date + timedelta(days=u.signup_day), dtime(0), UTC
+            ) - timedelta(minutes=self.rng.randrange(1440))
+            yield (
+                u.id,
+                f"{prefix}-{u.index}",
+                f"{prefix}-{u.index}@example.com",
+                f"player{u.index}",
+                '{"theme": "system", "soundEnabled": true, "hapticEnabled": true}',
+                created,
+            )
+
+    def day_records(
+        self, day_index: int
+    ) -> tuple[list[tuple[Any, ...]], list[tuple[Any, ...]]]:
+        """Sessions and daily leaderboard rows for one day."""
+        o, rng = self.options, self.rng
+        day = self.start_date + timedelta(days=day_index)
+        day_start = datetime.combine(day, dtime(0), UTC)
+        sessions: list[tuple[Any, ...]] = []
+        best: dict[tuple[uuid.UUID, int, str], tuple[int, uuid.UUID]] = {}
+
+        for u in self.users:
+            if u.churned or u.signup_day > day_index or rng.random() >= o.daily_active:
+                continue
+            count = max(1, _poisson(rng, u.sessions_per_day))
+            self._record_day(u, day_index)
+
+            for _ in range(count):
+                grid = rng.choices(self.grid_sizes, self.grid_weights)[0]
+                order = "DESC" if rng.random() < o.desc_fraction else "ASC"
+                status = rng.choices(*zip(*STATUSES))[0]
+                cells = grid * grid
+                max_time = 60 if grid <= 5 else 120 if grid <= 7 else 300
+                started = day_start + timedelta(seconds=rng.randrange(86_400 - max_time))
+
+                completion_ms = None
+                if status == "completed":
+                    completion_ms = int(cells * 900 * u.skill * rng.uniform(0.8, 1.3))
+                    completion_ms = min(completion_ms, max_time * 1000 - 1)
+                elapsed_ms = completion_ms or (max_time * 1000 if status == "timeout" else 15_000)
+                mistakes = min(_poisson(rng, 1.2 * u.skill), cells)
+                taps = cells if status == "completed" else rng.randrange(1, cells)
+                accuracy = round(100 * taps / (taps + mistakes), 2)
+                tap_events = (
+                    _tap_events_json(taps, elapsed_ms, mistakes, rng)
+                    if rng.random() < o.tap_events_fraction
+                    else None
+                )
+                session_id = self._uuid7(started)
+                sessions.append(
+                    (
+                        session_id, u.id, str(self._uuid()), grid, max_time, order, status,
+                        completion_ms, mistakes, accuracy, tap_events, started,
+                        started + timedelta(milliseconds=elapsed_ms) if completion_ms else None,
+                    )
+                )  # fmt: skip
+
+                u.total += 1
+                u.last_played = max(u.last_played or started, started)
+                if completion_ms is not None:
+                    u.completed += 1
+                    config = f"{grid}x{grid}_{order}"
+                    u.best[config] = min(u.best.get(config, completion_ms), completion_ms)
+                    total = u.sums.setdefault(config, [0, 0])
+                    total[0] += completion_ms
+                    total[1] += 1
+                    key = (u.id, grid, order)
+                    if key not in best or completion_ms < best[key][0]:
+                        best[key] = (completion_ms, session_id)
+
+            if rng.random() < o.daily_churn:
+                u.churned = True
+
+        daily = [
+            (self._uuid7_at(session_id), user_id, session_id, grid, order, best_ms, day)
+            for (user_id, grid, order), (best_ms, session_id) in best.items()
+        ]
+        return sessions, daily
+
+    @staticmethod
+    def _record_day(u: SyntheticUser, day_index: int) -> None:
+        u.current_streak = u.current_streak + 1 if u.last_day == day_index - 1 else 1
+        u.longest_streak = max(u.longest_streak, u.current_streak)
+        u.last_day = day_index
+
+    def stats_records(self) -> Iterator[tuple[Any, ...]]:
+        last_day = self.options.days - 1
+        for u in self.users:
+            if u.total == 0:
+                continue
+            # A streak only counts as current if the user played today or yesterday
+            current = u.current_streak if u.last_day >= last_day - 1 else 0
+            best = ", ".join(f'"{k}": {v}' for k, v in u.best.items())
+            avg = ", ".join(f'"{k}": {s // n}' for k, (s, n) in u.sums.items())
+            yield (
+                u.id, u.total, u.completed, current, u.longest_streak, u.last_played,
+                "{" + best + "}", "{" + avg + "}",
+            )  # fmt: skip
+
+
+async def _copy(conn: asyncpg.Connection, table: str, columns: tuple[str, ...], rows: Any) -> int:
+    batch: list[tuple[Any, ...]] = []
+    written = 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= COPY_BATCH:
+            await conn.copy_records_to_table(table, records=batch, columns=columns)
+            written += len(batch)
+            batch = []
+    if batch:
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        written += len(batch)
+    return written
+
+
+async def generate(dsn: str, options: Options, truncate: bool) -> dict[str, int]:
+    conn = await asyncpg.connect(dsn)
+    started = time.perf_counter()
+    try:
+        if truncate:
+            await conn.execute(
+                "TRUNCATE users, training_sessions, daily_leaderboards, period_leaderboards, "
+                "all_time_leaderboards, daily_leaderboard_snapshots, "
+                "daily_leaderboard_finalizations, user_stats, user_follows CASCADE"
+            )
+
+        gen = Generator(options)
+        # Monthly partitions over the whole window, instead of filling the default one
+        month = month_start(gen.start_date)
+        while month <= options.end_date:
+            for statement in create_partition_sql(month):
+                await conn.execute(statement)
+            month = add_months(month, 1)
+
+        counts = {"users": await _copy(conn, "users", USER_COLUMNS, gen.user_records())}
+        counts["training_sessions"] = counts["daily_leaderboards"] = 0
+
+        for day_index in range(options.days):
+            sessions, daily = gen.day_records(day_index)
+            counts["training_sessions"] += await _copy(
+                conn, "training_sessions", SESSION_COLUMNS, sessions
+            )
+            counts["daily_leaderboards"] += await _copy(
+                conn, "daily_leaderboards", DAILY_COLUMNS, daily
+            )
+            elapsed = time.perf_counter() - started
+            print(
+                f"  day {day_index + 1}/{options.days}: "
+                f"{counts['training_sessions']:,} sessions, {elapsed:.0f}s",
+                file=sys.stderr,
+            )
+
+        counts["user_stats"] = await _copy(conn, "user_stats", STATS_COLUMNS, gen.stats_records())
+
+        # Period and all-time boards are derived from the daily rows, as the migration
+        # backfills do
+        for period_type in PERIOD_TYPES:
+            status = await conn.execute(
+                f"""
+                INSERT INTO period_leaderboards
+                    (period_type, period_start, user_id, session_id, grid_size, order_mode,
+                     best_time_ms)
+                SELECT DISTINCT ON (period_start, user_id, grid_size, order_mode)
+                    '{period_type}', date_trunc('{PERIOD_TRUNC[period_type]}', date)::date
+                        AS period_start,
+                    user_id, session_id, grid_size, order_mode, best_time_ms
+                FROM daily_leaderboards
+                WHERE date BETWEEN $1 AND $2
+                ORDER BY period_start, user_id, grid_size, order_mode, best_time_ms
+                ON CONFLICT ON CONSTRAINT uq_period_user_config DO UPDATE
+                    SET best_time_ms = EXCLUDED.best_time_ms,
+                        session_id = EXCLUDED.session_id
+                    WHERE period_leaderboards.best_time_ms > EXCLUDED.best_time_ms
+                """,
+                gen.start_date,
+                options.end_date,
+            )
+            counts[f"period_leaderboards_{period_type}"] = int(status.split()[-1])
+
+        status = await conn.execute(
+            """
+            INSERT INTO all_time_leaderboards
+                (user_id, grid_size, order_mode, session_id, best_time_ms)
+            SELECT DISTINCT ON (user_id, grid_size, order_mode)
+                user_id, grid_size, order_mode, session_id, best_time_ms
+            FROM daily_leaderboards
+            WHERE date BETWEEN $1 AND $2
+            ORDER BY user_id, grid_size, order_mode, best_time_ms
+            ON CONFLICT ON CONSTRAINT pk_all_time_leaderboards DO UPDATE
+                SET best_time_ms = EXCLUDED.best_time_ms,
+                    session_id = EXCLUDED.session_id
+                WHERE all_time_leaderboards.best_time_ms > EXCLUDED.best_time_ms
+            """,
+            gen.start_date,
+            options.end_date,
+        )
+        counts["all_time_leaderboards"] = int(status.split()[-1])
+
+        # VACUUM too: COPY leaves the visibility map empty, which would make every
+        # index-only scan in the plan tests visit the heap
+        await conn.execute("VACUUM ANALYZE")
+        return counts
+    finally:
+        await conn.close()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--dsn", default=get_settings().database_url_sync)
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--end-date", type=date.fromisoformat, default=date.today())
+    parser.add_argument("--sessions-per-day", type=float, default=2.0, help="mean per active day")
+    parser.add_argument("--whale-fraction", type=float, default=0.01)
+    parser.add_argument("--whale-multiplier", type=float, default=15.0)
+    parser.add_argument("--daily-active", type=float, default=0.25)
+    parser.add_argument("--daily-churn", type=float, default=0.01)
+    parser.add_argument(
+        "--grid-mix", type=parse_grid_mix, default=parse_grid_mix("4:0.2,5:0.45,6:0.2,7:0.1,8:0.05")
+    )
+    parser.add_argument("--desc-fraction", type=float, default=0.2)
+    parser.add_argument("--tap-events-fraction", type=float, default=1.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--truncate", action="store_true", help="empty all app tables first")
+    args = parser.parse_args()
+
+    options = Options(
+        users=args.users,
+        days=args.days,
+        end_date=args.end_date,
+        sessions_per_day=args.sessions_per_day,
+        whale_fraction=args.whale_fraction,
+        whale_multiplier=args.whale_multiplier,
+        daily_active=args.daily_active,
+        daily_churn=args.daily_churn,
+        grid_mix=args.grid_mix,
+        desc_fraction=args.desc_fraction,
+        tap_events_fraction=args.tap_events_fraction,
+        seed=args.seed,
+    )
+    started = time.perf_counter()
+    counts = asyncio.run(generate(args.dsn, options, args.truncate))
+    for table, n in counts.items():
+        print(f"{table:<34}{n:>12,}")
+    print(f"\nDone in {time.perf_counter() - started:.0f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,154 @@
+"""
+Insert benchmark for primary-key generators: random uuid4 against time-ordered
+uuid7 (app/core/ids.py). Each generator gets a scratch table shaped like the
+hot part of training_sessions. The table is preloaded through COPY, then timed
+inserts run from concurrent writers. The results are insert throughput, WAL
+written per row, and the size and leaf density of the primary-key index.
+
+    python -m benchmarks.ids
+    python -m benchmarks.ids --preload 5000000 --rows 200000 --writers 8
+
+Random keys land on random leaf pages. Once the index outgrows shared_buffers,
+each insert reads a page and later writes it back. After every checkpoint, the
+first change to a page also logs a full-page image. Splits in the middle of a
+page leave leaves about half full. Time-ordered keys append to the rightmost
+leaf, so the index stays small and packed. The scratch tables are dropped at
+the end unless --keep is given.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+import uuid
+from collections.abc import Callable
+
+import asyncpg
+
+from app.config import get_settings
+from app.core.ids import uuid7
+
+GENERATORS: dict[str, Callable[[int], uuid.UUID]] = {
+    "uuid4": lambda _: uuid.uuid4(),
+    "uuid7": lambda ms: uuid7(ms),
+}
+COPY_BATCH = 50_000
+
+
+async def _preload(
+    conn: asyncpg.Connection, table: str, make_id: Callable[[int], uuid.UUID], rows: int
+) -> None:
+    # Backdated over the last 30 days, in creation order, like an existing table
+    now_ms = time.time_ns() // 1_000_000
+    start_ms = now_ms - 30 * 86_400_000
+    step = (now_ms - start_ms) / max(rows, 1)
+    for first in range(0, rows, COPY_BATCH):
+        count = min(COPY_BATCH, rows - first)
+        records = [
+            (make_id(int(start_ms + (first + i) * step)), uuid.uuid4(), i % 5000)
+            for i in range(count)
+        ]
+        await conn.copy_records_to_table(
+            table, records=records, columns=("id", "user_id", "completion_time_ms")
+        )
+
+
+async def _writer(
+    pool: asyncpg.Pool, table: str, make_id: Callable[[int], uuid.UUID], rows: int, batch: int
+) -> None:
+    statement = f"INSERT INTO {table} (id, user_id, completion_time_ms) VALUES ($1, $2, $3)"
+    async with pool.acquire() as conn:
+        for first in range(0, rows, batch):
+            records = [
+                (make_id(time.time_ns() // 1_000_000), uuid.uuid4(), i % 5000)
+                for i in range(min(batch, rows - first))
+            ]
+            # One transaction per batch, like a session sync
+            async with conn.transaction():
+                await conn.executemany(statement, records)
+
+
+async def _leaf_density(conn: asyncpg.Connection, index: str) -> float | None:
+    try:
+        await conn.execute("CREATE EXTENSION IF NOT EXISTS pgstattuple")
+        return await conn.fetchval("SELECT avg_leaf_density FROM pgstatindex($1)", index)
+    except asyncpg.PostgresError:
+        return None  # Extension not installed or not allowed for this role
+
+
+async def run_one(dsn: str, name: str, args: argparse.Namespace) -> dict[str, float | None]:
+    make_id = GENERATORS[name]
+    table = f"bench_ids_{name}"
+    conn = await asyncpg.connect(dsn)
+    pool = await asyncpg.create_pool(dsn, min_size=args.writers, max_size=args.writers)
+    try:
+        await conn.execute(f"DROP TABLE IF EXISTS {table}")
+        await conn.execute(
+            f"CREATE TABLE {table} (id uuid PRIMARY KEY, user_id uuid NOT NULL, "
+            f"completion_time_ms integer, created_at timestamptz NOT NULL DEFAULT now())"
+        )
+        await _preload(conn, table, make_id, args.preload)
+        await conn.execute(f"VACUUM ANALYZE {table}")
+
+        wal_before = await conn.fetchval("SELECT pg_current_wal_lsn()")
+        per_writer = args.rows // args.writers
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(_writer(pool, table, make_id, per_writer, args.batch) for _ in range(args.writers))
+        )
+        elapsed = time.perf_counter() - started
+        wal_bytes = await conn.fetchval(
+            "SELECT pg_wal_lsn_diff(pg_current_wal_lsn(), $1)", wal_before
+        )
+
+        inserted = per_writer * args.writers
+        index = f"{table}_pkey"
+        return {
+            "rows_per_s": round(inserted / elapsed),
+            "wal_bytes_per_row": round(float(wal_bytes) / inserted),
+            "index_mb": round(
+                await conn.fetchval("SELECT pg_relation_size($1::regclass)", index) / 2**20, 1
+            ),
+            "leaf_density_pct": await _leaf_density(conn, index),
+        }
+    finally:
+        if not args.keep:
+            await conn.execute(f"DROP TABLE IF EXISTS {table}")
+        await pool.close()
+        await conn.close()
+
+
+async def run(args: argparse.Namespace) -> dict[str, dict[str, float | None]]:
+    # One after the other, so they don't share WAL or buffer cache churn
+    return {name: await run_one(args.dsn, name, args) for name in args.generators}
+
+
+def _cell(value: float | None) -> str:
+    return "n/a" if value is None else str(value)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--dsn", default=get_settings().database_url_sync)
+    parser.add_argument("--preload", type=int, default=1_000_000, help="rows before timing")
+    parser.add_argument("--rows", type=int, default=100_000, help="timed inserts")
+    parser.add_argument("--writers", type=int, default=4, help="concurrent connections")
+    parser.add_argument("--batch", type=int, default=50, help="rows per transaction")
+    parser.add_argument(
+        "--generators", nargs="+", choices=list(GENERATORS), default=list(GENERATORS)
+    )
+    parser.add_argument("--keep", action="store_true", help="keep the scratch tables")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+    columns = ("rows_per_s", "wal_bytes_per_row", "index_mb", "leaf_density_pct")
+    print(f"{'':<8}" + "".join(f"{c:>20}" for c in columns))
+    for name, result in results.items():
+        print(f"{name:<8}" + "".join(f"{_cell(result[c]):>20}" for c in columns))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,296 @@
+"""
+End-to-end load benchmark: drives the ASGI app in-process against the local
+Postgres from Settings (run `alembic upgrade head` first) with a realistic
+traffic mix, and reports latency percentiles and throughput per route.
+
+    python -m benchmarks.load --duration 30 --users 50
+    python -m benchmarks.load --baseline benchmarks/baseline.json
+    python -m benchmarks.load --baseline benchmarks/baseline.json --update-baseline
+
+Cognito is replaced by a local token issuer; everything after the token
+(JWT verification, user lookup, routes, SQL) is the real code path.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import sys
+import time
+import uuid
+from collections import defaultdict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import structlog
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+import app.core.database as db_module
+import app.services.auth as auth_service
+from app.main import app
+from app.models.user import DEFAULT_PREFERENCES, User
+from benchmarks.common import LocalCognitoClient, LocalIssuer, session_payload
+
+API = "/api/v1"
+PASSWORD = "bench-password"
+
+
+@dataclass
+class RouteStats:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+
+    def summary(self, duration: float) -> dict[str, float]:
+        values = sorted(self.latencies)
+        return {
+            "count": len(values),
+            "errors": self.errors,
+            "rps": round(len(values) / duration, 2),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+            "p95_ms": round(_percentile(values, 0.95) * 1000, 2),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+        }
+
+
+def _percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile."""
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, math.ceil(q * len(sorted_values)) - 1)]
+
+
+class VirtualUser:
+    def __init__(self, client: AsyncClient, email: str, stats: dict[str, RouteStats]):
+        self.client = client
+        self.email = email
+        self.stats = stats
+        self.token = ""
+
+    async def _timed(self, name: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        started = time.perf_counter()
+        response = await call()
+        elapsed = time.perf_counter() - started
+        stats = self.stats[name]
+        stats.latencies.append(elapsed)
+        if response.status_code >= 400:
+            stats.errors += 1
+        return response
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {"Authorization": f"Bearer {self.token}"}
+
+    async def login(self, name: str = "POST /auth/login") -> None:
+        response = await self._timed(
+            name,
+            lambda: self.client.post(
+                f"{API}/auth/login", json={"email": self.email, "password": PASSWORD}
+            ),
+        )
+        if response.status_code == 200:
+            self.token = response.json()["access_token"]
+
+    async def post_session(self) -> None:
+        await self._timed(
+            "POST /sessions",
+            lambda: self.client.post(
+                f"{API}/sessions", json=session_payload(), headers=self.headers
+            ),
+        )
+
+    async def sync_sessions(self) -> None:
+        body = {"sessions": [session_payload() for _ in range(100)]}
+        await self._timed(
+            "POST /sessions/sync",
+            lambda: self.client.post(f"{API}/sessions/sync", json=body, headers=self.headers),
+        )
+
+    async def poll_daily(self) -> None:
+        params = {"grid_size": random.choice([4, 5, 5, 6]), "limit": 50}
+        await self._timed(
+            "GET /leaderboards/daily",
+            lambda: self.client.get(
+                f"{API}/leaderboards/daily", params=params, headers=self.headers
+            ),
+        )
+
+    async def around_me(self) -> None:
+        await self._timed(
+            "GET /leaderboards/daily/around-me",
+            lambda: self.client.get(f"{API}/leaderboards/daily/around-me", headers=self.headers),
+        )
+
+    async def poll_all_time(self) -> None:
+        await self._timed(
+            "GET /leaderboards/all-time",
+            lambda: self.client.get(f"{API}/leaderboards/all-time", headers=self.headers),
+        )
+
+    async def history_page(self) -> None:
+        params = {"page": random.randint(1, 5), "per_page": 20}
+        await self._timed(
+            "GET /sessions",
+            lambda: self.client.get(f"{API}/sessions", params=params, headers=self.headers),
+        )
+
+
+# Steady-state mix: (weight, action). Leaderboard polling dominates real traffic.
+MIX: list[tuple[int, Callable[[VirtualUser], Awaitable[None]]]] = [
+    (35, VirtualUser.poll_daily),
+    (10, VirtualUser.around_me),
+    (10, VirtualUser.poll_all_time),
+    (20, VirtualUser.history_page),
+    (15, VirtualUser.post_session),
+    (1, VirtualUser.sync_sessions),
+    (2, VirtualUser.login),
+]
+
+
+async def seed_accounts(count: int) -> dict[str, str]:
+    """Idempotently create benchmark users; returns {email: cognito_sub}."""
+    accounts = {f"bench-user-{i}@example.com": f"bench-user-{i}" for i in range(count)}
+    async with db_module.async_session_factory() as session:
+        await session.execute(
+            pg_insert(User)
+            .values(
+                [
+                    {
+                        "id": uuid.uuid4(),
+                        "cognito_sub": sub,
+                        "email": email,
+                        "display_name": sub,
+                        "preferences": DEFAULT_PREFERENCES,
+                    }
+                    for email, sub in accounts.items()
+                ]
+            )
+            .on_conflict_do_nothing()
+        )
+        await session.commit()
+    return accounts
+
+
+async def run(users: int, duration: float, cognito_latency: float) -> dict[str, Any]:
+    issuer = LocalIssuer()
+    issuer.install()
+    accounts = await seed_accounts(users)
+    cognito = LocalCognitoClient(issuer, accounts, latency=cognito_latency)
+    auth_service._get_cognito_client = lambda: cognito  # type: ignore[assignment]
+
+    stats: dict[str, RouteStats] = defaultdict(RouteStats)
+    weights = [w for w, _ in MIX]
+    actions = [a for _, a in MIX]
+
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://bench") as client:
+            vusers = [VirtualUser(client, email, stats) for email in accounts]
+
+            # Login burst: every user signs in at once, as after a deploy or push
+            burst_started = time.perf_counter()
+            await asyncio.gather(*(v.login("POST /auth/login (burst)") for v in vusers))
+            burst_seconds = time.perf_counter() - burst_started
+
+            deadline = time.perf_counter() + duration
+
+            async def drive(vuser: VirtualUser) -> None:
+                while time.perf_counter() < deadline:
+                    action = random.choices(actions, weights)[0]
+                    await action(vuser)
+
+            started = time.perf_counter()
+            await asyncio.gather(*(drive(v) for v in vusers))
+            elapsed = time.perf_counter() - started
+
+    routes = {
+        name: s.summary(burst_seconds if name.endswith("(burst)") else elapsed)
+        for name, s in sorted(stats.items())
+    }
+    total = sum(r["count"] for n, r in routes.items() if not n.endswith("(burst)"))
+    return {
+        "users": users,
+        "duration_s": round(elapsed, 2),
+        "total_rps": round(total / elapsed, 2),
+        "routes": routes,
+    }
+
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> list[str]:
+    """Regressions beyond `tolerance` (a fraction) for each route in the baseline."""
+    failures = []
+    for name, base in baseline["routes"].items():
+        current = results["routes"].get(name)
+        if current is None:
+            failures.append(f"{name}: missing from results")
+            continue
+        if current["errors"] > base.get("errors", 0):
+            failures.append(f"{name}: {current['errors']} errors (baseline {base['errors']})")
+        # p99 rests on few samples per route, so it gets twice the slack
+        limits = {"p50_ms": tolerance, "p95_ms": tolerance, "p99_ms": 2 * tolerance}
+        for key, allowed in limits.items():
+            if current[key] > base[key] * (1 + allowed):
+                failures.append(f"{name}: {key} {current[key]} > {base[key]} (+{allowed:.0%})")
+        if current["rps"] < base["rps"] * (1 - tolerance):
+            failures.append(f"{name}: rps {current['rps']} < {base['rps']} (-{tolerance:.0%})")
+    return failures
+
+
+def print_report(results: dict[str, Any]) -> None:
+    header = (
+        f"{'route':<36}{'count':>8}{'rps':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'err':>6}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, r in results["routes"].items():
+        print(
+            f"{name:<36}{r['count']:>8}{r['rps']:>9}{r['p50_ms']:>9}"
+            f"{r['p95_ms']:>9}{r['p99_ms']:>9}{r['errors']:>6}"
+        )
+    print(f"\n{results['users']} users, {results['duration_s']}s, {results['total_rps']} req/s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual users")
+    parser.add_argument("--duration", type=float, default=30.0, help="steady-state seconds")
+    parser.add_argument("--cognito-latency-ms", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    # Per-request info logs would dominate the measurement
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    results = asyncio.run(run(args.users, args.duration, args.cognito_latency_ms / 1000))
+    print_report(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        if args.update_baseline or not args.baseline.exists():
+            args.baseline.write_text(json.dumps(results, indent=2) + "\n")
+            print(f"\nBaseline written to {args.baseline}")
+            return 0
+        failures = compare(results, json.loads(args.baseline.read_text()), args.tolerance)
+        if failures:
+            print("\nREGRESSIONS:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,219 @@
+"""
+Microbenchmarks for code that runs on every request. Results are written as
+JSON keyed by commit so speedups can be shown between revisions.
+
+    python -m benchmarks.micro                          # writes benchmarks/results/micro-<sha>.json
+    python -m benchmarks.micro --filter session_create
+    python -m benchmarks.micro --compare benchmarks/results/micro-<old sha>.json
+
+No database is needed.
+"""
+
+import argparse
+import asyncio
+import inspect
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from collections.abc import Callable
+from datetime import UTC, date, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from app.core.security import verify_token
+from app.models.leaderboard import DailyLeaderboard
+from app.models.session import TrainingSession
+from app.schemas.session import SessionCreate, SessionResponse
+from app.services.leaderboard import _page_entries, _rank_window
+from app.services.stats import _calculate_streak
+from benchmarks.common import LocalIssuer, session_payload
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+# Each benchmark is a setup function returning the operation to time (sync or async)
+Benchmark = Callable[[], Callable[[], Any]]
+BENCHMARKS: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    def register(setup: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+@benchmark("verify_token")
+def _verify_token() -> Callable[[], Any]:
+    issuer = LocalIssuer()
+    issuer.install()
+    token = issuer.issue("bench-user")
+    return lambda: verify_token(token)
+
+
+def _session_create(grid_size: int) -> Benchmark:
+    def setup() -> Callable[[], Any]:
+        payload = session_payload(grid_size)
+        return lambda: SessionCreate.model_validate(payload)
+
+    return setup
+
+
+for _grid in range(4, 11):
+    benchmark(f"session_create_{_grid}x{_grid}")(_session_create(_grid))
+
+
+def _training_session(i: int) -> TrainingSession:
+    started = datetime.now(UTC) - timedelta(hours=i)
+    return TrainingSession(
+        id=uuid.uuid4(),
+        user_id=uuid.uuid4(),
+        client_session_id=str(uuid.uuid4()),
+        grid_size=5,
+        max_time=120,
+        order_mode="ASC",
+        status="completed",
+        completion_time_ms=20_000 + i,
+        mistakes=0,
+        accuracy=100.0,
+        tap_events=[],
+        started_at=started,
+        completed_at=started + timedelta(seconds=20),
+        created_at=started,
+    )
+
+
+def _session_response_page(size: int) -> Benchmark:
+    def setup() -> Callable[[], Any]:
+        page = [_training_session(i) for i in range(size)]
+        return lambda: [SessionResponse.model_validate(s) for s in page]
+
+    return setup
+
+
+benchmark("session_response_page_20")(_session_response_page(20))
+benchmark("session_response_page_100")(_session_response_page(100))
+
+
+@benchmark("calculate_streak")
+def _streak() -> Callable[[], Any]:
+    now = datetime.now(UTC)
+    yesterday = now - timedelta(days=1)
+    return lambda: _calculate_streak(yesterday, 7, now)
+
+
+@benchmark("leaderboard_page_entries_50")
+def _leaderboard_page() -> Callable[[], Any]:
+    today = date.today()
+    rows = [
+        (
+            DailyLeaderboard(
+                user_id=uuid.uuid4(),
+                session_id=uuid.uuid4(),
+                grid_size=5,
+                order_mode="ASC",
+                best_time_ms=10_000 + i * 37,
+                date=today,
+            ),
+            f"player{i}",
+        )
+        for i in range(50)
+    ]
+    return lambda: _page_entries(rows, 0, today)
+
+
+@benchmark("leaderboard_rank_window_11")
+def _leaderboard_window() -> Callable[[], Any]:
+    window = [(uuid.uuid4(), f"player{i}", 10_000 + i * 37) for i in range(11)]
+    today = date.today()
+    return lambda: _rank_window(window, 5, 1_000, today)
+
+
+def measure(op: Callable[[], Any], repeat: int, min_time: float) -> dict[str, float]:
+    """timeit-style: calibrate a loop count, then time `repeat` rounds of it."""
+    probe = op()
+    is_async = inspect.iscoroutine(probe)
+    if is_async:
+        probe.close()
+
+    async def run_async(n: int) -> float:
+        started = time.perf_counter()
+        for _ in range(n):
+            await op()
+        return time.perf_counter() - started
+
+    def run(n: int) -> float:
+        if is_async:
+            return asyncio.run(run_async(n))
+        started = time.perf_counter()
+        for _ in range(n):
+            op()
+        return time.perf_counter() - started
+
+    number = 1
+    while (elapsed := run(number)) < min_time:
+        number *= 2 if elapsed == 0 else max(2, int(min_time / elapsed * 1.2))
+
+    per_op = [run(number) / number for _ in range(repeat)]
+    return {
+        "loops": number,
+        "min_us": round(min(per_op) * 1e6, 3),
+        "median_us": round(statistics.median(per_op) * 1e6, 3),
+        "stdev_us": round(statistics.stdev(per_op) * 1e6, 3) if repeat > 1 else 0.0,
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("--filter", default="", help="only run benchmarks containing this")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per round")
+    parser.add_argument("--output", type=Path, help="results JSON path")
+    parser.add_argument("--compare", type=Path, help="earlier results JSON to compare with")
+    args = parser.parse_args()
+
+    commit = _git_commit()
+    results: dict[str, Any] = {
+        "commit": commit,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "created_at": datetime.now(UTC).isoformat(),
+        "benchmarks": {},
+    }
+    previous = json.loads(args.compare.read_text())["benchmarks"] if args.compare else {}
+
+    for name, setup in BENCHMARKS.items():
+        if args.filter not in name:
+            continue
+        result = measure(setup(), args.repeat, args.min_time)
+        results["benchmarks"][name] = result
+        line = f"{name:<32}{result['median_us']:>12.2f} us  (min {result['min_us']:.2f})"
+        if name in previous:
+            ratio = previous[name]["median_us"] / result["median_us"]
+            line += f"  {ratio:.2f}x vs {args.compare.name}"  # type: ignore[union-attr]
+        print(line)
+
+    output = args.output or RESULTS_DIR / f"micro-{commit}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"\nResults written to {output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
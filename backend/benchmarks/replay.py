@@ -0,0 +1,270 @@
+"""
+Replays a sanitized traffic capture (TRAFFIC_CAPTURE_ENABLED, see
+app/core/traffic.py) against the ASGI app in-process, keeping the recorded
+arrival times and request mix. Runs against the local Postgres from Settings.
+
+    python -m benchmarks.replay /tmp/schulte-traffic/*.jsonl --speedup 4 --output a.json
+    git checkout my-change
+    python -m benchmarks.replay /tmp/schulte-traffic/*.jsonl --speedup 4 --baseline a.json
+
+Replay is open-loop: a request is sent at its recorded offset (divided by
+--speedup) whether or not earlier ones have finished, like real arrivals.
+Each pseudonymous actor becomes a seeded benchmark account with a local
+token. Ids in paths are mapped onto the replay database: users to benchmark
+accounts, sessions to ones the same actor created earlier in the replay.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import re
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import structlog
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import select
+
+import app.core.database as db_module
+import app.services.auth as auth_service
+from app.core.traffic import CAPTURE_VERSION, REDACTED
+from app.main import app
+from app.models.user import User
+from benchmarks.common import LocalCognitoClient, LocalIssuer
+from benchmarks.load import API, PASSWORD, RouteStats, compare, print_report, seed_accounts
+
+# Not replayable: they need real Cognito state, or stream instead of returning
+SKIPPED_ROUTES = {
+    f"{API}/auth/register",
+    f"{API}/auth/confirm",
+    f"{API}/auth/refresh",
+    f"{API}/auth/logout",
+    f"{API}/auth/forgot-password",
+    f"{API}/auth/reset-password",
+    f"{API}/auth/social/google",
+    f"{API}/auth/social/apple",
+    f"{API}/leaderboards/daily/stream",
+}
+
+# Stand-ins for redacted body fields; other redacted fields are dropped
+_PLACEHOLDERS = {"password": PASSWORD, "new_password": PASSWORD, "display_name": "Replay User"}
+
+_PARAM = re.compile(r"\{(\w+)(?::\w+)?\}")
+
+
+def load_capture(paths: list[Path]) -> list[dict[str, Any]]:
+    """Entries from all worker files, merged in arrival order."""
+    entries = []
+    for path in paths:
+        with path.open() as f:
+            entries.extend(
+                entry
+                for line in f
+                if line.strip() and (entry := json.loads(line)).get("v") == CAPTURE_VERSION
+            )
+    return sorted(entries, key=lambda e: e["ts"])
+
+
+def restore_body(value: Any, email: str) -> Any:
+    """Fill redacted fields back in with replayable values, and make client ids unique."""
+    if isinstance(value, dict):
+        restored = {}
+        for k, v in value.items():
+            if v == REDACTED:
+                if k == "email":
+                    restored[k] = email
+                elif k in _PLACEHOLDERS:
+                    restored[k] = _PLACEHOLDERS[k]
+            elif k == "client_session_id":
+                # A replayed session is a new write, not a retry of the recorded one
+                restored[k] = str(uuid.uuid4())
+            else:
+                restored[k] = restore_body(v, email)
+        return restored
+    if isinstance(value, list):
+        return [restore_body(v, email) for v in value]
+    return value
+
+
+@dataclass
+class Replay:
+    accounts: dict[str, tuple[str, uuid.UUID]]  # actor -> (email, user id)
+    tokens: dict[str, str]
+    stats: dict[str, RouteStats] = field(default_factory=lambda: defaultdict(RouteStats))
+    status_mismatches: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    lag: list[float] = field(default_factory=list)
+    _id_map: dict[str, str] = field(default_factory=dict)
+    _sessions: dict[str, list[str]] = field(default_factory=lambda: defaultdict(list))
+
+    def account(self, actor: str | None) -> tuple[str, uuid.UUID]:
+        if actor in self.accounts:
+            return self.accounts[actor]
+        return random.choice(list(self.accounts.values()))
+
+    def resolve_path(self, entry: dict[str, Any]) -> str:
+        route = entry["route"]
+        if not route:
+            return entry["path"]
+        segments = entry["path"].split("/")
+        for i, part in enumerate(route.split("/")):
+            match = _PARAM.fullmatch(part)
+            if match and i < len(segments) and segments[i].startswith("~"):
+                segments[i] = self._map_id(match.group(1), segments[i], entry["actor"])
+        return "/".join(segments)
+
+    def _map_id(self, param: str, pseudonym: str, actor: str | None) -> str:
+        if pseudonym not in self._id_map:
+            if param == "user_id":
+                self._id_map[pseudonym] = str(random.choice(list(self.accounts.values()))[1])
+            elif param == "session_id" and self._sessions[actor or ""]:
+                self._id_map[pseudonym] = self._sessions[actor or ""].pop()
+            else:
+                return str(uuid.uuid4())  # Unknown here: stays a 404, as counted
+        return self._id_map[pseudonym]
+
+    async def send(self, client: AsyncClient, entry: dict[str, Any]) -> None:
+        actor = entry["actor"]
+        email, _ = self.account(actor)
+        headers = {"Authorization": f"Bearer {self.tokens[actor]}"} if actor in self.tokens else {}
+        path = self.resolve_path(entry)
+        url = f"{path}?{entry['query']}" if entry["query"] else path
+        body = restore_body(entry["body"], email) if entry["body"] is not None else None
+
+        started = time.perf_counter()
+        response = await client.request(entry["method"], url, json=body, headers=headers)
+        elapsed = time.perf_counter() - started
+
+        # Same route names as the load harness
+        name = f"{entry['method']} {(entry['route'] or 'unmatched').removeprefix(API)}"
+        stats = self.stats[name]
+        stats.latencies.append(elapsed)
+        if response.status_code >= 400:
+            stats.errors += 1
+        if response.status_code != entry["status"]:
+            self.status_mismatches[name] += 1
+        if entry["route"] == f"{API}/sessions" and response.status_code == 201:
+            self._sessions[actor or ""].append(response.json()["id"])
+
+
+async def run(entries: list[dict[str, Any]], speedup: float) -> dict[str, Any]:
+    replayable = [
+        e for e in entries if e["route"] not in SKIPPED_ROUTES and not e.get("body_omitted")
+    ]
+    actors = sorted({e["actor"] for e in replayable if e["actor"]})
+
+    issuer = LocalIssuer()
+    issuer.install()
+    seeded = await seed_accounts(max(len(actors), 1))
+    async with db_module.async_session_factory() as session:
+        rows = await session.execute(select(User.email, User.id).where(User.email.in_(seeded)))
+        ids = dict(rows.all())
+    emails = list(seeded)
+    accounts = {actor: (emails[i], ids[emails[i]]) for i, actor in enumerate(actors)}
+    # Tokens must outlive the whole replay
+    ttl = int((entries[-1]["ts"] - entries[0]["ts"]) / speedup) + 3600 if entries else 3600
+    tokens = {actor: issuer.issue(seeded[email], ttl) for actor, (email, _) in accounts.items()}
+    if not accounts:
+        accounts = {"": (emails[0], ids[emails[0]])}
+    cognito = LocalCognitoClient(issuer, seeded)
+    auth_service._get_cognito_client = lambda: cognito  # type: ignore[assignment]
+
+    replay = Replay(accounts=accounts, tokens=tokens)
+    tasks: list[asyncio.Task[None]] = []
+    async with app.router.lifespan_context(app):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://replay") as client:
+            first = replayable[0]["ts"] if replayable else 0.0
+            started = time.perf_counter()
+            for entry in replayable:
+                due = started + (entry["ts"] - first) / speedup
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                # How far behind schedule the replayer itself is running
+                replay.lag.append(max(time.perf_counter() - due, 0.0))
+                tasks.append(asyncio.create_task(replay.send(client, entry)))
+            await asyncio.gather(*tasks)
+            elapsed = time.perf_counter() - started
+
+    routes = {name: s.summary(elapsed) for name, s in sorted(replay.stats.items())}
+    lag = sorted(replay.lag)
+    return {
+        "requests": len(replayable),
+        "skipped": len(entries) - len(replayable),
+        "speedup": speedup,
+        "users": len(actors),
+        "duration_s": round(elapsed, 2),
+        "total_rps": round(len(replayable) / elapsed, 2) if elapsed else 0.0,
+        "max_schedule_lag_ms": round(lag[-1] * 1000, 2) if lag else 0.0,
+        "status_mismatches": dict(sorted(replay.status_mismatches.items())),
+        "routes": routes,
+    }
+
+
+def print_diff(results: dict[str, Any], baseline: dict[str, Any]) -> None:
+    """Per-route latency change against a run of another build."""
+    header = f"{'route':<36}{'p50 ms':>18}{'p95 ms':>18}{'p99 ms':>18}"
+    print(header)
+    print("-" * len(header))
+    for name, current in results["routes"].items():
+        base = baseline["routes"].get(name)
+        if base is None:
+            continue
+        cells = []
+        for key in ("p50_ms", "p95_ms", "p99_ms"):
+            change = (current[key] - base[key]) / base[key] if base[key] else 0.0
+            cells.append(f"{current[key]:>8} ({change:+.0%})")
+        print(f"{name:<36}" + "".join(f"{c:>18}" for c in cells))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawTextHelpFormatter
+    )
+    parser.add_argument("capture", type=Path, nargs="+", help="traffic-<pid>.jsonl files")
+    parser.add_argument("--speedup", type=float, default=1.0, help="replay N times faster")
+    parser.add_argument("--max-requests", type=int, help="replay only the first N requests")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, help="write results JSON here")
+    parser.add_argument("--baseline", type=Path, help="results of another build to compare")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed regression")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    structlog.configure(wrapper_class=structlog.make_filtering_bound_logger(logging.WARNING))
+    entries = load_capture(args.capture)[: args.max_requests]
+    results = asyncio.run(run(entries, args.speedup))
+    print_report(results)
+    print(
+        f"{results['requests']} requests replayed, {results['skipped']} skipped, "
+        f"max schedule lag {results['max_schedule_lag_ms']} ms"
+    )
+    if results["status_mismatches"]:
+        print(f"Status differs from the capture: {results['status_mismatches']}")
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2) + "\n")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        print()
+        print_diff(results, baseline)
+        failures = compare(results, baseline, args.tolerance)
+        if failures:
+            print("\nREGRESSIONS:")
+            for failure in failures:
+                print(f"  {failure}")
+            return 1
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
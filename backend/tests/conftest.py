@@ -7,9 +7,14 @@ import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
-from app.api.deps import get_current_user, get_optional_user
+from app.api.deps import (
+    get_current_user,
+    get_optional_user,
+    get_optional_user_read_db,
+    get_user_read_db,
+)
 from app.config import Settings, get_settings
-from app.core.database import Base, get_db
+from app.core.database import Base, get_db, get_read_db
 from app.main import app
 from app.models.leaderboard import UserStats
 from app.models.user import DEFAULT_PREFERENCES, User
@@ -70,6 +75,9 @@ async def client(
         return test_user
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_user_read_db] = override_get_db
+    app.dependency_overrides[get_optional_user_read_db] = override_get_db
     app.dependency_overrides[get_current_user] = override_get_current_user
     app.dependency_overrides[get_optional_user] = override_get_optional_user
 
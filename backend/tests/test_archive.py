@@ -0,0 +1,145 @@
+import gzip
+import io
+import json
+import uuid
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.services.session as session_service
+from app.core.archive import LocalSegmentStore, S3SegmentStore, TapEventArchive
+from app.jobs.archive_tap_events import archive_batch
+
+TAP_EVENTS = [
+    {"cellIndex": 0, "expectedValue": 1, "tappedValue": 1, "correct": True, "timestampMs": 500},
+    {"cellIndex": 5, "expectedValue": 2, "tappedValue": 3, "correct": False, "timestampMs": 1200},
+]
+
+
+class CountingStore(LocalSegmentStore):
+    reads = 0
+
+    async def read(self, name: str, offset: int, length: int) -> bytes:
+        self.reads += 1
+        return await super().read(name, offset, length)
+
+
+class FakeS3Client:
+    """The two calls S3SegmentStore makes, against a dict."""
+
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+        self.ranges: list[str] = []
+
+    def put_object(self, Bucket: str, Key: str, Body: bytes, **kwargs: Any) -> None:  # noqa: N803
+        self.objects[f"{Bucket}/{Key}"] = Body
+
+    def get_object(self, Bucket: str, Key: str, Range: str) -> dict[str, Any]:  # noqa: N803
+        self.ranges.append(Range)
+        start, end = (int(n) for n in Range.removeprefix("bytes=").split("-"))
+        return {"Body": io.BytesIO(self.objects[f"{Bucket}/{Key}"][start : end + 1])}
+
+
+@pytest.mark.asyncio
+async def test_local_store_is_append_only(tmp_path: Path) -> None:
+    """Test that local segments are read by byte range and never overwritten."""
+    store = LocalSegmentStore(tmp_path)
+    await store.write("2025/01/a.jsonl.gz", b"0123456789")
+    assert await store.read("2025/01/a.jsonl.gz", 3, 4) == b"3456"
+
+    with pytest.raises(FileExistsError):
+        await store.write("2025/01/a.jsonl.gz", b"other")
+    assert await store.read("2025/01/a.jsonl.gz", 0, 10) == b"0123456789"
+    assert [p.name for p in (tmp_path / "2025/01").iterdir()] == ["a.jsonl.gz"]
+
+
+@pytest.mark.asyncio
+async def test_segment_members_load_independently() -> None:
+    """Test that each session in a segment is one ranged read, cached after the first."""
+    client = FakeS3Client()
+    archive = TapEventArchive(S3SegmentStore("bucket", "taps/", client=client), cache_size=8)
+    sessions = [
+        (uuid.uuid4(), datetime(2025, 1, 15, tzinfo=UTC), TAP_EVENTS),
+        (uuid.uuid4(), datetime(2025, 1, 16, tzinfo=UTC), TAP_EVENTS[:1]),
+    ]
+    first, second = await archive.write_segment(sessions)
+    assert first.segment == second.segment
+    assert first.segment.startswith("2025/01/")
+    assert second.offset == first.length
+
+    assert await archive.load(second.segment, second.offset, second.length) == TAP_EVENTS[:1]
+    assert await archive.load(second.segment, second.offset, second.length) == TAP_EVENTS[:1]
+    assert client.ranges == [f"bytes={second.offset}-{second.offset + second.length - 1}"]
+
+    # The whole segment is also plain gzipped JSON lines
+    (body,) = client.objects.values()
+    lines = [json.loads(line) for line in gzip.decompress(body).splitlines()]
+    assert [line["session_id"] for line in lines] == [str(s[0]) for s in sessions]
+
+
+@pytest.mark.asyncio
+async def test_archived_session_is_rehydrated(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that old tap events leave the table and still come back in session details."""
+    store = CountingStore(tmp_path)
+    archive = TapEventArchive(store, cache_size=8)
+    monkeypatch.setattr(session_service, "tap_archive", archive)
+
+    ids = []
+    for started_at in ("2025-01-15T10:30:00Z", "2025-06-15T10:30:00Z"):
+        response = await client.post(
+            "/api/v1/sessions",
+            json={
+                "client_session_id": str(uuid.uuid4()),
+                "grid_size": 5,
+                "max_time": 120,
+                "order_mode": "ASC",
+                "status": "completed",
+                "completion_time_ms": 28500,
+                "mistakes": 1,
+                "accuracy": 96.15,
+                "tap_events": TAP_EVENTS,
+                "started_at": started_at,
+            },
+        )
+        ids.append(response.json()["id"])
+    old_id, recent_id = ids
+
+    archived = await archive_batch(
+        db_session, archive, datetime(2025, 3, 1, tzinfo=UTC), batch_size=100
+    )
+    await db_session.commit()
+    assert archived == 1
+    # Nothing left before the cutoff
+    assert await archive_batch(db_session, archive, datetime(2025, 3, 1, tzinfo=UTC), 100) == 0
+
+    rows = await db_session.execute(
+        text(
+            "SELECT id, tap_events IS NULL, tap_events_segment IS NOT NULL "
+            "FROM training_sessions ORDER BY started_at"
+        )
+    )
+    assert [(str(r[0]), r[1], r[2]) for r in rows.all()] == [
+        (old_id, True, True),
+        (recent_id, False, False),
+    ]
+
+    db_session.expunge_all()
+    for _ in range(2):
+        response = await client.get(f"/api/v1/sessions/{old_id}")
+        assert response.status_code == 200
+        assert response.json()["tap_events"] == TAP_EVENTS
+    assert store.reads == 1
+
+    response = await client.get(f"/api/v1/sessions/{recent_id}")
+    assert response.json()["tap_events"] == TAP_EVENTS
+    assert store.reads == 1
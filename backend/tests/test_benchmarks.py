@@ -0,0 +1,77 @@
+import json
+from datetime import date
+
+from benchmarks.dataset import SESSION_COLUMNS, Generator, Options, parse_grid_mix
+from benchmarks.load import _percentile, compare
+from benchmarks.micro import measure
+
+
+def test_percentile_nearest_rank() -> None:
+    """Test nearest-rank percentiles used in the load report."""
+    values = [float(v) for v in range(1, 101)]
+    assert _percentile(values, 0.50) == 50.0
+    assert _percentile(values, 0.99) == 99.0
+    assert _percentile([], 0.95) == 0.0
+
+
+def test_compare_flags_regressions() -> None:
+    """Test that latency and throughput regressions beyond tolerance fail the run."""
+    base = {"p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0, "rps": 100.0, "errors": 0}
+    baseline = {"routes": {"GET /a": base, "GET /b": base}}
+    results = {
+        "routes": {
+            "GET /a": {**base, "p95_ms": 24.0, "p99_ms": 44.0},  # within 25% / 50%
+            "GET /b": {**base, "p50_ms": 13.0, "rps": 70.0},
+        }
+    }
+
+    failures = compare(results, baseline, tolerance=0.25)
+    assert len(failures) == 2
+    assert all(f.startswith("GET /b") for f in failures)
+
+
+def test_measure_handles_sync_and_async_ops() -> None:
+    """Test that microbenchmarks time both plain and coroutine operations."""
+
+    async def noop() -> None:
+        return None
+
+    for op in (lambda: sum(range(10)), noop):
+        result = measure(op, repeat=2, min_time=0.001)
+        assert result["loops"] >= 1
+        assert result["min_us"] > 0
+
+
+def test_dataset_generator_is_consistent() -> None:
+    """Test that synthetic sessions, daily bests and stats agree with each other."""
+    options = Options(
+        users=200, days=5, end_date=date(2026, 3, 10), sessions_per_day=2.0,
+        whale_fraction=0.05, whale_multiplier=10.0, daily_active=0.5, daily_churn=0.05,
+        grid_mix=parse_grid_mix("4:0.5,5:0.5"), desc_fraction=0.2, tap_events_fraction=1.0,
+        seed=7,
+    )  # fmt: skip
+    gen = Generator(options)
+    columns = {name: i for i, name in enumerate(SESSION_COLUMNS)}
+
+    sessions, daily = [], []
+    for day_index in range(options.days):
+        day_sessions, day_daily = gen.day_records(day_index)
+        sessions += day_sessions
+        daily += day_daily
+
+    by_id = {s[columns["id"]]: s for s in sessions}
+    assert {s[columns["grid_size"]] for s in sessions} <= {4, 5}
+    for row in daily:
+        session = by_id[row[2]]
+        assert session[columns["status"]] == "completed"
+        assert session[columns["completion_time_ms"]] == row[5]
+        assert session[columns["started_at"]].date() == row[6]
+    # One daily row per user/config/day
+    assert len({(r[1], r[3], r[4], r[6]) for r in daily}) == len(daily)
+
+    completed = next(s for s in sessions if s[columns["status"]] == "completed")
+    taps = json.loads(completed[columns["tap_events"]])
+    assert sum(t["correct"] for t in taps) == completed[columns["grid_size"]] ** 2
+
+    stats = list(gen.stats_records())
+    assert sum(s[1] for s in stats) == len(sessions)
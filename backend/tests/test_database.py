@@ -0,0 +1,123 @@
+import asyncio
+import time
+import uuid
+from typing import Any
+
+import pytest
+from fastapi import Request
+from sqlalchemy import DateTime, event, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+import app.core.database as db_module
+import app.models  # noqa: F401  (registers every table on Base.metadata)
+from app.api.deps import _read_session
+from app.core.database import (
+    Base,
+    InstrumentedPool,
+    pool_connect_seconds,
+    pool_wait_seconds,
+    read_only_sessionmaker,
+)
+from tests.conftest import TEST_DATABASE_URL, test_engine
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_runs_without_transaction() -> None:
+    """Test that read sessions autocommit each statement instead of holding a transaction."""
+    factory = read_only_sessionmaker(test_engine)
+    async with factory() as session:
+        first = (await session.execute(text("SELECT now()"))).scalar()
+        await asyncio.sleep(0.01)
+        second = (await session.execute(text("SELECT now()"))).scalar()
+
+    # Inside a transaction now() is frozen at BEGIN
+    assert second > first
+
+
+@pytest.mark.asyncio
+async def test_read_only_session_behind_pgbouncer_uses_transaction() -> None:
+    """Test that PgBouncer read sessions keep each statement on one server connection."""
+    factory = read_only_sessionmaker(test_engine, pgbouncer=True)
+    async with factory() as session:
+        first = (await session.execute(text("SELECT now()"))).scalar()
+        await asyncio.sleep(0.01)
+        second = (await session.execute(text("SELECT now()"))).scalar()
+        read_only = (await session.execute(text("SHOW transaction_read_only"))).scalar()
+
+    assert second == first
+    assert read_only == "on"
+
+
+@pytest.mark.asyncio
+async def test_pool_wait_excludes_connect_time() -> None:
+    """Test that opening a slow new connection is not reported as waiting for the pool."""
+    engine = create_async_engine(TEST_DATABASE_URL, poolclass=InstrumentedPool, pool_size=1)
+    engine.sync_engine.pool.metrics_name = "test_connect"  # type: ignore[attr-defined]
+
+    @event.listens_for(engine.sync_engine, "connect")
+    def slow_connect(dbapi_connection: Any, record: Any) -> None:
+        time.sleep(0.1)
+
+    try:
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT 1"))
+    finally:
+        await engine.dispose()
+
+    assert pool_connect_seconds.sum(pool="test_connect") >= 0.1
+    assert pool_wait_seconds.count(pool="test_connect") == 1
+    assert pool_wait_seconds.sum(pool="test_connect") < 0.05
+
+
+def test_model_timestamps_are_timezone_aware() -> None:
+    """Test that every datetime column matches the timestamptz columns the migrations create."""
+    columns = [
+        column
+        for table in Base.metadata.sorted_tables
+        for column in table.columns
+        if isinstance(column.type, DateTime)
+    ]
+    assert columns
+    assert all(column.type.timezone for column in columns), [
+        f"{c.table.name}.{c.name}" for c in columns if not c.type.timezone
+    ]
+
+
+@pytest.mark.asyncio
+async def test_read_session_shares_primary_unless_replica_serves_it(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that reads reuse the request's session instead of a second checkout from its pool."""
+    primary = AsyncSession(test_engine)
+    monkeypatch.setattr(db_module, "read_engine", db_module.engine)
+    assert [s async for s in _read_session(uuid.uuid4(), primary)] == [primary]
+
+    # With a replica, only users pinned after a write stay on the primary
+    monkeypatch.setattr(db_module, "read_engine", test_engine)
+    monkeypatch.setattr(db_module, "read_session_factory", read_only_sessionmaker(test_engine))
+    writer = uuid.uuid4()
+    db_module.mark_recent_write(writer)
+    assert [s async for s in _read_session(writer, primary)] == [primary]
+    replica_sessions = [s async for s in _read_session(uuid.uuid4(), primary)]
+    assert replica_sessions[0] is not primary
+
+
+@pytest.mark.asyncio
+async def test_get_db_autocommits_safe_methods(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that GET and HEAD run without a transaction while writes keep one."""
+    monkeypatch.setattr(
+        db_module, "primary_read_session_factory", read_only_sessionmaker(test_engine)
+    )
+    monkeypatch.setattr(
+        db_module, "async_session_factory", async_sessionmaker(test_engine, expire_on_commit=False)
+    )
+
+    for method, autocommit in (("GET", True), ("HEAD", True), ("POST", False)):
+        request = Request({"type": "http", "method": method, "path": "/", "headers": []})
+        sessions = db_module.get_db(request)
+        session = await anext(sessions)
+        first = (await session.execute(text("SELECT now()"))).scalar()
+        await asyncio.sleep(0.01)
+        second = (await session.execute(text("SELECT now()"))).scalar()
+        await sessions.aclose()
+        assert (second > first) is autocommit, method
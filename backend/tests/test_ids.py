@@ -0,0 +1,29 @@
+import uuid
+
+from app.core.ids import uuid7, uuid7_timestamp_ms
+from app.models.leaderboard import DailyLeaderboard
+from app.models.session import TrainingSession
+
+
+def test_uuid7_layout() -> None:
+    """Test that uuid7 sets the RFC 9562 version and variant and embeds the timestamp."""
+    value = uuid7(1_700_000_000_123)
+    assert value.version == 7
+    assert value.variant == uuid.RFC_4122
+    assert uuid7_timestamp_ms(value) == 1_700_000_000_123
+    # Still a plain UUID for the columns and schemas
+    assert uuid.UUID(str(value)) == value
+
+
+def test_uuid7_sorts_by_creation_time() -> None:
+    """Test that ids from later milliseconds always sort after earlier ones."""
+    ids = [uuid7(ms) for ms in range(1_700_000_000_000, 1_700_000_000_500) for _ in range(3)]
+    assert [uuid7_timestamp_ms(i) for i in sorted(ids)] == [uuid7_timestamp_ms(i) for i in ids]
+    assert len(set(ids)) == len(ids)
+
+
+def test_write_heavy_tables_default_to_uuid7() -> None:
+    """Test that new sessions and daily entries get time-ordered ids."""
+    for model in (TrainingSession, DailyLeaderboard):
+        default = model.__table__.c.id.default
+        assert default.arg(None).version == 7
@@ -0,0 +1,45 @@
+import pytest
+from httpx import ASGITransport, AsyncClient
+from sqlalchemy import text
+from starlette.types import Receive, Scope, Send
+from structlog.testing import capture_logs
+
+from app.core.instrumentation import SQLInstrumentationMiddleware
+from tests.conftest import test_engine
+
+
+@pytest.mark.asyncio
+async def test_server_timing_reports_queries(client: AsyncClient) -> None:
+    """Test that responses carry the request's statement count and DB time."""
+    response = await client.get("/api/v1/leaderboards/all-time")
+    assert response.status_code == 200
+
+    timing = response.headers["server-timing"]
+    assert timing.startswith("db;dur=")
+    assert 'desc="0 queries"' not in timing
+
+
+@pytest.mark.asyncio
+async def test_repeated_statement_warning() -> None:
+    """Test that the same statement shape run in a loop is flagged as a likely N+1."""
+
+    async def endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+        async with test_engine.connect() as conn:
+            for i in range(3):
+                await conn.execute(text("SELECT CAST(:i AS integer)"), {"i": i})
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = SQLInstrumentationMiddleware(endpoint, repeat_threshold=3)
+    middleware.warn_repeats = True
+
+    with capture_logs() as logs:
+        transport = ASGITransport(app=middleware)
+        async with AsyncClient(transport=transport, base_url="http://test") as ac:
+            response = await ac.get("/loop")
+
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+    warnings = [e for e in logs if e["event"] == "sql_repeated_statement"]
+    assert len(warnings) == 1
+    assert warnings[0]["count"] == 3
+    assert warnings[0]["path"] == "/loop"
@@ -0,0 +1,130 @@
+import asyncio
+import uuid
+
+import asyncpg
+import pytest
+from httpx import AsyncClient
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.core.invalidation as invalidation_module
+from app.config import get_settings
+from app.core.database import has_recent_write
+from app.core.invalidation import (
+    EventKind,
+    InvalidationBus,
+    InvalidationEvent,
+    invalidation_bus,
+    publish,
+)
+from app.models.user import User
+from tests.conftest import TEST_DATABASE_URL
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bus_delivers_on_commit(db_session: AsyncSession) -> None:
+    """Test that published events reach listeners only once the transaction commits."""
+    received: list[InvalidationEvent] = []
+    bus = InvalidationBus()
+    bus.subscribe(EventKind.FOLLOWS, received.append)
+    await bus.start(TEST_DATABASE_URL.replace("+asyncpg", ""))
+
+    try:
+        await publish(db_session, InvalidationEvent(kind=EventKind.FOLLOWS, key="abc"))
+        await asyncio.sleep(0.1)
+        assert received == []
+
+        await db_session.commit()
+        for _ in range(50):
+            if received:
+                break
+            await asyncio.sleep(0.02)
+        assert received == [InvalidationEvent(kind=EventKind.FOLLOWS, key="abc")]
+    finally:
+        await bus.stop()
+
+
+@pytest.mark.asyncio
+async def test_invalidation_bus_retries_failed_first_connect(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a worker starting while Postgres is unreachable keeps trying to listen."""
+    real_connect = asyncpg.connect
+    attempts = 0
+
+    async def flaky_connect(dsn: str) -> asyncpg.Connection:
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise ConnectionRefusedError("connection refused")
+        return await real_connect(dsn)
+
+    monkeypatch.setattr(invalidation_module.asyncpg, "connect", flaky_connect)
+    monkeypatch.setattr(invalidation_module, "_RECONNECT_DELAY_SECONDS", 0.01)
+
+    received: list[InvalidationEvent] = []
+    bus = InvalidationBus()
+    bus.subscribe(EventKind.FOLLOWS, received.append)
+    await bus.start(TEST_DATABASE_URL.replace("+asyncpg", ""))
+    try:
+        for _ in range(50):
+            if received:
+                break
+            await asyncio.sleep(0.02)
+        assert attempts == 2
+        # Events published before the connection are lost, so every cache is dropped
+        assert received == [InvalidationEvent(kind=EventKind.FOLLOWS)]
+    finally:
+        await bus.stop()
+
+
+def test_invalidation_event_round_trip() -> None:
+    """Test event encoding and that handler errors do not stop dispatch."""
+    event = InvalidationEvent(
+        kind=EventKind.DAILY_LEADERBOARD, key=["2025-01-15", 5, "ASC", 25000, None]
+    )
+    assert InvalidationEvent.decode(event.encode()) == event
+
+    calls: list[InvalidationEvent] = []
+
+    def failing(_: InvalidationEvent) -> None:
+        raise RuntimeError("boom")
+
+    bus = InvalidationBus()
+    bus.subscribe(EventKind.DAILY_LEADERBOARD, failing)
+    bus.subscribe(EventKind.DAILY_LEADERBOARD, calls.append)
+    bus.dispatch(event)
+    assert calls == [event]
+
+
+def test_user_write_event_pins_reads_to_primary() -> None:
+    """Test that a write on another worker pins the user's reads to the primary."""
+    user_id = uuid.uuid4()
+    assert not has_recent_write(user_id)
+
+    invalidation_bus.dispatch(InvalidationEvent(kind=EventKind.USER_WRITE, key=str(user_id)))
+    assert has_recent_write(user_id)
+
+
+@pytest.mark.asyncio
+async def test_session_writes_pin_reads_only_with_replica(
+    client: AsyncClient, test_user: User, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that writes skip the read-your-writes notify when there is no replica."""
+    payload = {
+        "grid_size": 5,
+        "max_time": 120,
+        "order_mode": "ASC",
+        "status": "timeout",
+        "mistakes": 0,
+        "accuracy": 0,
+        "tap_events": [],
+        "started_at": "2025-01-15T10:30:00Z",
+    }
+    response = await client.post("/api/v1/sessions", json={**payload, "client_session_id": "a"})
+    assert response.status_code == 201
+    assert not has_recent_write(test_user.id)
+
+    monkeypatch.setattr(get_settings(), "db_read_host", "replica.internal")
+    response = await client.post("/api/v1/sessions", json={**payload, "client_session_id": "b"})
+    assert response.status_code == 201
+    assert has_recent_write(test_user.id)
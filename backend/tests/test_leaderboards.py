@@ -1,8 +1,112 @@
+import asyncio
 import uuid
-from datetime import date
+from datetime import date, datetime, timedelta
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.core.broadcast import Broadcaster
+from app.core.database import read_only_sessionmaker
+from app.core.invalidation import EventKind, InvalidationEvent, invalidation_bus
+from app.core.rank_sketch import TimeHistogram, all_time_sketches, daily_sketches
+from app.models.leaderboard import AllTimeLeaderboard, DailyLeaderboard
+from app.models.session import TrainingSession, session_id_for
+from app.models.user import User
+from app.repositories.leaderboard import LeaderboardRepository, period_bounds
+from app.repositories.session import SessionRepository
+from app.services.leaderboard import LeaderboardService
+
+
+async def _seed_daily_entries(
+    db: AsyncSession, times_ms: list[int], target_date: date | None = None
+) -> list[User]:
+    """Insert one user with a daily 5x5 ASC entry per time."""
+    target_date = target_date or date.today()
+    users = []
+    for i, time_ms in enumerate(times_ms):
+        user = User(cognito_sub=f"seed-{uuid.uuid4()}", display_name=f"Player {i}")
+        db.add(user)
+        await db.flush()
+
+        session = TrainingSession(
+            user_id=user.id,
+            client_session_id=str(uuid.uuid4()),
+            grid_size=5,
+            max_time=120,
+            order_mode="ASC",
+            status="completed",
+            completion_time_ms=time_ms,
+            accuracy=100,
+            tap_events=[],
+            started_at=datetime(2025, 1, 15, 10, 0),
+        )
+        db.add(session)
+        await db.flush()
+
+        db.add(
+            DailyLeaderboard(
+                user_id=user.id,
+                session_id=session.id,
+                grid_size=5,
+                order_mode="ASC",
+                best_time_ms=time_ms,
+                date=target_date,
+            )
+        )
+        db.add(
+            AllTimeLeaderboard(
+                user_id=user.id,
+                session_id=session.id,
+                grid_size=5,
+                order_mode="ASC",
+                best_time_ms=time_ms,
+            )
+        )
+        users.append(user)
+
+    await db.commit()
+    return users
+
+
+async def _seed_test_user_entry(db: AsyncSession, user: User, time_ms: int) -> None:
+    """Give an existing user a daily 5x5 ASC entry."""
+    session = TrainingSession(
+        user_id=user.id,
+        client_session_id=str(uuid.uuid4()),
+        grid_size=5,
+        max_time=120,
+        order_mode="ASC",
+        status="completed",
+        completion_time_ms=time_ms,
+        accuracy=100,
+        tap_events=[],
+        started_at=datetime(2025, 1, 15, 10, 0),
+    )
+    db.add(session)
+    await db.flush()
+    db.add(
+        DailyLeaderboard(
+            user_id=user.id,
+            session_id=session.id,
+            grid_size=5,
+            order_mode="ASC",
+            best_time_ms=time_ms,
+            date=date.today(),
+        )
+    )
+    db.add(
+        AllTimeLeaderboard(
+            user_id=user.id,
+            session_id=session.id,
+            grid_size=5,
+            order_mode="ASC",
+            best_time_ms=time_ms,
+        )
+    )
+    await db.commit()
 
 
 @pytest.mark.asyncio
@@ -119,27 +223,36 @@ async def test_daily_leaderboard_current_user(client: AsyncClient) -> None:
 @pytest.mark.asyncio
 async def test_all_time_leaderboard(client: AsyncClient) -> None:
     """Test all-time leaderboard."""
-    await client.post(
-        "/api/v1/sessions",
-        json={
-            "client_session_id": str(uuid.uuid4()),
-            "grid_size": 5,
-            "max_time": 120,
-            "order_mode": "ASC",
-            "status": "completed",
-            "completion_time_ms": 28500,
-            "mistakes": 0,
-            "accuracy": 100,
-            "tap_events": [],
-            "started_at": "2025-01-15T10:30:00Z",
-            "completed_at": "2025-01-15T10:30:28.500Z",
-        },
-    )
+    session_ids = []
+    for completion_time_ms in (28500, 31000):
+        response = await client.post(
+            "/api/v1/sessions",
+            json={
+                "client_session_id": str(uuid.uuid4()),
+                "grid_size": 5,
+                "max_time": 120,
+                "order_mode": "ASC",
+                "status": "completed",
+                "completion_time_ms": completion_time_ms,
+                "mistakes": 0,
+                "accuracy": 100,
+                "tap_events": [],
+                "started_at": "2025-01-15T10:30:00Z",
+                "completed_at": "2025-01-15T10:30:28.500Z",
+            },
+        )
+        session_ids.append(response.json()["id"])
 
     response = await client.get("/api/v1/leaderboards/all-time?grid_size=5&order_mode=ASC")
     assert response.status_code == 200
     data = response.json()
-    assert len(data["data"]) == 1
+    assert [e["best_time_ms"] for e in data["data"]] == [28500]
+    assert data["meta"]["total_entries"] == 1
+
+    # Deleting the best session leaves the board empty: the daily entry went with it
+    await client.delete(f"/api/v1/sessions/{session_ids[0]}")
+    response = await client.get("/api/v1/leaderboards/all-time?grid_size=5&order_mode=ASC&limit=10")
+    assert response.json()["data"] == []
 
 
 @pytest.mark.asyncio
@@ -165,3 +278,380 @@ async def test_leaderboard_timeout_not_included(client: AsyncClient) -> None:
     response = await client.get("/api/v1/leaderboards/daily?grid_size=5&order_mode=ASC")
     assert response.status_code == 200
     assert response.json()["data"] == []
+
+
+@pytest.mark.asyncio
+async def test_daily_leaderboard_current_user_exact_rank(
+    client: AsyncClient, db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that ranks inside the exact top-N are not flagged as approximate."""
+    await _seed_daily_entries(db_session, [20000, 21000])
+    await _seed_test_user_entry(db_session, test_user, 30000)
+
+    response = await client.get("/api/v1/leaderboards/daily?grid_size=5&order_mode=ASC")
+    current = response.json()["current_user"]
+    assert current["rank"] == 3
+    assert current["approximate"] is False
+
+
+@pytest.mark.asyncio
+async def test_daily_leaderboard_current_user_approximate_rank(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that ranks deeper than the exact limit are estimated."""
+    monkeypatch.setattr(get_settings(), "leaderboard_exact_rank_limit", 3)
+    daily_sketches.clear()
+
+    await _seed_daily_entries(db_session, [20000 + i * 1000 for i in range(9)])
+    await _seed_test_user_entry(db_session, test_user, 26500)
+
+    response = await client.get("/api/v1/leaderboards/daily?grid_size=5&order_mode=ASC")
+    current = response.json()["current_user"]
+    assert current["approximate"] is True
+    assert current["rank"] == 8
+    assert current["top_percent"] == 80.0
+    daily_sketches.clear()
+
+
+@pytest.mark.asyncio
+async def test_daily_sketch_patched_after_commit(
+    db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that the rank sketch follows committed changes and ignores rolled-back ones."""
+    await _seed_test_user_entry(db_session, test_user, 30000)
+    sketch = TimeHistogram(resolution_ms=100)
+    sketch.add(30000)
+    daily_sketches.set((date.today(), 5, "ASC"), sketch)
+
+    repo = LeaderboardRepository(db_session)
+    await repo.upsert_daily_entry(test_user.id, uuid.uuid4(), 5, "ASC", 25000, date.today())
+    await db_session.rollback()
+    assert sketch.count_faster(27000) == 0
+
+    invalidation_bus.dispatch(
+        InvalidationEvent(
+            kind=EventKind.DAILY_LEADERBOARD,
+            key=[date.today().isoformat(), 5, "ASC", 25000, 30000],
+        )
+    )
+    assert sketch.total == 1
+    assert sketch.count_faster(27000) == 1
+    daily_sketches.clear()
+
+
+@pytest.mark.asyncio
+async def test_daily_sketch_reload_replays_changes(db_session: AsyncSession) -> None:
+    """Test that changes committed while a sketch loads are applied to it."""
+    board = (date.today(), 5, "ASC")
+    service = LeaderboardService(db_session)
+    daily_sketches.clear()
+
+    def changed(key: list[object] | None) -> None:
+        invalidation_bus.dispatch(InvalidationEvent(kind=EventKind.DAILY_LEADERBOARD, key=key))
+
+    async def load_histogram(resolution_ms: int) -> list[tuple[int, int]]:
+        changed([date.today().isoformat(), 5, "ASC", 25000, None])
+        return [(30000 // resolution_ms, 1)]
+
+    sketch = await service._get_sketch(load_histogram, daily_sketches, board)
+    assert sketch.total == 2
+    assert sketch.count_faster(27000) == 1
+    assert daily_sketches.get(board) is sketch
+    daily_sketches.clear()
+
+    async def load_dropped_histogram(resolution_ms: int) -> list[tuple[int, int]]:
+        changed(None)  # Missed events: the loaded histogram may be stale too
+        return [(30000 // resolution_ms, 1)]
+
+    await service._get_sketch(load_dropped_histogram, daily_sketches, board)
+    assert daily_sketches.get(board) is None
+
+
+def test_time_histogram_count_faster() -> None:
+    """Test histogram rank estimation and incremental updates."""
+    sketch = TimeHistogram(resolution_ms=100)
+    for time_ms in (1000, 1050, 1200, 1300):
+        sketch.add(time_ms)
+
+    assert sketch.count_faster(1000) == 0
+    assert sketch.count_faster(1250) == 2.5  # half of the 1200-1299 bucket
+    assert sketch.count_faster(5000) == 4
+
+    sketch.discard(1200)
+    assert sketch.total == 3
+    assert sketch.count_faster(1250) == 2
+
+
+@pytest.mark.asyncio
+async def test_daily_around_me(
+    client: AsyncClient, db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that the around-me window is centred on the caller."""
+    await _seed_daily_entries(db_session, [20000, 21000, 22000, 24000, 24000, 26000])
+    await _seed_test_user_entry(db_session, test_user, 23000)
+
+    response = await client.get(
+        "/api/v1/leaderboards/daily/around-me?grid_size=5&order_mode=ASC&radius=2"
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["current_user"]["rank"] == 4
+    assert data["meta"]["total_entries"] == 7
+    assert [e["best_time_ms"] for e in data["data"]] == [21000, 22000, 23000, 24000, 24000]
+    assert [e["rank"] for e in data["data"]] == [2, 3, 4, 5, 5]
+    assert data["data"][2]["user_id"] == str(test_user.id)
+
+
+@pytest.mark.asyncio
+async def test_around_me_window_breaks_ties_by_user_id(
+    db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that both window sides pick tied neighbours in board order."""
+    tied = await _seed_daily_entries(db_session, [20000, 20000, 20000, 30000, 30000, 30000])
+    await _seed_test_user_entry(db_session, test_user, 25000)
+    faster = sorted(u.id for u in tied[:3])
+    slower = sorted(u.id for u in tied[3:])
+
+    repo = LeaderboardRepository(db_session)
+    windows = [
+        await repo.get_daily_window(test_user.id, 5, "ASC", date.today(), 25000, radius=2),
+        await repo.get_all_time_window(test_user.id, 5, "ASC", 25000, radius=2),
+    ]
+    for above, below in windows:
+        # Nearest first: the last tied entries in board order sit right above the caller
+        assert [row[0] for row in above] == [faster[2], faster[1]]
+        assert [row[0] for row in below] == [slower[0], slower[1]]
+
+
+@pytest.mark.asyncio
+async def test_daily_around_me_without_entry(client: AsyncClient) -> None:
+    """Test that a caller without an entry gets an empty window."""
+    response = await client.get("/api/v1/leaderboards/daily/around-me")
+    assert response.status_code == 200
+    assert response.json()["data"] == []
+    assert response.json()["current_user"] is None
+
+
+@pytest.mark.asyncio
+async def test_all_time_around_me(
+    client: AsyncClient, db_session: AsyncSession, test_user: User
+) -> None:
+    """Test the all-time around-me window."""
+    await _seed_daily_entries(db_session, [20000, 30000])
+    await _seed_test_user_entry(db_session, test_user, 25000)
+
+    response = await client.get("/api/v1/leaderboards/all-time/around-me?radius=1")
+    data = response.json()
+    assert data["meta"]["total_entries"] == 3
+    assert data["current_user"]["rank"] == 2
+    assert [e["rank"] for e in data["data"]] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_board_pages_coalesce_per_engine(
+    db_session: AsyncSession, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that page reads share a query only with readers of the same engine."""
+    calls = 0
+
+    async def slow_rankings(*args: object, **kwargs: object) -> tuple[list[object], int]:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return [], 0
+
+    monkeypatch.setattr(LeaderboardRepository, "get_all_time_rankings", slow_rankings)
+
+    engine = db_session.bind
+    assert isinstance(engine, AsyncEngine)
+    async with async_sessionmaker(engine)() as same, read_only_sessionmaker(engine)() as other:
+        await asyncio.gather(
+            LeaderboardService(db_session).get_all_time(5, "ASC"),
+            LeaderboardService(same).get_all_time(5, "ASC"),
+        )
+        assert calls == 1
+
+        await asyncio.gather(
+            LeaderboardService(db_session).get_all_time(5, "ASC"),
+            LeaderboardService(other).get_all_time(5, "ASC"),
+        )
+        assert calls == 3
+
+
+@pytest.mark.asyncio
+async def test_around_me_approximate_window(
+    client: AsyncClient,
+    db_session: AsyncSession,
+    test_user: User,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that deep around-me windows are estimated from the sketches."""
+    monkeypatch.setattr(get_settings(), "leaderboard_exact_rank_limit", 3)
+    daily_sketches.clear()
+    all_time_sketches.clear()
+
+    await _seed_daily_entries(db_session, [20000 + i * 1000 for i in range(9)])
+    await _seed_test_user_entry(db_session, test_user, 26500)
+
+    for url in (
+        "/api/v1/leaderboards/daily/around-me?radius=1",
+        "/api/v1/leaderboards/all-time/around-me?radius=1",
+    ):
+        data = (await client.get(url)).json()
+        assert data["meta"]["total_entries"] == 10
+        assert data["current_user"]["approximate"] is True
+        assert [e["rank"] for e in data["data"]] == [7, 8, 9]
+        assert all(e["approximate"] for e in data["data"])
+
+    daily_sketches.clear()
+    all_time_sketches.clear()
+
+
+@pytest.mark.asyncio
+async def test_finalized_daily_leaderboard(
+    client: AsyncClient, db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that past days are served from the snapshot with immutable caching."""
+    past = date.today() - timedelta(days=2)
+    await _seed_daily_entries(db_session, [20000, 20000, 25000], target_date=past)
+
+    url = f"/api/v1/leaderboards/daily/{past.isoformat()}?grid_size=5&order_mode=ASC"
+    live = await client.get(url)
+    assert live.json()["meta"]["finalized"] is False
+    assert "cache-control" not in live.headers
+
+    boards = await LeaderboardService(db_session).finalize_daily(past)
+    await db_session.commit()
+    assert boards == 1
+
+    response = await client.get(url + "&offset=1&limit=5")
+    assert response.status_code == 200
+    data = response.json()
+    assert data["meta"]["finalized"] is True
+    assert data["meta"]["total_entries"] == 3
+    assert [e["rank"] for e in data["data"]] == [1, 3]
+    assert "immutable" in response.headers["cache-control"]
+    assert response.headers["vary"] == "Authorization"
+
+
+@pytest.mark.asyncio
+async def test_period_leaderboards(
+    client: AsyncClient, db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that period boards keep the best time per user for the period."""
+    users = await _seed_daily_entries(db_session, [22000])
+    await _seed_test_user_entry(db_session, test_user, 30000)
+
+    repo = LeaderboardRepository(db_session)
+    for user, time_ms in ((users[0], 22000), (test_user, 30000), (test_user, 21000)):
+        entry = await repo.get_daily_entry(user.id, 5, "ASC", date.today())
+        assert entry is not None
+        await repo.upsert_period_entries(
+            user.id, entry.session_id, 5, "ASC", time_ms, date.today()
+        )
+    # A slower time must not replace the period best
+    await repo.upsert_period_entries(test_user.id, entry.session_id, 5, "ASC", 40000, date.today())
+    await db_session.commit()
+
+    for path, period_type in (("weekly", "week"), ("monthly", "month"), ("seasonal", "season")):
+        response = await client.get(f"/api/v1/leaderboards/{path}?grid_size=5&order_mode=ASC")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["meta"]["period"] == period_type
+        assert data["meta"]["date"] == period_bounds(period_type, date.today())[0].isoformat()
+        assert [e["best_time_ms"] for e in data["data"]] == [21000, 22000]
+        assert data["current_user"]["rank"] == 1
+
+
+@pytest.mark.asyncio
+async def test_find_orphaned_session_ids(db_session: AsyncSession, test_user: User) -> None:
+    """Test that only entries of removed sessions from attached months are orphans."""
+    repo = LeaderboardRepository(db_session)
+    # Seeded ids carry their insert time, not started_at: only the recheck finds them
+    kept, removed = await _seed_daily_entries(db_session, [20000, 21000])
+    removed_entry = await repo.get_daily_entry(removed.id, 5, "ASC", date.today())
+    assert removed_entry is not None
+    removed_session = removed_entry.session_id
+    # An id carrying a month before the oldest attached partition, as if detached
+    detached_session = session_id_for(datetime(2025, 1, 15, 10, 0))
+    await repo.upsert_daily_entry(test_user.id, detached_session, 5, "ASC", 25000, date.today())
+    await db_session.execute(
+        text("DELETE FROM training_sessions WHERE id = :id"), {"id": removed_session}
+    )
+    await db_session.commit()
+
+    since = await SessionRepository(db_session).attached_since()
+    assert since is not None and since.date() == date.today().replace(day=1)
+    assert await repo.find_orphaned_session_ids(since) == [removed_session]
+
+    await repo.delete_for_session(removed_session)
+    await db_session.commit()
+    assert await repo.find_orphaned_session_ids(since) == []
+    assert await repo.get_daily_entry(kept.id, 5, "ASC", date.today()) is not None
+
+
+def test_period_bounds() -> None:
+    """Test week, month and season boundaries."""
+    day = date(2025, 11, 19)  # Wednesday
+    assert period_bounds("week", day) == (date(2025, 11, 17), date(2025, 11, 24))
+    assert period_bounds("month", day) == (date(2025, 11, 1), date(2025, 12, 1))
+    assert period_bounds("season", day) == (date(2025, 10, 1), date(2026, 1, 1))
+    assert period_bounds("month", date(2025, 12, 31)) == (date(2025, 12, 1), date(2026, 1, 1))
+
+
+@pytest.mark.asyncio
+async def test_daily_friends_leaderboard(
+    client: AsyncClient, db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that the friends board only ranks the caller and who they follow."""
+    friend, stranger = await _seed_daily_entries(db_session, [25000, 20000])
+    await _seed_test_user_entry(db_session, test_user, 30000)
+
+    response = await client.post(f"/api/v1/users/{friend.id}/follow")
+    assert response.status_code == 204
+
+    response = await client.get("/api/v1/leaderboards/daily/friends?grid_size=5&order_mode=ASC")
+    assert response.status_code == 200
+    data = response.json()
+    assert [e["user_id"] for e in data["data"]] == [str(friend.id), str(test_user.id)]
+    assert data["meta"]["total_entries"] == 2
+    assert data["current_user"]["rank"] == 2
+
+    await client.delete(f"/api/v1/users/{friend.id}/follow")
+    response = await client.get("/api/v1/leaderboards/daily/friends?grid_size=5&order_mode=ASC")
+    assert response.json()["current_user"]["rank"] == 1
+
+
+@pytest.mark.asyncio
+async def test_broadcaster_coalesces_updates() -> None:
+    """Test that many updates in one tick cause one render shared by all subscribers."""
+    renders: list[object] = []
+
+    async def render(board: object) -> bytes:
+        renders.append(board)
+        return f"data: {len(renders)}\n\n".encode()
+
+    broadcaster = Broadcaster(tick_seconds=3600)
+    broadcaster.start(render)
+    await broadcaster.stop()  # Drive ticks by hand
+
+    first = broadcaster.subscribe((5, "ASC"))
+    second = broadcaster.subscribe((5, "ASC"))
+    for _ in range(3):
+        broadcaster.mark_dirty((5, "ASC"))
+    broadcaster.mark_dirty((6, "ASC"))  # No subscribers, ignored
+    await broadcaster.flush()
+
+    assert renders == [(5, "ASC")]
+    assert first.get_nowait() == second.get_nowait() == b"data: 1\n\n"
+
+    broadcaster.mark_dirty((5, "ASC"))
+    broadcaster.mark_dirty((5, "ASC"))
+    await broadcaster.flush()
+    broadcaster.unsubscribe((5, "ASC"), second)
+    assert len(renders) == 2
+    assert first.get_nowait() == b"data: 2\n\n"
+    assert broadcaster.subscriber_count() == 1
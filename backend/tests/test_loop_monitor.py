@@ -0,0 +1,34 @@
+import asyncio
+import time
+
+import pytest
+from structlog.testing import capture_logs
+
+from app.core.loop_monitor import LoopMonitor, loop_lag
+
+
+def _blocking_helper() -> None:
+    time.sleep(0.3)
+
+
+@pytest.mark.asyncio
+async def test_loop_monitor_names_blocking_function() -> None:
+    """Test that a callback blocking the loop is measured and named by the watchdog."""
+    monitor = LoopMonitor(interval=0.05, block_threshold=0.1, watchdog=True)
+    samples_before = loop_lag.count()
+
+    with capture_logs() as logs:
+        monitor.start()
+        try:
+            await asyncio.sleep(0.1)
+            _blocking_helper()
+            await asyncio.sleep(0.15)
+        finally:
+            await monitor.stop()
+
+    assert loop_lag.count() > samples_before
+    blocked = [e for e in logs if e["event"] == "event_loop_blocked"]
+    assert len(blocked) == 1
+    assert blocked[0]["module"] == "tests.test_loop_monitor"
+    assert blocked[0]["function"] == "_blocking_helper"
+    assert blocked[0]["blocked_ms"] >= 100
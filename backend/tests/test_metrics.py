@@ -0,0 +1,47 @@
+import uuid
+
+import pytest
+from httpx import AsyncClient
+
+from app.core.metrics import Counter, Gauge, Histogram, Registry
+
+
+def test_prometheus_text_format() -> None:
+    """Test that counters, gauges and histograms render in the exposition format."""
+    registry = Registry()
+    requests = registry.register(Counter("requests_total", "Requests", ["route"]))
+    in_flight = registry.register(Gauge("in_flight", "In flight", collect=lambda: {(): 3}))
+    latency = registry.register(Histogram("latency_seconds", "Latency", buckets=(0.1, 1.0)))
+
+    requests.inc(route="/a")
+    requests.inc(2, route="/a")
+    latency.observe(0.05)
+    latency.observe(0.5)
+    latency.observe(5.0)
+
+    text = registry.render()
+    assert "# TYPE requests_total counter" in text
+    assert 'requests_total{route="/a"} 3' in text
+    assert "in_flight 3" in text
+    assert in_flight.value() == 3
+    assert 'latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'latency_seconds_bucket{le="1"} 2' in text
+    assert 'latency_seconds_bucket{le="+Inf"} 3' in text
+    assert "latency_seconds_count 3" in text
+    assert latency.sum() == 5.55
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint(client: AsyncClient) -> None:
+    """Test that /metrics exposes route latency by template and pool stats."""
+    await client.get(f"/api/v1/users/{uuid.uuid4()}")
+
+    response = await client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert (
+        'http_request_duration_seconds_count{method="GET",route="/api/v1/users/{user_id}",'
+        'status="404"}' in response.text
+    )
+    assert "db_pool_checked_out" in response.text
+    assert "http_requests_in_flight" in response.text
@@ -0,0 +1,44 @@
+import asyncio
+import os
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.database import connect_args, read_only_sessionmaker
+
+# Set to a URL that goes through PgBouncer in transaction mode (see docker-compose.yml)
+PGBOUNCER_TEST_URL = os.environ.get("PGBOUNCER_TEST_URL")
+
+pytestmark = pytest.mark.skipif(
+    not PGBOUNCER_TEST_URL, reason="PGBOUNCER_TEST_URL not set"
+)
+
+
+@pytest.mark.asyncio
+async def test_prepared_statements_survive_transaction_pooling() -> None:
+    """Test that repeated statements work when transactions hop between server connections."""
+    engine = create_async_engine(
+        PGBOUNCER_TEST_URL,  # type: ignore[arg-type]
+        pool_size=10,
+        connect_args=connect_args(pgbouncer=True),
+    )
+    session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    read_factory = read_only_sessionmaker(engine, pgbouncer=True)
+
+    async def worker(n: int) -> None:
+        for i in range(20):
+            factory = read_factory if i % 2 else session_factory
+            async with factory() as session:
+                await session.execute(
+                    text("SELECT count(*) FROM pg_class WHERE relname = :name"), {"name": f"w{n}"}
+                )
+                result = await session.execute(text("SELECT CAST(:v AS integer)"), {"v": i})
+                assert result.scalar() == i
+                await session.commit()
+
+    try:
+        # More client connections than PgBouncer's server pool forces reuse
+        await asyncio.gather(*(worker(n) for n in range(10)))
+    finally:
+        await engine.dispose()
@@ -0,0 +1,124 @@
+import asyncio
+import gzip
+import json
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Any
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.types import Receive, Scope, Send
+
+from app.config import get_settings
+from app.core.profiling import ContinuousProfiler, ProfileWindow, ProfilingMiddleware
+
+
+def _spin(seconds: float) -> None:
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+async def _endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    _spin(0.05)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+@pytest.fixture
+def profiler(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> ProfilingMiddleware:
+    settings = get_settings()
+    monkeypatch.setattr(settings, "profiling_token", "secret")
+    monkeypatch.setattr(settings, "profiling_output_dir", str(tmp_path))
+    monkeypatch.setattr(settings, "profiling_interval_ms", 1.0)
+    return ProfilingMiddleware(_endpoint)
+
+
+@pytest.mark.asyncio
+async def test_profile_written_for_token(profiler: ProfilingMiddleware, tmp_path: Path) -> None:
+    """Test that a request with the profile token yields folded stacks and a summary."""
+    transport = ASGITransport(app=profiler)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/slow", headers={"X-Profile-Token": "secret"})
+
+    profile_id = response.headers["x-profile-id"]
+    folded = next(tmp_path.glob(f"*{profile_id}.folded")).read_text()
+    assert "tests.test_profiling:_spin" in folded
+
+    summary = json.loads(next(tmp_path.glob(f"*{profile_id}.json")).read_text())
+    assert summary["path"] == "/slow"
+    assert summary["samples"] > 0
+    assert summary["categories"]["route"] > 0
+
+
+@pytest.mark.asyncio
+async def test_no_profile_without_token(profiler: ProfilingMiddleware, tmp_path: Path) -> None:
+    """Test that requests with a wrong or missing token are not profiled."""
+    transport = ASGITransport(app=profiler)
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        response = await ac.get("/slow", headers={"X-Profile-Token": "wrong"})
+        assert "x-profile-id" not in response.headers
+        response = await ac.get("/slow")
+        assert "x-profile-id" not in response.headers
+
+    assert list(tmp_path.iterdir()) == []
+
+
+@pytest.mark.asyncio
+async def test_continuous_profiler_writes_rotated_windows(tmp_path: Path) -> None:
+    """Test that busy windows are written gzipped and old windows are rotated out."""
+    profiler = ContinuousProfiler(interval=0.001, window_seconds=0.05, output_dir=tmp_path, keep=2)
+    profiler.start()
+    try:
+        for _ in range(4):
+            _spin(0.06)
+            await asyncio.sleep(0.01)
+    finally:
+        profiler.stop()
+
+    files = list(tmp_path.glob("profile-*.folded.gz"))
+    assert len(files) == 2
+    assert profiler.latest is not None
+
+    newest = max(files, key=lambda p: p.stat().st_mtime)
+    with gzip.open(newest, "rt") as f:
+        content = f.read()
+    assert content == profiler.latest.folded()
+
+
+class _RecordingProfiler(ContinuousProfiler):
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.windows: list[ProfileWindow] = []
+
+    def _finish_window(self, window: ProfileWindow) -> None:
+        self.windows.append(window)
+
+
+def test_continuous_profiler_skips_idle_uvloop(tmp_path: Path) -> None:
+    """Test that samples of an idle uvloop are dropped while busy ones are kept."""
+    uvloop = pytest.importorskip("uvloop")
+    profiler = _RecordingProfiler(
+        interval=0.001, window_seconds=0.1, output_dir=tmp_path, keep=10
+    )
+
+    async def main() -> None:
+        profiler.start()
+        try:
+            await asyncio.sleep(0.25)
+            _spin(0.25)
+        finally:
+            profiler.stop()
+
+    uvloop.run(main())
+
+    assert profiler.windows[0].stacks == Counter()
+    assert any("tests.test_profiling:_spin" in w.folded() for w in profiler.windows)
+
+
+@pytest.mark.asyncio
+async def test_latest_profile_requires_token(client: AsyncClient) -> None:
+    """Test that the latest-window debug endpoint is closed outside debug without a token."""
+    response = await client.get("/debug/profile/latest")
+    assert response.status_code == 401
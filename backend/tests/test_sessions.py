@@ -1,9 +1,14 @@
 import uuid
+from datetime import UTC, date, datetime
 
 import pytest
 from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.models.session import partition_name, started_at_bounds
 from app.models.user import User
+from app.repositories.session import SessionRepository
 
 
 @pytest.mark.asyncio
@@ -65,6 +70,44 @@ async def test_create_session_idempotent(client: AsyncClient) -> None:
     assert response2.status_code == 201
     assert response1.json()["id"] == response2.json()["id"]
 
+    # Retries may resend started_at in another timezone, precision or slightly shifted
+    for started_at in ("2025-01-15T11:30:00.000+01:00", "2025-01-15T10:30:00.400Z"):
+        response = await client.post(
+            "/api/v1/sessions", json={**payload, "started_at": started_at}
+        )
+        assert response.json()["id"] == response1.json()["id"]
+
+    response = await client.get("/api/v1/sessions")
+    assert response.json()["meta"]["total"] == 1
+
+
+@pytest.mark.asyncio
+async def test_session_id_carries_started_at(
+    db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that new ids locate their partition and older ids are still found."""
+    repo = SessionRepository(db_session)
+    started_at = datetime(2025, 1, 15, 10, 30, 0, 123456, tzinfo=UTC)
+    fields = {
+        "client_session_id": str(uuid.uuid4()),
+        "grid_size": 5,
+        "max_time": 120,
+        "order_mode": "ASC",
+        "status": "timeout",
+        "started_at": started_at,
+    }
+    session = await repo.create(test_user.id, fields)
+    bounds = started_at_bounds(session.id)
+    assert bounds is not None and bounds[0] <= started_at < bounds[1]
+
+    legacy = await repo.create(
+        test_user.id, {**fields, "client_session_id": str(uuid.uuid4()), "id": uuid.uuid4()}
+    )
+    db_session.expunge_all()
+    for session_id in (session.id, legacy.id):
+        found = await repo.get_by_id(session_id)
+        assert found is not None and found.id == session_id
+
 
 @pytest.mark.asyncio
 async def test_list_sessions(client: AsyncClient) -> None:
@@ -247,3 +290,90 @@ async def test_session_validation(client: AsyncClient) -> None:
         },
     )
     assert response.status_code == 422
+
+
+def _session_data(started_at: datetime) -> dict:
+    return {
+        "client_session_id": str(uuid.uuid4()),
+        "grid_size": 5,
+        "max_time": 120,
+        "order_mode": "ASC",
+        "status": "completed",
+        "completion_time_ms": 30000,
+        "mistakes": 0,
+        "accuracy": 100,
+        "tap_events": [],
+        "started_at": started_at,
+        "completed_at": None,
+    }
+
+
+@pytest.mark.asyncio
+async def test_list_sessions_started_range(client: AsyncClient) -> None:
+    """Test filtering sessions by a started_at range."""
+    for month in (1, 2, 3):
+        payload = _session_data(datetime(2025, month, 15, 10, 30, tzinfo=UTC))
+        payload["started_at"] = payload["started_at"].isoformat()
+        await client.post("/api/v1/sessions", json=payload)
+
+    response = await client.get(
+        "/api/v1/sessions",
+        params={"started_after": "2025-02-01T00:00:00Z", "started_before": "2025-03-01T00:00:00Z"},
+    )
+    assert response.status_code == 200
+    data = response.json()
+    assert data["meta"]["total"] == 1
+    assert data["data"][0]["started_at"].startswith("2025-02-15")
+
+
+@pytest.mark.asyncio
+async def test_session_partitions_created_and_detached(
+    db_session: AsyncSession, test_user: User
+) -> None:
+    """Test that new partitions take over rows from the default one and detach cleanly."""
+    repo = SessionRepository(db_session)
+    old = await repo.create(test_user.id, _session_data(datetime(2025, 1, 20, tzinfo=UTC)))
+    await db_session.commit()
+
+    async def partition_of(session_id: uuid.UUID) -> str | None:
+        result = await db_session.execute(
+            text("SELECT tableoid::regclass::text FROM training_sessions WHERE id = :id"),
+            {"id": session_id},
+        )
+        return result.scalar_one_or_none()
+
+    # No partition covered January yet
+    assert await partition_of(old.id) == "training_sessions_default"
+
+    try:
+        created = await repo.ensure_partitions(date(2025, 1, 5), months_ahead=1)
+        assert created == ["training_sessions_2025_01", "training_sessions_2025_02"]
+        assert await repo.ensure_partitions(date(2025, 1, 5), months_ahead=1) == []
+        assert await partition_of(old.id) == "training_sessions_2025_01"
+
+        newer = await repo.create(test_user.id, _session_data(datetime(2025, 2, 3, tzinfo=UTC)))
+        assert await partition_of(newer.id) == "training_sessions_2025_02"
+        await db_session.commit()
+
+        detached = await repo.detach_partitions_before(date(2025, 2, 1))
+        await db_session.commit()
+        assert detached == ["training_sessions_2025_01"]
+        assert await repo.list_detached_partitions() == ["training_sessions_2025_01"]
+        # The detached table is never re-attached, with its rows, as January's partition
+        assert await repo.ensure_partitions(date(2025, 1, 5), months_ahead=1) == []
+        assert await repo.list_partitions() == [
+            "training_sessions_2025_02",
+            partition_name(date.today()),
+            "training_sessions_default",
+        ]
+        db_session.expunge_all()
+        assert await repo.get_by_id(old.id) is None
+        assert await repo.get_by_id(newer.id) is not None
+        # The rows stay behind in a plain table, ready for archival
+        archived = await db_session.execute(text("SELECT id FROM training_sessions_2025_01"))
+        assert archived.scalars().all() == [old.id]
+    finally:
+        await db_session.rollback()
+        # Detached tables are no longer dropped with training_sessions
+        await db_session.execute(text("DROP TABLE IF EXISTS training_sessions_2025_01"))
+        await db_session.commit()
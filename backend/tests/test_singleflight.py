@@ -0,0 +1,60 @@
+import asyncio
+
+import pytest
+
+from app.core.singleflight import SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution() -> None:
+    """Test that identical concurrent calls run the loader once."""
+    flight: SingleFlight[str, int] = SingleFlight()
+    release = asyncio.Event()
+    runs = 0
+
+    async def load() -> int:
+        nonlocal runs
+        runs += 1
+        await release.wait()
+        return 42
+
+    tasks = [asyncio.create_task(flight.do("page-1", load)) for _ in range(10)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*tasks) == [42] * 10
+    assert runs == 1
+    assert flight.shared == 9
+
+    # Once finished, the next call runs again
+    assert await flight.do("page-1", load) == 42
+    assert runs == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_shared_and_leader_cancellation_hands_over() -> None:
+    """Test error propagation and that followers survive a cancelled leader."""
+    flight: SingleFlight[str, int] = SingleFlight()
+
+    async def fail() -> int:
+        await asyncio.sleep(0.01)
+        raise ValueError("db down")
+
+    results = await asyncio.gather(
+        flight.do("k", fail), flight.do("k", fail), return_exceptions=True
+    )
+    assert all(isinstance(r, ValueError) for r in results)
+
+    async def slow() -> int:
+        await asyncio.sleep(0.05)
+        return 7
+
+    leader = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("k", slow))
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    assert await follower == 7
+    with pytest.raises(asyncio.CancelledError):
+        await leader
@@ -0,0 +1,69 @@
+import json
+import uuid
+from pathlib import Path
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from jose import jwt
+from starlette.types import Receive, Scope, Send
+
+from app.core.traffic import REDACTED, TrafficCapture, TrafficCaptureMiddleware
+from benchmarks.load import PASSWORD
+from benchmarks.replay import Replay, restore_body
+
+
+async def _endpoint(scope: Scope, receive: Receive, send: Send) -> None:
+    while (await receive()).get("more_body"):
+        pass
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+@pytest.mark.asyncio
+async def test_capture_is_sanitized(tmp_path: Path) -> None:
+    """Test that captured requests keep shape and timing but no credentials or raw ids."""
+    capture = TrafficCapture(tmp_path, sample_rate=1.0, salt="salt")
+    transport = ASGITransport(app=TrafficCaptureMiddleware(_endpoint, capture))
+    token = jwt.encode({"sub": "cognito-sub-1"}, "unused", algorithm="HS256")
+    user_id = uuid.uuid4()
+
+    async with AsyncClient(transport=transport, base_url="http://test") as ac:
+        await ac.post(
+            "/api/v1/auth/login", json={"email": "a@example.com", "password": "hunter2hunter2"}
+        )
+        await ac.get(
+            f"/api/v1/users/{user_id}",
+            params={"email": "a@example.com", "page": "2"},
+            headers={"Authorization": f"Bearer {token}"},
+        )
+        await ac.get("/health")
+    await capture.flush()
+
+    raw = capture.path.read_text()
+    assert "hunter2" not in raw and "a@example.com" not in raw
+    assert str(user_id) not in raw and "cognito-sub-1" not in raw
+
+    login, profile = [json.loads(line) for line in raw.splitlines()]
+    assert login["body"] == {"email": REDACTED, "password": REDACTED}
+    assert login["status"] == 200
+    assert profile["actor"] == capture.pseudonym("a-", "cognito-sub-1")
+    assert profile["path"].startswith("/api/v1/users/~")
+    assert profile["query"] == "email=%2A%2A%2A&page=2"
+
+
+def test_replay_restores_bodies_and_ids() -> None:
+    """Test that replay fills redacted fields and maps path ids onto replay data."""
+    body = {"email": REDACTED, "password": REDACTED, "sessions": [{"client_session_id": "x"}]}
+    restored = restore_body(body, "bench-user-0@example.com")
+    assert restored["email"] == "bench-user-0@example.com"
+    assert restored["password"] == PASSWORD
+    assert restored["sessions"][0]["client_session_id"] != "x"
+
+    user_id = uuid.uuid4()
+    replay = Replay(accounts={"a-1": ("bench-user-0@example.com", user_id)}, tokens={})
+    entry = {
+        "route": "/api/v1/users/{user_id}",
+        "path": "/api/v1/users/~abc",
+        "actor": "a-1",
+    }
+    assert replay.resolve_path(entry) == f"/api/v1/users/{user_id}"
@@ -70,3 +70,16 @@ async def test_get_nonexistent_user(client: AsyncClient) -> None:
     """Test getting a user that doesn't exist."""
     response = await client.get(f"/api/v1/users/{uuid.uuid4()}")
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_follow_user(client: AsyncClient, test_user) -> None:
+    """Test following validation: self-follow and unknown users are rejected."""
+    response = await client.post(f"/api/v1/users/{test_user.id}/follow")
+    assert response.status_code == 400
+
+    response = await client.post(f"/api/v1/users/{uuid.uuid4()}/follow")
+    assert response.status_code == 404
+
+    response = await client.delete(f"/api/v1/users/{uuid.uuid4()}/follow")
+    assert response.status_code == 204
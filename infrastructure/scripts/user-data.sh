@@ -44,6 +44,9 @@ DB_PASSWORD_SSM_PATH=${ssm_db_password_path}
 COGNITO_USER_POOL_ID=${cognito_user_pool_id}
 COGNITO_CLIENT_ID=${cognito_client_id}
 COGNITO_REGION=${aws_region}
+
+# Continuous profiler (GET /debug/profile/latest)
+PROFILING_CONTINUOUS_ENABLED=true
 ENVEOF
 
 chown ec2-user:ec2-user /home/ec2-user/.env